@@ -4,21 +4,27 @@
 
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QPushButton, QVBoxLayout,
-    QLineEdit, QComboBox, QMessageBox, QListWidget
+    QLineEdit, QComboBox, QMessageBox, QListWidget,
+    QProgressBar, QCheckBox
 )
+from PyQt5.QtCore import QTimer
 
 from utils.user_manager import add_user, remove_user, load_users
-from ml.train import train_model
+
+
+# период опроса процесса обучения (мс)
+TRAINING_POLL_MS = 200
 
 
 class AdminWindow(QWidget):
     def __init__(self):
         super().__init__()
+        self.training_job = None
         self.init_ui()
 
     def init_ui(self):
         self.setWindowTitle("Панель администратора")
-        self.setFixedSize(500, 500)
+        self.setFixedSize(500, 580)
 
         layout = QVBoxLayout()
 
@@ -35,18 +41,36 @@ class AdminWindow(QWidget):
 
         btn_add = QPushButton("Добавить пользователя")
         btn_remove = QPushButton("Удалить пользователя")
-        btn_train = QPushButton("Обучить модель")
+        self.btn_train = QPushButton("Обучить модель")
+        # без флажка модель не переобучается, если данные
+        # и настройки не изменились с прошлого обучения
+        self.force_train = QCheckBox("Обучить заново, даже без изменений")
+        self.btn_cancel = QPushButton("Отменить обучение")
+        self.btn_cancel.setEnabled(False)
+
+        self.train_progress = QProgressBar()
+        self.train_progress.setRange(0, 100)
+        self.train_status = QLabel("")
 
         btn_add.clicked.connect(self.add_user)
         btn_remove.clicked.connect(self.remove_user)
-        btn_train.clicked.connect(self.train)
+        self.btn_train.clicked.connect(self.train)
+        self.btn_cancel.clicked.connect(self.cancel_training)
+
+        self.training_timer = QTimer(self)
+        self.training_timer.setInterval(TRAINING_POLL_MS)
+        self.training_timer.timeout.connect(self.poll_training)
 
         layout.addWidget(self.username_input)
         layout.addWidget(self.role_box)
         layout.addWidget(btn_add)
         layout.addWidget(btn_remove)
         layout.addWidget(QLabel("Обучение модели"))
-        layout.addWidget(btn_train)
+        layout.addWidget(self.force_train)
+        layout.addWidget(self.btn_train)
+        layout.addWidget(self.btn_cancel)
+        layout.addWidget(self.train_progress)
+        layout.addWidget(self.train_status)
 
         self.setLayout(layout)
         self.refresh_users()
@@ -75,13 +99,91 @@ class AdminWindow(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Ошибка", str(e))
 
+    # ---------------------------------------------------------
+    # ОБУЧЕНИЕ МОДЕЛИ
+    # ---------------------------------------------------------
+
     def train(self):
+        """
+        Запуск обучения в отдельном процессе: окно остается
+        доступным, прогресс обновляется по таймеру.
+        """
+        if self.training_job is not None:
+            return
+
+        from ml.training_job import TrainingJob
+
         try:
-            train_model()
-            QMessageBox.information(
-                self,
-                "Обучение",
-                "Модель успешно обучена"
+            self.training_job = TrainingJob(
+                force=self.force_train.isChecked()
             )
+            self.training_job.start()
         except Exception as e:
+            self.training_job = None
             QMessageBox.critical(self, "Ошибка", str(e))
+            return
+
+        self.btn_train.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.train_progress.setValue(0)
+        self.train_status.setText("Запуск обучения...")
+        self.training_timer.start()
+
+    def cancel_training(self):
+        if self.training_job is not None:
+            self.training_job.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.train_status.setText("Отмена обучения...")
+
+    def poll_training(self):
+        if self.training_job is None:
+            return
+
+        for event in self.training_job.poll():
+            kind = event[0]
+
+            if kind == "progress":
+                _, message, percent = event
+                self.train_progress.setValue(percent)
+                self.train_status.setText(message)
+
+            elif kind == "done":
+                metrics = event[1]
+
+                if metrics.get("cached"):
+                    self.finish_training("Модель актуальна")
+                    header = ("Данные и настройки не изменились, "
+                              "используется обученная модель")
+                else:
+                    self.finish_training("Обучение завершено")
+                    header = "Модель успешно обучена"
+
+                QMessageBox.information(
+                    self,
+                    "Обучение",
+                    f"{header}\n\n"
+                    f"Accuracy  : {metrics['accuracy']:.3f}\n"
+                    f"Precision : {metrics['precision']:.3f}\n"
+                    f"Recall    : {metrics['recall']:.3f}\n"
+                    f"F1-score  : {metrics['f1_score']:.3f}"
+                )
+
+            elif kind == "cancelled":
+                self.finish_training("Обучение отменено")
+
+            elif kind == "error":
+                self.finish_training("Ошибка обучения")
+                QMessageBox.critical(self, "Ошибка", event[1])
+
+    def finish_training(self, status: str):
+        self.training_timer.stop()
+        self.training_job = None
+        self.btn_train.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        self.train_status.setText(status)
+
+    def closeEvent(self, event):
+        # закрытие окна прерывает незавершенное обучение
+        if self.training_job is not None:
+            self.training_job.cancel()
+        super().closeEvent(event)
@@ -4,58 +4,206 @@
 """
 
 from PyQt5.QtWidgets import (
-    QWidget, QLabel, QVBoxLayout, QPushButton,
-    QMessageBox, QTableWidget, QTableWidgetItem
+    QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
+    QMessageBox, QTableView, QComboBox, QLineEdit, QProgressBar
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
-import pandas as pd
 
-from ml.features import calculate_financial_ratios
-from utils.data_loader import load_and_prepare_data
+DATA_PATH = "data/financial_data.csv"
+
+
+class FeatureLoadThread(QThread):
+    """
+    Загрузка данных и расчет коэффициентов вне потока интерфейса.
+    Результат берется из кэша процесса (ml.features), если файл
+    данных не изменился с прошлого расчета.
+    """
+
+    progress = pyqtSignal(str, int)
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path: str, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            # pandas и расчет признаков загружаются при первом анализе
+            from ml.features import load_financial_ratios
+
+            features = load_financial_ratios(
+                self.file_path, progress=self.progress.emit
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        self.loaded.emit(features)
 
 
 class AnalysisWindow(QWidget):
     def __init__(self, role="Аналитик"):
         super().__init__()
         self.role = role
+        self.model = None
+        self.load_thread = None
         self.init_ui()
 
     def init_ui(self):
         self.setWindowTitle("Анализ финансовых коэффициентов")
-        self.setFixedSize(900, 500)
+        self.setFixedSize(900, 560)
 
         layout = QVBoxLayout()
 
         title = QLabel("Анализ финансовых коэффициентов предприятия")
         title.setStyleSheet("font-size:16px; font-weight:bold;")
 
-        self.table = QTableWidget()
+        # таблица отображает модель FeatureTableModel:
+        # ячейки формируются только для видимой области
+        self.table = QTableView()
+        self.table.setSortingEnabled(True)
+
+        self.btn_load = QPushButton("Загрузить и рассчитать коэффициенты")
+        self.btn_load.clicked.connect(self.load_and_analyze)
+
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setVisible(False)
+
+        # ---- Фильтр по диапазону значений коэффициента ----
+        filter_layout = QHBoxLayout()
+
+        self.filter_column = QComboBox()
+
+        self.filter_min = QLineEdit()
+        self.filter_min.setPlaceholderText("от")
+
+        self.filter_max = QLineEdit()
+        self.filter_max.setPlaceholderText("до")
+
+        btn_filter = QPushButton("Применить фильтр")
+        btn_filter.clicked.connect(self.apply_filter)
 
-        btn_load = QPushButton("Загрузить и рассчитать коэффициенты")
-        btn_load.clicked.connect(self.load_and_analyze)
+        btn_reset = QPushButton("Сбросить")
+        btn_reset.clicked.connect(self.reset_filter)
+
+        filter_layout.addWidget(QLabel("Фильтр:"))
+        filter_layout.addWidget(self.filter_column)
+        filter_layout.addWidget(self.filter_min)
+        filter_layout.addWidget(self.filter_max)
+        filter_layout.addWidget(btn_filter)
+        filter_layout.addWidget(btn_reset)
+
+        self.rows_label = QLabel("")
 
         layout.addWidget(title)
-        layout.addWidget(btn_load)
+        layout.addWidget(self.btn_load)
+        layout.addWidget(self.load_progress)
+        layout.addLayout(filter_layout)
         layout.addWidget(self.table)
+        layout.addWidget(self.rows_label)
 
         self.setLayout(layout)
 
+    # ---------------------------------------------------------
+    # ЗАГРУЗКА И РАСЧЕТ
+    # ---------------------------------------------------------
+
     def load_and_analyze(self):
+        if self.load_thread is not None:
+            return
+
+        self.btn_load.setEnabled(False)
+        self.load_progress.setValue(0)
+        self.load_progress.setVisible(True)
+
+        self.load_thread = FeatureLoadThread(DATA_PATH, self)
+        self.load_thread.progress.connect(self.on_load_progress)
+        self.load_thread.loaded.connect(self.on_loaded)
+        self.load_thread.failed.connect(self.on_load_failed)
+        self.load_thread.finished.connect(self.on_load_finished)
+        self.load_thread.start()
+
+    def on_load_progress(self, message: str, percent: int):
+        self.load_progress.setValue(percent)
+        self.rows_label.setText(message)
+
+    def on_load_failed(self, message: str):
+        QMessageBox.critical(self, "Ошибка", message)
+
+    def on_load_finished(self):
+        self.load_thread = None
+        self.btn_load.setEnabled(True)
+        self.load_progress.setVisible(False)
+
+    def on_loaded(self, features):
         try:
-            df = load_and_prepare_data("data/financial_data.csv")
-            features = calculate_financial_ratios(df)
+            from gui.feature_table_model import FeatureTableModel
+
+            self.model = FeatureTableModel(
+                features.to_numpy(), features.columns, parent=self
+            )
+            self.table.setModel(self.model)
+            # исходный порядок строк до первого щелчка по заголовку
+            self.table.horizontalHeader().setSortIndicator(
+                -1, Qt.AscendingOrder
+            )
 
-            self.table.setRowCount(len(features))
-            self.table.setColumnCount(len(features.columns))
-            self.table.setHorizontalHeaderLabels(features.columns)
+            self.filter_column.clear()
+            self.filter_column.addItems(list(features.columns))
 
-            for i in range(len(features)):
-                for j, col in enumerate(features.columns):
-                    self.table.setItem(
-                        i, j,
-                        QTableWidgetItem(str(round(features.iloc[i, j], 3)))
-                    )
+            self.update_rows_label()
 
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", str(e))
+
+    def closeEvent(self, event):
+        # поток расчета не прерывается: дожидаемся его завершения,
+        # результат останется в кэше для следующего открытия окна
+        if self.load_thread is not None:
+            self.load_thread.wait()
+        super().closeEvent(event)
+
+    # ---------------------------------------------------------
+    # ФИЛЬТРАЦИЯ
+    # ---------------------------------------------------------
+
+    def apply_filter(self):
+        if self.model is None:
+            return
+
+        try:
+            minimum = self._bound(self.filter_min.text())
+            maximum = self._bound(self.filter_max.text())
+        except ValueError:
+            QMessageBox.warning(
+                self, "Ошибка", "Границы фильтра должны быть числами."
+            )
+            return
+
+        self.model.set_range_filter(
+            self.filter_column.currentIndex(), minimum, maximum
+        )
+        self.update_rows_label()
+
+    def reset_filter(self):
+        if self.model is None:
+            return
+
+        self.filter_min.clear()
+        self.filter_max.clear()
+        self.model.clear_filter()
+        self.update_rows_label()
+
+    def update_rows_label(self):
+        self.rows_label.setText(
+            f"Строк: {self.model.filtered_rows()} "
+            f"из {self.model.total_rows()}"
+        )
+
+    @staticmethod
+    def _bound(text: str):
+        text = text.strip().replace(",", ".")
+        return float(text) if text else None
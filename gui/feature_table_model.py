@@ -0,0 +1,153 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение файла:
+Модель таблицы коэффициентов для QTableView.
+
+Данные хранятся в матрице NumPy, текст ячейки формируется только
+при отрисовке видимой ячейки, строки подгружаются порциями
+по мере прокрутки (fetchMore). Сортировка и фильтрация
+выполняются над индексами строк средствами NumPy, без
+копирования матрицы, что позволяет просматривать миллионы строк.
+"""
+
+import numpy as np
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+# число строк, добавляемых в представление за одну подгрузку
+FETCH_BATCH_ROWS = 1000
+
+
+class FeatureTableModel(QAbstractTableModel):
+    def __init__(self, values, columns, decimals: int = 3, parent=None):
+        super().__init__(parent)
+
+        self._values = np.asarray(values, dtype=np.float64)
+        self._columns = [str(column) for column in columns]
+        self._decimals = decimals
+
+        # порядок строк после сортировки (все строки)
+        self._order = np.arange(len(self._values))
+        # маска строк, прошедших фильтр
+        self._mask = None
+        # отображаемые строки матрицы в порядке вывода
+        self._rows = self._order
+        # число строк, уже переданных представлению
+        self._loaded = min(FETCH_BATCH_ROWS, len(self._rows))
+
+    # ---------------------------------------------------------
+    # ИНТЕРФЕЙС QAbstractTableModel
+    # ---------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            value = self._values[self._rows[index.row()], index.column()]
+            return str(round(float(value), self._decimals))
+
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+
+        if orientation == Qt.Horizontal:
+            return self._columns[section]
+
+        # номер строки исходных данных (сохраняется при сортировке)
+        return str(int(self._rows[section]) + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        count = min(FETCH_BATCH_ROWS, len(self._rows) - self._loaded)
+        if count <= 0:
+            return
+
+        self.beginInsertRows(
+            QModelIndex(), self._loaded, self._loaded + count - 1
+        )
+        self._loaded += count
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Устойчивая сортировка по колонке (пропуски — в конце).
+        """
+
+        if not 0 <= column < len(self._columns):
+            return
+
+        key = self._values[:, column]
+        if order == Qt.DescendingOrder:
+            key = -key
+
+        self.beginResetModel()
+        self._order = np.argsort(key, kind="stable")
+        self._apply()
+        self.endResetModel()
+
+    # ---------------------------------------------------------
+    # ФИЛЬТРАЦИЯ
+    # ---------------------------------------------------------
+
+    def set_range_filter(self, column: int, minimum=None, maximum=None):
+        """
+        Отбор строк, значение колонки которых лежит в [minimum, maximum]
+        (None — граница не задана).
+        """
+
+        values = self._values[:, column]
+        mask = np.ones(len(values), dtype=bool)
+
+        if minimum is not None:
+            mask &= values >= minimum
+        if maximum is not None:
+            mask &= values <= maximum
+
+        self.beginResetModel()
+        self._mask = mask
+        self._apply()
+        self.endResetModel()
+
+    def clear_filter(self):
+        self.beginResetModel()
+        self._mask = None
+        self._apply()
+        self.endResetModel()
+
+    def total_rows(self) -> int:
+        return len(self._values)
+
+    def filtered_rows(self) -> int:
+        return len(self._rows)
+
+    def _apply(self):
+        """
+        Пересчет отображаемых строк после сортировки или фильтра.
+        """
+
+        if self._mask is None:
+            self._rows = self._order
+        else:
+            self._rows = self._order[self._mask[self._order]]
+
+        self._loaded = min(FETCH_BATCH_ROWS, len(self._rows))
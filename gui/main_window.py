@@ -15,12 +15,9 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 
-# Окна системы
-from gui.predict_window import PredictWindow
-from gui.analysis_window import AnalysisWindow
-from gui.admin_window import AdminWindow
-from gui.help_window import HelpWindow
-from gui.change_password_window import ChangePasswordWindow
+# Окна системы импортируются при первом открытии: окна оценки,
+# анализа и администрирования тянут pandas и sklearn, загрузка
+# которых не должна задерживать запуск приложения
 
 
 class MainWindow(QWidget):
@@ -78,6 +75,9 @@ class MainWindow(QWidget):
             QPushButton#danger {
                 background-color: #6b7280;
             }
+            QLabel#status {
+                color: #6b7280;
+            }
         """)
 
         main_layout = QVBoxLayout()
@@ -150,6 +150,14 @@ class MainWindow(QWidget):
         main_layout.addWidget(self.btn_help)
         main_layout.addWidget(self.btn_exit)
 
+        # -----------------------------------------------------
+        # Состояние фоновой подготовки моделей
+        # -----------------------------------------------------
+
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("status")
+        main_layout.addWidget(self.status_label)
+
         self.setLayout(main_layout)
 
     # ---------------------------------------------------------
@@ -172,11 +180,29 @@ class MainWindow(QWidget):
             self.btn_train.setEnabled(True)
             self.btn_admin.setEnabled(True)
 
+    # ---------------------------------------------------------
+    # ПОДГОТОВКА МОДЕЛЕЙ
+    # ---------------------------------------------------------
+
+    def set_warmup_status(self, text: str):
+        self.status_label.setText(text)
+
+    def on_warmup_ready(self, seconds: float):
+        self.status_label.setText(f"Модели готовы ({seconds:.1f} с)")
+
+    def on_warmup_failed(self, message: str):
+        # модели будут загружены при первом прогнозе
+        self.status_label.setText(
+            f"Модели не подготовлены заранее: {message}"
+        )
+
     # ---------------------------------------------------------
     # ОБРАБОТЧИКИ
     # ---------------------------------------------------------
 
     def on_predict(self):
+        from gui.predict_window import PredictWindow
+
         self.predict_window = PredictWindow()
         self.predict_window.show()
 
@@ -189,6 +215,9 @@ class MainWindow(QWidget):
                 "только аналитику и администратору."
             )
             return
+
+        from gui.analysis_window import AnalysisWindow
+
         self.analysis_window = AnalysisWindow(self.current_role)
         self.analysis_window.show()
 
@@ -200,13 +229,19 @@ class MainWindow(QWidget):
         )
 
     def on_admin(self):
+        from gui.admin_window import AdminWindow
+
         self.admin_window = AdminWindow()
         self.admin_window.show()
 
     def on_change_password(self):
+        from gui.change_password_window import ChangePasswordWindow
+
         self.cp_window = ChangePasswordWindow(self.username)
         self.cp_window.show()
 
     def on_help(self):
+        from gui.help_window import HelpWindow
+
         self.help_window = HelpWindow()
         self.help_window.show()
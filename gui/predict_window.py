@@ -12,8 +12,6 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, QComboBox, QTextEdit, QMessageBox
 )
 
-from ml.predict import predict_stability, interpret_prediction
-
 
 class PredictWindow(QWidget):
     def __init__(self):
@@ -65,6 +63,9 @@ class PredictWindow(QWidget):
 
     def run_prediction(self):
         try:
+            # модели и pandas загружаются при первом прогнозе
+            from ml.predict import predict_stability, interpret_prediction
+
             data = {k: float(v.text()) for k, v in self.inputs.items()}
             data["year"] = int(data["year"])
 
@@ -0,0 +1,84 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение файла:
+Фоновая подготовка моделей после авторизации.
+
+Пока пользователь находится в главном меню, в отдельном потоке
+импортируются модули машинного обучения, загружаются модели
+и выполняется пробный прогноз. Первый реальный прогноз после
+этого выполняется без задержки на загрузку.
+"""
+
+import time
+import importlib
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+# запись для пробного прогноза (заведомо корректный баланс)
+WARMUP_RECORD = {
+    "year": 2026,
+    "current_assets": 1400000,
+    "current_liabilities": 900000,
+    "equity": 1800000,
+    "total_assets": 2700000,
+    "profit": 150000
+}
+
+# дополнительные модули, которые окна роли импортируют в процесс GUI
+# (обучение выполняется в отдельном процессе TrainingJob, поэтому
+# ml.train и sklearn в процесс GUI не загружаются)
+ROLE_WARMUP_MODULES = {
+    "Пользователь": [],
+    "Аналитик": [],
+    "Администратор": ["ml.training_job"]
+}
+
+
+class ModelWarmupThread(QThread):
+    """
+    Поток прогрева моделей.
+
+    Сигналы:
+    status(str)     — текущий этап для отображения в интерфейсе;
+    ready(float)    — подготовка завершена (длительность, с);
+    failed(str)     — ошибка подготовки (прогноз остается доступен,
+                      модели загрузятся при первом обращении).
+    """
+
+    status = pyqtSignal(str)
+    ready = pyqtSignal(float)
+    failed = pyqtSignal(str)
+
+    def __init__(self, role: str, parent=None):
+        super().__init__(parent)
+        self.role = role
+
+    def run(self):
+        started = time.perf_counter()
+
+        try:
+            self.status.emit("Подготовка моделей: загрузка модулей…")
+
+            from ml.predict import MODELS, preload, predict_stability
+
+            for model_name in MODELS:
+                self.status.emit(f"Подготовка моделей: {model_name}…")
+
+                preload([model_name])
+
+                # пробный прогноз прогревает расчет признаков
+                # и интерпретацию результата
+                predict_stability(WARMUP_RECORD, model_name)
+
+            for module in ROLE_WARMUP_MODULES.get(self.role, []):
+                self.status.emit(f"Подготовка модулей: {module}…")
+                importlib.import_module(module)
+
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        self.ready.emit(time.perf_counter() - started)
@@ -17,17 +17,28 @@ from PyQt5.QtWidgets import QApplication
 """
 
 from gui.login_window import LoginWindow
-from gui.main_window import MainWindow
 
 
 def start_main(username: str, role: str):
     """
     Запуск главного окна после успешной авторизации
     """
-    global main_window
+    # главное окно импортируется после входа,
+    # чтобы окно авторизации появлялось сразу
+    from gui.main_window import MainWindow
+    from gui.warmup import ModelWarmupThread
+
+    global main_window, warmup_thread
     main_window = MainWindow(username, role)
     main_window.show()
 
+    # фоновая загрузка моделей, пока пользователь в главном меню
+    warmup_thread = ModelWarmupThread(role)
+    warmup_thread.status.connect(main_window.set_warmup_status)
+    warmup_thread.ready.connect(main_window.on_warmup_ready)
+    warmup_thread.failed.connect(main_window.on_warmup_failed)
+    warmup_thread.start()
+
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,271 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Сравнение моделей-кандидатов по качеству и скорости.
+
+Каждый кандидат оценивается повторной стратифицированной
+кросс-валидацией на одной и той же матрице признаков. Пары
+«кандидат × блок» рассчитываются параллельно в пуле процессов
+над общей матрицей признаков (ml.parallel). Для каждого блока
+фиксируются метрики качества, время обучения и время прогноза,
+результат сводится в таблицу сравнения.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    accuracy_score,
+    precision_score,
+    recall_score,
+    f1_score
+)
+from sklearn.model_selection import RepeatedStratifiedKFold
+
+from ml.parallel import encode_labels, run_on_data
+from ml.train import RANDOM_FOREST_PARAMS
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+# число блоков и повторов кросс-валидации
+COMPARISON_FOLDS = 5
+COMPARISON_REPEATS = 3
+
+# метрики качества в таблице сравнения
+COMPARISON_METRICS = {
+    "accuracy": accuracy_score,
+    "precision": lambda y, p: precision_score(y, p, zero_division=0),
+    "recall": lambda y, p: recall_score(y, p, zero_division=0),
+    "f1_score": lambda y, p: f1_score(y, p, zero_division=0)
+}
+
+# колонки времени (среднее по блокам)
+TIMING_COLUMNS = ["fit_seconds", "predict_seconds", "predict_us_per_row"]
+
+
+def default_candidates(random_state: int = 42) -> dict:
+    """
+    Модели системы: Random Forest (model1) и Logistic Regression (model2).
+    """
+    return {
+        "Random Forest": RandomForestClassifier(
+            **RANDOM_FOREST_PARAMS, random_state=random_state
+        ),
+        "Logistic Regression": LogisticRegression(
+            max_iter=2000, solver="lbfgs"
+        )
+    }
+
+
+# ============================================================
+# ОЦЕНКА НА ОДНОМ БЛОКЕ
+# ============================================================
+
+def evaluate_fold(estimator, X, y, train_index, test_index) -> dict:
+    """
+    Обучение копии модели на блоке и оценка на отложенной части.
+
+    :return: метрики COMPARISON_METRICS, время обучения
+             и прогноза (с), время прогноза на строку (мкс)
+    """
+
+    model = clone(estimator)
+
+    X_train, y_train = X[train_index], y[train_index]
+    X_test, y_test = X[test_index], y[test_index]
+
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_seconds = time.perf_counter() - started
+
+    result = {
+        name: float(metric(y_test, y_pred))
+        for name, metric in COMPARISON_METRICS.items()
+    }
+
+    result["fit_seconds"] = fit_seconds
+    result["predict_seconds"] = predict_seconds
+    result["predict_us_per_row"] = 1e6 * predict_seconds / len(test_index)
+
+    return result
+
+
+def _evaluate_task(X, y, estimator, train_index, test_index) -> dict:
+    return evaluate_fold(estimator, X, y, train_index, test_index)
+
+
+# ============================================================
+# СРАВНЕНИЕ МОДЕЛЕЙ
+# ============================================================
+
+def compare_models(
+    candidates: dict,
+    X,
+    y,
+    n_splits: int = COMPARISON_FOLDS,
+    n_repeats: int = COMPARISON_REPEATS,
+    n_workers: int = None,
+    random_state: int = 42,
+    progress=None
+) -> pd.DataFrame:
+    """
+    Сравнение моделей повторной стратифицированной кросс-валидацией.
+
+    Все кандидаты оцениваются на одинаковых блоках. Модели
+    обучаются на массивах NumPy (без имен признаков). Метки
+    кодируются номерами классов в порядке сортировки (np.unique),
+    поэтому положительный класс метрик — второй из них
+    (для меток 0/1 — класс 1).
+
+    Время обучения и прогноза измеряется внутри рабочих процессов;
+    при n_workers > 1 процессы делят ядра процессора, поэтому для
+    точного сравнения скорости следует задать n_workers=1 (блоки
+    оцениваются в текущем процессе без пула).
+
+    :param candidates: словарь {название: модель sklearn}
+                       (модели не изменяются, обучаются их копии)
+    :param n_workers: число процессов (по умолчанию — число ядер)
+    :param progress: обработчик progress(message, percent) или None;
+                     исключение из него прерывает сравнение
+                     (оставшиеся блоки пула отменяются)
+    :return: таблица сравнения (строка — кандидат): средние метрики,
+             их разброс (<метрика>_std) и среднее время на блок;
+             строки упорядочены по убыванию F1, затем по времени
+             прогноза
+    """
+
+    if not candidates:
+        raise ValueError("Не заданы модели для сравнения.")
+
+    # числовые коды классов (ml.parallel.encode_labels)
+    y = encode_labels(y)
+
+    folds = list(RepeatedStratifiedKFold(
+        n_splits=n_splits, n_repeats=n_repeats, random_state=random_state
+    ).split(np.zeros(len(y)), y))
+
+    tasks = [
+        (name, train_index, test_index)
+        for name in candidates
+        for train_index, test_index in folds
+    ]
+
+    results = {name: [] for name in candidates}
+
+    def collect(result: dict, index: int) -> None:
+        name = tasks[index][0]
+        results[name].append(result)
+
+        # исключение из обработчика прерывает сравнение
+        if progress is not None:
+            completed = sum(len(scores) for scores in results.values())
+            progress(
+                f"Оценено блоков: {completed} из {len(tasks)} ({name})",
+                100 * completed // len(tasks)
+            )
+
+    run_on_data(
+        _evaluate_task,
+        [
+            (candidates[name], train_index, test_index)
+            for name, train_index, test_index in tasks
+        ],
+        X, y, collect, n_workers, prefix="compare-"
+    )
+
+    return _comparison_table(results)
+
+
+def _comparison_table(results: dict) -> pd.DataFrame:
+    """
+    Сводка результатов по блокам в таблицу сравнения.
+    """
+
+    rows = {}
+
+    for name, folds in results.items():
+        frame = pd.DataFrame(folds)
+        row = {}
+
+        for metric in COMPARISON_METRICS:
+            row[metric] = frame[metric].mean()
+            row[f"{metric}_std"] = frame[metric].std(ddof=0)
+
+        for column in TIMING_COLUMNS:
+            row[column] = frame[column].mean()
+
+        row["folds"] = len(frame)
+        rows[name] = row
+
+    table = pd.DataFrame.from_dict(rows, orient="index")
+
+    return table.sort_values(
+        ["f1_score", "predict_seconds"], ascending=[False, True],
+        kind="stable"
+    )
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+if __name__ == "__main__":
+    """
+    Сравнение моделей системы на обучающей выборке
+    (тестовая выборка остается независимой).
+    """
+
+    import argparse
+
+    from ml.feature_store import load_training_data
+
+    parser = argparse.ArgumentParser(
+        description="Сравнение моделей по качеству и скорости"
+    )
+    parser.add_argument("--data", default="data/financial_data.csv")
+    parser.add_argument("--folds", type=int, default=COMPARISON_FOLDS)
+    parser.add_argument("--repeats", type=int, default=COMPARISON_REPEATS)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="число процессов (по умолчанию — число ядер)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="сохранить таблицу сравнения в CSV"
+    )
+
+    args = parser.parse_args()
+
+    training_data = load_training_data(args.data)
+    train_index = training_data["train_index"]
+
+    comparison = compare_models(
+        default_candidates(),
+        training_data["X"].iloc[train_index],
+        training_data["y"].iloc[train_index],
+        n_splits=args.folds,
+        n_repeats=args.repeats,
+        n_workers=args.workers,
+        progress=lambda message, percent: print(message)
+    )
+
+    print("\n=== СРАВНЕНИЕ МОДЕЛЕЙ ===")
+    print(comparison.round(4).to_string())
+
+    if args.output is not None:
+        comparison.to_csv(args.output)
+        print(f"\nТаблица сохранена: {args.output}")
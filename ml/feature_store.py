@@ -0,0 +1,474 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Формирование признакового пространства для наборов данных,
+не помещающихся в оперативную память.
+
+Датасет читается порциями, признаки рассчитываются для каждой
+порции и дописываются в матрицу на диске. Матрица открывается
+через memory-map, поэтому обучение и пакетная оценка читают
+признаки напрямую из хранилища без повторного расчета и без
+одновременного хранения исходных данных и признаков в памяти.
+
+Структура хранилища (каталог):
+– features.f8 — матрица признаков float64 (строки × признаки);
+– labels.i8   — целевая переменная int64;
+– schema.json — имена признаков, число строк, отпечаток источника.
+
+Тот же формат используется кэшем обучающих данных
+(load_training_data), общим для всех сценариев обучения
+и оценки моделей; кэш дополнительно хранит индексы разбиения
+на обучающую и тестовую выборки (split.npz).
+"""
+
+import os
+import json
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ml.features import (
+    FEATURE_VERSION,
+    calculate_feature_matrix,
+    calculate_financial_ratios,
+    default_feature_names,
+    last_known_rows
+)
+from ml.predict import get_model, predict_rows
+from utils.data_loader import (
+    CACHE_DIR_NAME,
+    STREAM_CHUNK_ROWS,
+    file_fingerprint,
+    fingerprint_matches,
+    load_and_prepare_data,
+    load_and_prepare_data_chunks,
+    publish_directory
+)
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+STORE_FORMAT_VERSION = 1
+
+FEATURES_FILE = "features.f8"
+LABELS_FILE = "labels.i8"
+SCHEMA_FILE = "schema.json"
+SPLIT_FILE = "split.npz"
+
+# размер блока строк при пакетной оценке из хранилища
+SCORE_BLOCK_ROWS = 100_000
+
+
+# ============================================================
+# ФОРМИРОВАНИЕ ХРАНИЛИЩА
+# ============================================================
+
+def build_feature_store(
+    data_path: str,
+    store_path: str,
+    feature_names=None,
+    chunksize: int = STREAM_CHUNK_ROWS
+) -> dict:
+    """
+    Порционный расчет признаков с записью в хранилище на диске.
+
+    Данные читаются через load_and_prepare_data_chunks (проверка,
+    очистка, сортировка по году). Темпы роста на границе порций
+    рассчитываются относительно последней строки предыдущей порции
+    (того же предприятия), поэтому результат не зависит
+    от размера порции.
+
+    :param feature_names: набор признаков (по умолчанию — полный)
+    :return: схема созданного хранилища
+    """
+
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"Файл данных не найден: {data_path}")
+
+    # отпечаток снимается до чтения: если файл изменится во время
+    # расчета, хранилище окажется устаревшим, а не выданным за актуальное
+    fingerprint = file_fingerprint(data_path)
+
+    store_path = os.path.abspath(store_path)
+    parent = os.path.dirname(store_path)
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_path = tempfile.mkdtemp(dir=parent)
+
+    try:
+        names = None
+        rows = 0
+        previous_rows = None
+
+        with open(os.path.join(tmp_path, FEATURES_FILE), "wb") as f_x, \
+                open(os.path.join(tmp_path, LABELS_FILE), "wb") as f_y:
+
+            for chunk in load_and_prepare_data_chunks(data_path, chunksize):
+                if names is None:
+                    names = [
+                        str(name) for name in
+                        (feature_names if feature_names is not None
+                         else default_feature_names(chunk))
+                    ]
+
+                X = calculate_feature_matrix(
+                    chunk, names, ordered=True, previous_rows=previous_rows
+                )
+
+                f_x.write(np.ascontiguousarray(X).tobytes())
+                f_y.write(
+                    chunk["label"].to_numpy(dtype=np.int64).tobytes()
+                )
+
+                previous_rows = last_known_rows(
+                    pd.concat([previous_rows, chunk])
+                    if previous_rows is not None else chunk
+                )
+                rows += len(chunk)
+
+        schema = {
+            "version": STORE_FORMAT_VERSION,
+            "features": names,
+            "rows": rows,
+            "dtype": "float64",
+            "source": fingerprint
+        }
+
+        with open(os.path.join(tmp_path, SCHEMA_FILE), "w",
+                  encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False, indent=4)
+
+        publish_directory(tmp_path, store_path)
+
+    finally:
+        # остается при ошибке или если хранилище записал другой процесс
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return schema
+
+
+# ============================================================
+# ЧТЕНИЕ ХРАНИЛИЩА
+# ============================================================
+
+def read_store_schema(store_path: str) -> dict:
+    """
+    Чтение схемы хранилища признаков.
+    """
+
+    schema_path = os.path.join(store_path, SCHEMA_FILE)
+
+    if not os.path.exists(schema_path):
+        raise FileNotFoundError(
+            f"Хранилище признаков не найдено: {store_path}"
+        )
+
+    with open(schema_path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+
+    if schema.get("version") != STORE_FORMAT_VERSION:
+        raise ValueError(
+            "Неподдерживаемая версия хранилища признаков: "
+            f"{schema.get('version')}"
+        )
+
+    return schema
+
+
+def load_feature_store(store_path: str):
+    """
+    Открытие хранилища признаков через memory-map.
+
+    :return: (X, y) — DataFrame признаков и Series меток,
+             являющиеся представлениями файлов на диске
+    """
+
+    schema = read_store_schema(store_path)
+    shape = (schema["rows"], len(schema["features"]))
+
+    if schema["rows"]:
+        features = np.memmap(
+            os.path.join(store_path, FEATURES_FILE),
+            dtype=np.float64, mode="r", shape=shape
+        )
+        labels = np.memmap(
+            os.path.join(store_path, LABELS_FILE),
+            dtype=np.int64, mode="r", shape=(schema["rows"],)
+        )
+    else:
+        features = np.empty(shape)
+        labels = np.empty(0, dtype=np.int64)
+
+    X = pd.DataFrame(features, columns=schema["features"], copy=False)
+    y = pd.Series(labels, name="label", copy=False)
+
+    return X, y
+
+
+# ============================================================
+# КЭШ ОБУЧАЮЩИХ ДАННЫХ
+# ============================================================
+
+def _training_cache_path(data_path: str) -> str:
+    directory, name = os.path.split(os.path.abspath(data_path))
+    return os.path.join(directory, CACHE_DIR_NAME, f"{name}.training")
+
+
+def _valid_training_schema(cache_path: str, data_path: str, split: dict):
+    """
+    Схема кэша, если он актуален: не изменились файл данных
+    (отпечаток), версия расчета признаков и параметры разбиения;
+    иначе None.
+    """
+
+    try:
+        schema = read_store_schema(cache_path)
+    except (OSError, ValueError):
+        return None
+
+    if schema.get("feature_version") != FEATURE_VERSION:
+        return None
+
+    if schema.get("split") != split:
+        return None
+
+    if not fingerprint_matches(schema["source"], data_path):
+        return None
+
+    return schema
+
+
+def load_training_data(
+    data_path: str,
+    test_size: float = 0.25,
+    random_state: int = 42,
+    use_cache: bool = True
+) -> dict:
+    """
+    Признаки, метки и разбиение на выборки для обучения моделей.
+
+    Результат сохраняется на диск (data/.cache/<файл>.training)
+    и повторно используется всеми сценариями обучения и оценки,
+    пока не изменились файл данных (отпечаток с SHA-256), версия
+    расчета признаков FEATURE_VERSION и параметры разбиения.
+    Рассчитывается полный набор признаков; модели выбирают
+    из него нужные колонки.
+
+    Данные готовятся load_and_prepare_data (удаление дубликатов,
+    сортировка по году), поэтому матрица признаков совпадает
+    с хранилищем build_feature_store того же файла. Разбиение
+    совпадает с train_test_split(X, y, test_size, random_state,
+    stratify=y), примененным к подготовленным данным.
+
+    :return: словарь:
+             X           — DataFrame признаков (memory-map);
+             y           — Series меток;
+             train_index — позиции строк обучающей выборки;
+             test_index  — позиции строк тестовой выборки;
+             fingerprint — отпечаток файла данных, снятый до его
+                           чтения (данные, по которым рассчитаны X и y)
+    """
+
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"Файл данных не найден: {data_path}")
+
+    split = {"test_size": test_size, "random_state": random_state}
+    cache_path = _training_cache_path(data_path)
+
+    schema = (
+        _valid_training_schema(cache_path, data_path, split)
+        if use_cache else None
+    )
+
+    if schema is None:
+        schema = _build_training_cache(data_path, cache_path, split)
+
+    X, y = load_feature_store(cache_path)
+
+    with np.load(os.path.join(cache_path, SPLIT_FILE)) as indices:
+        train_index = indices["train"]
+        test_index = indices["test"]
+
+    return {
+        "X": X,
+        "y": y,
+        "train_index": train_index,
+        "test_index": test_index,
+        "fingerprint": schema["source"]
+    }
+
+
+def _build_training_cache(data_path: str, cache_path: str,
+                          split: dict) -> dict:
+    """
+    Расчет признаков и разбиения с записью в каталог кэша.
+
+    :return: схема записанного кэша
+    """
+
+    # sklearn нужен только при построении кэша
+    from sklearn.model_selection import train_test_split
+
+    fingerprint = file_fingerprint(data_path)
+
+    # подготовка как в build_feature_store: те же удаление дубликатов
+    # и порядок строк (по году, внутри года — порядок файла)
+    df = load_and_prepare_data(data_path, fingerprint=fingerprint)
+
+    if "label" not in df.columns:
+        raise ValueError("В датасете отсутствует целевая переменная label")
+
+    labels = df["label"].to_numpy(dtype=np.int64)
+    features = calculate_financial_ratios(df.drop(columns=["label"]))
+    del df
+
+    train_index, test_index = train_test_split(
+        np.arange(len(labels)),
+        test_size=split["test_size"],
+        random_state=split["random_state"],
+        stratify=labels
+    )
+
+    parent = os.path.dirname(cache_path)
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_path = tempfile.mkdtemp(dir=parent)
+
+    try:
+        with open(os.path.join(tmp_path, FEATURES_FILE), "wb") as f:
+            f.write(np.ascontiguousarray(features.to_numpy()).tobytes())
+
+        with open(os.path.join(tmp_path, LABELS_FILE), "wb") as f:
+            f.write(labels.tobytes())
+
+        np.savez(
+            os.path.join(tmp_path, SPLIT_FILE),
+            train=train_index,
+            test=test_index
+        )
+
+        schema = {
+            "version": STORE_FORMAT_VERSION,
+            "features": list(features.columns),
+            "rows": len(labels),
+            "dtype": "float64",
+            "source": fingerprint,
+            "feature_version": FEATURE_VERSION,
+            "split": split
+        }
+
+        with open(os.path.join(tmp_path, SCHEMA_FILE), "w",
+                  encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False, indent=4)
+
+        _publish_training_cache(tmp_path, cache_path, data_path, split)
+
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return schema
+
+
+def _publish_training_cache(tmp_path: str, cache_path: str,
+                            data_path: str, split: dict) -> None:
+    """
+    Замена каталога кэша построенным во временном каталоге.
+
+    Кэш могут строить одновременно несколько процессов: если
+    в каталоге кэша уже лежит актуальный кэш, его записал другой
+    процесс и построенный каталог не нужен; устаревший кэш
+    заменяется (publish_directory).
+    """
+
+    if _valid_training_schema(cache_path, data_path, split) is not None:
+        return
+
+    publish_directory(tmp_path, cache_path)
+
+
+# ============================================================
+# ПАКЕТНАЯ ОЦЕНКА ИЗ ХРАНИЛИЩА
+# ============================================================
+
+def score_feature_store(
+    store_path: str,
+    model_name: str,
+    block_rows: int = SCORE_BLOCK_ROWS
+) -> pd.DataFrame:
+    """
+    Прогноз модели по признакам из хранилища блоками строк
+    (в памяти одновременно находится только один блок признаков).
+
+    :return: DataFrame с колонками prediction и probability
+    """
+
+    X, _ = load_feature_store(store_path)
+    model = get_model(model_name)
+
+    if hasattr(model, "feature_names_in_"):
+        missing = [
+            name for name in model.feature_names_in_
+            if name not in X.columns
+        ]
+        if missing:
+            raise ValueError(
+                f"В хранилище отсутствуют признаки модели: {missing}"
+            )
+        columns = [X.columns.get_loc(name) for name in model.feature_names_in_]
+    else:
+        columns = list(range(X.shape[1]))
+
+    features = X.to_numpy()
+
+    prediction = np.empty(len(X), dtype=np.int64)
+    probability = np.full(len(X), np.nan)
+
+    for start in range(0, len(X), block_rows):
+        block = slice(start, start + block_rows)
+
+        block_prediction, block_probability = predict_rows(
+            model, features[block][:, columns]
+        )
+
+        prediction[block] = block_prediction
+        if block_probability is not None:
+            probability[block] = block_probability
+
+    return pd.DataFrame({
+        "prediction": prediction,
+        "probability": probability
+    })
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Формирование хранилища признаков из CSV-файла"
+    )
+    parser.add_argument("data_path", help="CSV-файл с данными")
+    parser.add_argument("store_path", help="каталог хранилища признаков")
+    parser.add_argument(
+        "--chunksize", type=int, default=STREAM_CHUNK_ROWS,
+        help="размер порции чтения (строк)"
+    )
+
+    args = parser.parse_args()
+
+    schema = build_feature_store(
+        args.data_path, args.store_path, chunksize=args.chunksize
+    )
+
+    print(f"Строк: {schema['rows']}")
+    print(f"Признаки: {schema['features']}")
+    print(f"Хранилище: {os.path.abspath(args.store_path)}")
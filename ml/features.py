@@ -20,9 +20,20 @@
 – аналитической интерпретации результатов.
 """
 
+import os
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 
+from utils.data_loader import (
+    ENTITY_COLUMN,
+    file_fingerprint,
+    fingerprint_matches,
+    load_and_prepare_data
+)
+
 
 # ============================================================
 # ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
@@ -139,20 +150,20 @@ def calculate_growth_rates(df: pd.DataFrame) -> pd.DataFrame:
     """
     Расчет темпов роста основных показателей по годам.
     Используется для анализа динамики развития предприятия.
-    """
 
-    result = pd.DataFrame()
+    При наличии колонки ENTITY_COLUMN темпы роста рассчитываются
+    отдельно по каждому предприятию. Строки результата соответствуют
+    строкам df.
+    """
 
     if "year" not in df.columns:
-        return result
-
-    df_sorted = df.sort_values("year")
+        return pd.DataFrame()
 
-    result["assets_growth"] = df_sorted["total_assets"].pct_change().fillna(0)
-    result["equity_growth"] = df_sorted["equity"].pct_change().fillna(0)
-    result["profit_growth"] = df_sorted["profit"].pct_change().fillna(0)
-
-    return result
+    return pd.DataFrame(
+        calculate_feature_matrix(df, GROWTH_FEATURES),
+        columns=GROWTH_FEATURES,
+        index=df.index
+    )
 
 
 # ============================================================
@@ -196,65 +207,728 @@ def calculate_integral_score(df: pd.DataFrame) -> pd.DataFrame:
 # ФОРМИРОВАНИЕ ПОЛНОГО НАБОРА ПРИЗНАКОВ
 # ============================================================
 
-def calculate_financial_ratios(df: pd.DataFrame) -> pd.DataFrame:
+# Версия расчета признаков: увеличивается при любом изменении
+# формул или состава признаков, чтобы сохраненные на диске
+# матрицы признаков (ml.feature_store) рассчитывались заново
+# (2 — кэш обучающих данных строится по подготовленным данным)
+FEATURE_VERSION = 2
+
+# Порядок признаков в полном признаковом пространстве
+RATIO_FEATURES = [
+    "current_ratio",
+    "quick_ratio",
+    "absolute_liquidity",
+    "equity_ratio",
+    "financial_dependency",
+    "maneuverability",
+    "return_on_assets",
+    "return_on_equity",
+    "profit_margin",
+]
+
+GROWTH_FEATURES = [
+    "assets_growth",
+    "equity_growth",
+    "profit_growth",
+]
+
+INTEGRAL_FEATURES = [
+    "integral_stability_score",
+]
+
+
+# Размер блока строк ядра расчета признаков: временные массивы
+# блока помещаются в кэш процессора
+_KERNEL_BLOCK_ROWS = 32768
+
+
+def _denominator(values: np.ndarray):
+    """
+    Подготовка знаменателя: нули заменяются единицей,
+    маска нулей сохраняется для последующего обнуления результата.
+    """
+    zero = values == 0
+    return np.where(zero, 1.0, values), zero
+
+
+def _divide_into(out: np.ndarray, numerator, denominator) -> None:
+    """
+    Деление с записью в готовый буфер: 0 там, где знаменатель равен 0.
+    Деление на ноль не выполняется, поэтому предупреждений нет.
+
+    :param denominator: результат _denominator
+    """
+    safe, zero = denominator
+    np.divide(numerator, safe, out=out)
+    np.copyto(out, 0, where=zero)
+
+
+def _entity_codes(entity) -> np.ndarray:
+    """
+    Целочисленные коды предприятий (в порядке первого появления).
+    """
+    codes, _ = pd.factorize(entity, use_na_sentinel=False)
+    return codes
+
+
+def _growth_order(year: np.ndarray, codes=None, ordered: bool = False):
     """
-    Формирование полного признакового пространства
+    Перестановка строк для расчета динамики: по предприятию,
+    внутри предприятия — по году. Сортировка устойчивая: строки
+    одного года сохраняют исходный порядок, пропуски года — в конце.
+
+    :param ordered: строки уже упорядочены по году
+    """
+
+    if codes is None:
+        if ordered:
+            return np.arange(len(year))
+        return np.argsort(year, kind="stable")
+
+    if ordered:
+        return np.argsort(codes, kind="stable")
+
+    return np.lexsort((year, codes))
+
+
+def _previous_rows(order: np.ndarray, codes=None) -> np.ndarray:
+    """
+    Индекс предыдущей по году строки того же предприятия
+    для каждой строки; для первой строки предприятия — -1.
+    """
+    previous = np.empty(len(order), dtype=np.intp)
+
+    if len(order):
+        previous[order[1:]] = order[:-1]
+        previous[order[0]] = -1
+
+        if codes is not None:
+            ordered_codes = codes[order]
+            starts = order[1:][ordered_codes[1:] != ordered_codes[:-1]]
+            previous[starts] = -1
+
+    return previous
+
+
+class _FrameData:
+    """
+    Исходный набор данных для ядра расчета признаков:
+    колонки читаются в массивы один раз и по требованию.
+    """
+
+    def __init__(self, data, ordered: bool = False, previous_rows=None):
+        self.data = data
+        self.ordered = ordered
+        self.previous_rows = previous_rows
+        self.has_entity = ENTITY_COLUMN in data
+        self._columns = {}
+        self._previous = None
+        self._carry_positions = None
+
+        if isinstance(data, pd.DataFrame):
+            self.rows = len(data)
+        else:
+            self.rows = len(np.atleast_1d(next(iter(data.values()), [])))
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            self._columns[name] = np.atleast_1d(np.asarray(self.data[name]))
+        return self._columns[name]
+
+    def previous(self) -> np.ndarray:
+        """Индексы предыдущих по году строк (см. _previous_rows)."""
+        if self._previous is None:
+            codes = None
+            if self.has_entity:
+                codes = _entity_codes(self.column(ENTITY_COLUMN))
+
+            order = _growth_order(self.column("year"), codes, self.ordered)
+            self._previous = _previous_rows(order, codes)
+        return self._previous
+
+    def carry_positions(self) -> np.ndarray:
+        """
+        Номер строки previous_rows, предшествующей строке данных
+        (-1, если предыдущих данных по предприятию нет).
+        """
+        if self._carry_positions is None:
+            previous_rows = self.previous_rows
+
+            if self.has_entity:
+                # последняя известная строка каждого предприятия
+                self._carry_rows = np.flatnonzero(
+                    ~previous_rows.duplicated(ENTITY_COLUMN, keep="last")
+                )
+                entities = pd.Index(
+                    previous_rows[ENTITY_COLUMN].to_numpy()[self._carry_rows]
+                )
+                self._carry_positions = entities.get_indexer(
+                    self.column(ENTITY_COLUMN)
+                )
+            else:
+                self._carry_rows = np.array([len(previous_rows) - 1])
+                self._carry_positions = np.zeros(self.rows, dtype=np.intp)
+        return self._carry_positions
+
+    def carry_values(self, column: str) -> np.ndarray:
+        """Значения показателя в строках previous_rows (см. carry_positions)."""
+        self.carry_positions()
+        return self.previous_rows[column].to_numpy()[self._carry_rows]
+
+
+class _BlockContext:
+    """
+    Данные блока строк для функций расчета признаков:
+    исходные показатели, подготовленные знаменатели
+    и уже рассчитанные признаки (до замены NaN/inf).
+    """
+
+    def __init__(self, frame: _FrameData, block: slice, out, rows: dict):
+        self.frame = frame
+        self.block = block
+        self.out = out
+        self.rows = rows
+        self._inputs = {}
+        self._denominators = {}
+
+    def input(self, column: str) -> np.ndarray:
+        """Исходный показатель блока в float64."""
+        if column not in self._inputs:
+            self._inputs[column] = np.asarray(
+                self.frame.column(column)[self.block], dtype=np.float64
+            )
+        return self._inputs[column]
+
+    def denominator(self, column: str):
+        """Знаменатель по исходному показателю (см. _denominator)."""
+        if column not in self._denominators:
+            self._denominators[column] = _denominator(self.input(column))
+        return self._denominators[column]
+
+    def feature(self, name: str) -> np.ndarray:
+        """Строка буфера признака в пределах блока."""
+        return self.out[self.rows[name]]
+
+    def previous(self) -> np.ndarray:
+        """Индексы предыдущих по году строк для строк блока."""
+        return self.frame.previous()[self.block]
+
+
+def _ratio(numerator, denominator: str):
+    """
+    Признак-отношение: numerator(ctx) / исходный показатель denominator.
+    """
+    def compute(ctx, out):
+        _divide_into(out, numerator(ctx), ctx.denominator(denominator))
+    return compute
+
+
+def _growth(column: str):
+    """
+    Темп роста показателя относительно предыдущей по году строки
+    того же предприятия (аналог pct_change по отсортированным данным).
+    """
+    def compute(ctx, out):
+        previous = ctx.previous()
+
+        previous_values = np.asarray(
+            ctx.frame.column(column).take(previous, mode="clip"),
+            dtype=np.float64
+        )
+        # у первой строки предприятия предыдущей нет
+        # (или она передана отдельно в previous_rows)
+        first = previous < 0
+        previous_values[first] = 0
+
+        if ctx.frame.previous_rows is not None and len(ctx.frame.previous_rows):
+            positions = ctx.frame.carry_positions()[ctx.block]
+            carried = first & (positions >= 0)
+            previous_values[carried] = ctx.frame.carry_values(column)[
+                positions[carried]
+            ]
+
+        denominator = _denominator(previous_values)
+        _divide_into(out, ctx.input(column), denominator)
+        np.subtract(out, 1, out=out, where=~denominator[1])
+    return compute
+
+
+def _financial_dependency(ctx, out):
+    np.subtract(1, ctx.feature("equity_ratio"), out=out)
+
+
+def _integral_stability_score(ctx, out):
+    # взвешенная сумма уже рассчитанных коэффициентов
+    np.multiply(0.4, ctx.feature("current_ratio"), out=out)
+    out += 0.4 * ctx.feature("equity_ratio")
+    out += 0.2 * ctx.feature("return_on_assets")
+
+
+# ============================================================
+# РЕЕСТР ПРИЗНАКОВ
+# ============================================================
+
+# Для каждого признака указаны исходные колонки (inputs),
+# признаки, от которых он зависит (depends), и функция расчета
+# compute(ctx, out), записывающая значения блока в out.
+FEATURE_REGISTRY = {
+    # --- ликвидность ---
+    "current_ratio": {
+        "inputs": ["current_assets", "current_liabilities"],
+        "depends": [],
+        "compute": _ratio(
+            lambda ctx: ctx.input("current_assets"),
+            "current_liabilities"
+        ),
+    },
+    "quick_ratio": {
+        "inputs": ["current_assets", "current_liabilities"],
+        "depends": [],
+        "compute": _ratio(
+            lambda ctx: ctx.input("current_assets") * 0.8,
+            "current_liabilities"
+        ),
+    },
+    "absolute_liquidity": {
+        "inputs": ["current_assets", "current_liabilities"],
+        "depends": [],
+        "compute": _ratio(
+            lambda ctx: ctx.input("current_assets") * 0.2,
+            "current_liabilities"
+        ),
+    },
+
+    # --- финансовая устойчивость ---
+    "equity_ratio": {
+        "inputs": ["equity", "total_assets"],
+        "depends": [],
+        "compute": _ratio(lambda ctx: ctx.input("equity"), "total_assets"),
+    },
+    "financial_dependency": {
+        "inputs": [],
+        "depends": ["equity_ratio"],
+        "compute": _financial_dependency,
+    },
+    "maneuverability": {
+        "inputs": ["equity", "total_assets", "current_assets"],
+        "depends": [],
+        "compute": _ratio(
+            lambda ctx: ctx.input("equity") - (
+                ctx.input("total_assets") - ctx.input("current_assets")
+            ),
+            "equity"
+        ),
+    },
+
+    # --- рентабельность ---
+    "return_on_assets": {
+        "inputs": ["profit", "total_assets"],
+        "depends": [],
+        "compute": _ratio(lambda ctx: ctx.input("profit"), "total_assets"),
+    },
+    "return_on_equity": {
+        "inputs": ["profit", "equity"],
+        "depends": [],
+        "compute": _ratio(lambda ctx: ctx.input("profit"), "equity"),
+    },
+    "profit_margin": {
+        "inputs": ["profit", "current_assets"],
+        "depends": [],
+        "compute": _ratio(lambda ctx: ctx.input("profit"), "current_assets"),
+    },
+
+    # --- динамика по годам ---
+    "assets_growth": {
+        "inputs": ["year", "total_assets"],
+        "depends": [],
+        "compute": _growth("total_assets"),
+    },
+    "equity_growth": {
+        "inputs": ["year", "equity"],
+        "depends": [],
+        "compute": _growth("equity"),
+    },
+    "profit_growth": {
+        "inputs": ["year", "profit"],
+        "depends": [],
+        "compute": _growth("profit"),
+    },
+
+    # --- интегральный показатель ---
+    "integral_stability_score": {
+        "inputs": [],
+        "depends": ["current_ratio", "equity_ratio", "return_on_assets"],
+        "compute": _integral_stability_score,
+    },
+}
+
+
+def resolve_features(feature_names) -> list:
+    """
+    Список признаков, необходимых для расчета запрошенных,
+    вместе с зависимостями — в порядке расчета.
+    """
+
+    resolved = []
+
+    def visit(name):
+        if name not in FEATURE_REGISTRY:
+            raise ValueError(f"Неизвестный признак: {name}")
+
+        if name in resolved:
+            return
+
+        for dependency in FEATURE_REGISTRY[name]["depends"]:
+            visit(dependency)
+
+        resolved.append(name)
+
+    for name in feature_names:
+        visit(str(name))
+
+    return resolved
+
+
+def required_inputs(feature_names) -> list:
+    """
+    Исходные колонки, необходимые для расчета запрошенных признаков.
+    """
+
+    inputs = []
+
+    for name in resolve_features(feature_names):
+        for column in FEATURE_REGISTRY[name]["inputs"]:
+            if column not in inputs:
+                inputs.append(column)
+
+    return inputs
+
+
+def last_known_rows(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Последняя по году строка (для каждого предприятия, если задан
+    ENTITY_COLUMN) — в том порядке, в котором ее выбирает расчет
+    темпов роста; при равных годах — последняя по порядку строк.
+    Используется как previous_rows при порционной обработке.
+    """
+
+    ordered = rows.sort_values("year", kind="stable")
+
+    if ENTITY_COLUMN not in rows.columns:
+        return ordered.iloc[-1:]
+
+    return ordered.drop_duplicates(ENTITY_COLUMN, keep="last")
+
+
+def default_feature_names(df) -> list:
+    """
+    Полный набор признаков для датасета
+    (темпы роста — только при наличии колонки year).
+    """
+
+    growth = GROWTH_FEATURES if "year" in df else []
+
+    return RATIO_FEATURES + growth + INTEGRAL_FEATURES
+
+
+def calculate_feature_matrix(
+    data,
+    feature_names=None,
+    ordered: bool = False,
+    previous_rows: pd.DataFrame = None
+) -> np.ndarray:
+    """
+    Ядро расчета признаков без построения DataFrame.
+
+    Все коэффициенты рассчитываются за один проход по исходным
+    колонкам (блоками строк) и записываются в единый предварительно
+    выделенный массив.
+
+    :param data: DataFrame или словарь «колонка -> массив/число»
+    :param feature_names: список признаков в требуемом порядке
+                          (по умолчанию — полный набор)
+    :param ordered: строки уже упорядочены по году — темпы роста
+                    считаются относительно строки выше (того же
+                    предприятия), без сортировки по году
+    :param previous_rows: исходные строки, предшествующие данным
+                          (при порционной обработке): последняя строка
+                          или, при наличии ENTITY_COLUMN, последняя
+                          строка каждого предприятия
+    :return: массив (строки × признаки) в порядке feature_names
+    """
+
+    if feature_names is None:
+        feature_names = default_feature_names(data)
+
+    columns = [str(name) for name in feature_names]
+    computed = resolve_features(columns)
+
+    # запрошенные признаки занимают первые строки буфера,
+    # вспомогательные зависимости — последующие
+    buffer_names = columns + [name for name in computed if name not in columns]
+    rows = {name: i for i, name in enumerate(buffer_names)}
+
+    missing = [col for col in required_inputs(columns) if col not in data]
+
+    if missing:
+        raise KeyError(
+            f"Для расчета признаков отсутствуют колонки: {missing}"
+        )
+
+    # исходные колонки читаются один раз, без промежуточных DataFrame
+    frame = _FrameData(data, ordered, previous_rows)
+
+    # признак хранится строкой буфера: out.T — представление без копирования
+    out = np.empty((len(buffer_names), frame.rows))
+
+    for start in range(0, frame.rows, _KERNEL_BLOCK_ROWS):
+        block = slice(start, start + _KERNEL_BLOCK_ROWS)
+        out_block = out[:, block]
+
+        ctx = _BlockContext(frame, block, out_block, rows)
+
+        for name in computed:
+            FEATURE_REGISTRY[name]["compute"](ctx, ctx.feature(name))
+
+        # замена бесконечных значений и NaN на 0
+        np.copyto(out_block, 0, where=~np.isfinite(out_block))
+
+    return out[:len(columns)].T
+
+
+def calculate_financial_ratios(
+    df: pd.DataFrame,
+    feature_names=None
+) -> pd.DataFrame:
+    """
+    Формирование признакового пространства
     для моделей машинного обучения.
+
+    Рассчитываются только запрошенные признаки и их зависимости
+    (см. FEATURE_REGISTRY); по умолчанию — полный набор.
+    Возвращаемый DataFrame является представлением массива,
+    сформированного calculate_feature_matrix. Результат совпадает
+    с последовательным применением calculate_liquidity_ratios,
+    calculate_financial_stability_ratios, calculate_profitability_ratios,
+    calculate_growth_rates и calculate_integral_score с заменой
+    бесконечностей и NaN на 0.
+
+    :param feature_names: список признаков в требуемом порядке,
+                          например model.feature_names_in_
     """
 
-    features = pd.DataFrame()
+    if feature_names is None:
+        feature_names = default_feature_names(df)
 
-    liquidity = calculate_liquidity_ratios(df)
-    stability = calculate_financial_stability_ratios(df)
-    profitability = calculate_profitability_ratios(df)
-    growth = calculate_growth_rates(df)
-    integral = calculate_integral_score(df)
+    columns = [str(name) for name in feature_names]
 
-    features = pd.concat(
-        [liquidity, stability, profitability, growth, integral],
-        axis=1
+    return pd.DataFrame(
+        calculate_feature_matrix(df, columns),
+        columns=columns,
+        copy=False
     )
 
-    features = _replace_infinite(features)
+
+# ============================================================
+# КЭШ ПРИЗНАКОВ ФАЙЛОВ ДАННЫХ
+# ============================================================
+
+# максимальное число файлов, признаки которых хранятся в памяти
+FEATURE_CACHE_MAX_FILES = 4
+
+# путь -> {"fingerprint", "features"}
+_feature_cache = OrderedDict()
+_feature_cache_lock = threading.Lock()
+
+
+def load_financial_ratios(file_path: str, progress=None) -> pd.DataFrame:
+    """
+    Загрузка файла данных и расчет полного набора признаков
+    с кэшированием в памяти процесса.
+
+    Ключ кэша — отпечаток файла (размер, mtime, SHA-256): пока
+    файл не изменился, повторный вызов (в том числе из другого
+    окна) возвращает ранее рассчитанную матрицу без загрузки
+    и пересчета. Результат используется совместно и не должен
+    изменяться вызывающей стороной.
+
+    :param progress: обработчик progress(message, percent) или None
+    """
+
+    def notify(message: str, percent: int) -> None:
+        if progress is not None:
+            progress(message, percent)
+
+    path = os.path.abspath(file_path)
+
+    notify("Проверка файла данных...", 0)
+
+    with _feature_cache_lock:
+        entry = _feature_cache.get(path)
+
+        if entry is not None and fingerprint_matches(
+            entry["fingerprint"], path
+        ):
+            _feature_cache.move_to_end(path)
+            notify("Коэффициенты загружены из кэша", 100)
+            return entry["features"]
+
+    fingerprint = file_fingerprint(path)
+
+    notify("Загрузка данных...", 10)
+    df = load_and_prepare_data(path, fingerprint=fingerprint)
+
+    notify(f"Расчет коэффициентов ({len(df)} строк)...", 50)
+    features = calculate_financial_ratios(df)
+
+    with _feature_cache_lock:
+        _feature_cache[path] = {
+            "fingerprint": fingerprint,
+            "features": features
+        }
+        _feature_cache.move_to_end(path)
+
+        while len(_feature_cache) > FEATURE_CACHE_MAX_FILES:
+            _feature_cache.popitem(last=False)
+
+    notify("Расчет завершен", 100)
 
     return features
 
 
+def clear_feature_cache() -> None:
+    with _feature_cache_lock:
+        _feature_cache.clear()
+
+
 # ============================================================
 # ИНТЕРПРЕТАЦИЯ ФИНАНСОВОГО СОСТОЯНИЯ
 # ============================================================
 
-def interpret_financial_state(features: pd.DataFrame) -> pd.DataFrame:
+# Категории выводов и их текстовые формулировки.
+# Код категории — индекс формулировки в списке.
+INTERPRETATION_LEVELS = {
+    "liquidity": [
+        "низкая ликвидность",
+        "приемлемая ликвидность",
+        "высокая ликвидность"
+    ],
+    "autonomy": [
+        "зависимость от заемных средств",
+        "высокая финансовая автономия"
+    ],
+    "profitability": [
+        "убыточная деятельность",
+        "прибыльная деятельность"
+    ],
+}
+
+# Все возможные сочетания выводов: индекс = код ликвидности * 4
+# + код автономии * 2 + код рентабельности
+_ANALYSIS_TEXTS = np.array(
+    [
+        "; ".join([liquidity, autonomy, profitability])
+        for liquidity in INTERPRETATION_LEVELS["liquidity"]
+        for autonomy in INTERPRETATION_LEVELS["autonomy"]
+        for profitability in INTERPRETATION_LEVELS["profitability"]
+    ],
+    dtype=object
+)
+
+
+def _feature_values(features: pd.DataFrame, column: str) -> np.ndarray:
     """
-    Формирование текстовой интерпретации финансового состояния
-    предприятия на основе рассчитанных коэффициентов.
+    Значения коэффициента в виде массива (0, если колонка отсутствует).
     """
+    if column not in features.columns:
+        return np.zeros(len(features))
 
-    interpretation = []
+    return features[column].to_numpy(dtype=float)
 
-    for _, row in features.iterrows():
-        conclusions = []
 
-        if row.get("current_ratio", 0) >= 2:
-            conclusions.append("высокая ликвидность")
-        elif row.get("current_ratio", 0) >= 1:
-            conclusions.append("приемлемая ликвидность")
-        else:
-            conclusions.append("низкая ликвидность")
+def _interpretation_codes(current_ratio, equity_ratio, return_on_assets):
+    """
+    Коды категорий выводов по значениям коэффициентов.
+    """
 
-        if row.get("equity_ratio", 0) >= 0.5:
-            conclusions.append("высокая финансовая автономия")
-        else:
-            conclusions.append("зависимость от заемных средств")
+    current_ratio = np.asarray(current_ratio, dtype=float)
 
-        if row.get("return_on_assets", 0) > 0:
-            conclusions.append("прибыльная деятельность")
-        else:
-            conclusions.append("убыточная деятельность")
+    liquidity = (
+        (current_ratio >= 1).astype(np.int8) +
+        (current_ratio >= 2).astype(np.int8)
+    )
+    autonomy = (np.asarray(equity_ratio) >= 0.5).astype(np.int8)
+    profitability = (np.asarray(return_on_assets) > 0).astype(np.int8)
+
+    return liquidity, autonomy, profitability
+
+
+def interpret_ratios(
+    current_ratio: float,
+    equity_ratio: float,
+    return_on_assets: float
+) -> str:
+    """
+    Текстовая интерпретация для одного набора коэффициентов
+    (без построения DataFrame).
+    """
+
+    liquidity, autonomy, profitability = _interpretation_codes(
+        current_ratio, equity_ratio, return_on_assets
+    )
+
+    return _ANALYSIS_TEXTS[liquidity * 4 + autonomy * 2 + profitability]
+
+
+def interpret_financial_codes(features: pd.DataFrame) -> pd.DataFrame:
+    """
+    Компактная кодированная интерпретация финансового состояния.
+
+    Возвращает DataFrame с колонками liquidity, autonomy и
+    profitability типа int8; расшифровка кодов —
+    в INTERPRETATION_LEVELS. Подходит для пакетной обработки,
+    где текстовые выводы не нужны.
+    """
+
+    liquidity, autonomy, profitability = _interpretation_codes(
+        _feature_values(features, "current_ratio"),
+        _feature_values(features, "equity_ratio"),
+        _feature_values(features, "return_on_assets")
+    )
+
+    return pd.DataFrame({
+        "liquidity": liquidity,
+        "autonomy": autonomy,
+        "profitability": profitability
+    })
+
+
+def interpret_financial_state(
+    features: pd.DataFrame,
+    as_categorical: bool = False
+) -> pd.DataFrame:
+    """
+    Формирование текстовой интерпретации финансового состояния
+    предприятия на основе рассчитанных коэффициентов.
+
+    :param as_categorical: вернуть выводы как pd.Categorical
+                           (текст хранится один раз на сочетание)
+    """
+
+    codes = interpret_financial_codes(features)
+
+    combined = (
+        codes["liquidity"].to_numpy() * 4 +
+        codes["autonomy"].to_numpy() * 2 +
+        codes["profitability"].to_numpy()
+    )
 
-        interpretation.append("; ".join(conclusions))
+    if as_categorical:
+        analysis = pd.Categorical.from_codes(combined, _ANALYSIS_TEXTS)
+    else:
+        analysis = _ANALYSIS_TEXTS.take(combined)
 
-    return pd.DataFrame({"analysis": interpretation})
+    return pd.DataFrame({"analysis": analysis})
 
 
 # ============================================================
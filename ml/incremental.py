@@ -0,0 +1,186 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Инкрементальное обновление признакового пространства
+при поступлении данных за новые отчетные периоды.
+
+Вместо повторного расчета всей истории сохраняются ранее
+рассчитанная матрица признаков и последняя известная строка
+каждого предприятия. Для новых строк рассчитываются только их
+коэффициенты и темпы роста, результат совпадает с полным
+пересчетом calculate_financial_ratios по объединенным данным.
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ml.features import (
+    calculate_feature_matrix,
+    default_feature_names,
+    last_known_rows
+)
+from utils.data_loader import ENTITY_COLUMN
+
+
+class IncrementalFeatureUpdater:
+    """
+    Хранилище признаков с дописыванием новых отчетных периодов.
+
+    Пример:
+        updater = IncrementalFeatureUpdater()
+        updater.fit(history)
+        new_features = updater.append(new_quarter)
+        all_features = updater.features
+    """
+
+    def __init__(self, feature_names=None):
+        self.feature_names = (
+            None if feature_names is None
+            else [str(name) for name in feature_names]
+        )
+        self.last_rows = None
+        self._matrix = None
+        self._rows = 0
+
+    # ---------------------------------------------------------
+    # ОБНОВЛЕНИЕ
+    # ---------------------------------------------------------
+
+    def fit(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Полный расчет признаков по историческим данным.
+        """
+
+        if self.feature_names is None:
+            self.feature_names = default_feature_names(df)
+
+        self._matrix = None
+        self._rows = 0
+        self.last_rows = None
+
+        return self.append(df)
+
+    def append(self, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Расчет признаков только для новых строк и добавление их
+        в конец матрицы признаков.
+
+        Новые строки должны относиться к тому же или более позднему
+        году, чем последняя известная строка предприятия: иначе
+        изменились бы темпы роста уже рассчитанных строк
+        и требуется полный пересчет (fit).
+
+        :return: DataFrame признаков новых строк
+        """
+
+        if self.feature_names is None:
+            return self.fit(new_rows)
+
+        if len(new_rows) and self.last_rows is not None:
+            self._check_order(new_rows)
+
+        X = calculate_feature_matrix(
+            new_rows, self.feature_names, previous_rows=self.last_rows
+        )
+
+        self._write(X)
+
+        if len(new_rows) and "year" in new_rows.columns:
+            self.last_rows = last_known_rows(
+                pd.concat([self.last_rows, new_rows])
+                if self.last_rows is not None else new_rows
+            )
+
+        return pd.DataFrame(X, columns=self.feature_names, index=new_rows.index)
+
+    @property
+    def features(self) -> pd.DataFrame:
+        """
+        Матрица признаков всех обработанных строк
+        (в порядке поступления, без копирования).
+        """
+
+        if self._matrix is None:
+            return pd.DataFrame(columns=self.feature_names)
+
+        return pd.DataFrame(
+            self._matrix[:self._rows], columns=self.feature_names, copy=False
+        )
+
+    # ---------------------------------------------------------
+    # СОХРАНЕНИЕ СОСТОЯНИЯ
+    # ---------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """
+        Сохранение состояния между запусками (например, ежеквартально).
+        """
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "IncrementalFeatureUpdater":
+        return joblib.load(path)
+
+    def __getstate__(self):
+        # сохраняется только заполненная часть буфера
+        state = self.__dict__.copy()
+        if self._matrix is not None:
+            state["_matrix"] = self._matrix[:self._rows].copy()
+        return state
+
+    # ---------------------------------------------------------
+    # ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ
+    # ---------------------------------------------------------
+
+    def _check_order(self, new_rows: pd.DataFrame) -> None:
+        """
+        Проверка, что новые строки не предшествуют известным.
+        """
+
+        if "year" not in new_rows.columns:
+            return
+
+        year = new_rows["year"].to_numpy()
+
+        if pd.isna(year).any():
+            raise ValueError(
+                "Для инкрементального обновления год должен быть заполнен."
+            )
+
+        if ENTITY_COLUMN in self.last_rows.columns:
+            positions = pd.Index(
+                self.last_rows[ENTITY_COLUMN]
+            ).get_indexer(new_rows[ENTITY_COLUMN])
+            known = positions >= 0
+            last_year = self.last_rows["year"].to_numpy()[positions[known]]
+            year = year[known]
+        else:
+            last_year = self.last_rows["year"].to_numpy()[-1]
+
+        if np.any(year < last_year):
+            raise ValueError(
+                "Новые строки относятся к периоду раньше уже обработанного; "
+                "требуется полный пересчет (fit)."
+            )
+
+    def _write(self, X: np.ndarray) -> None:
+        """
+        Дописывание строк в буфер с удвоением емкости:
+        амортизированная стоимость пропорциональна числу новых строк.
+        """
+
+        needed = self._rows + len(X)
+
+        if self._matrix is None or needed > len(self._matrix):
+            capacity = max(needed, 2 * (0 if self._matrix is None
+                                         else len(self._matrix)), 1024)
+            matrix = np.empty((capacity, len(self.feature_names)))
+            if self._matrix is not None:
+                matrix[:self._rows] = self._matrix[:self._rows]
+            self._matrix = matrix
+
+        self._matrix[self._rows:needed] = X
+        self._rows = needed
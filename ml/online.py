@@ -0,0 +1,436 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Инкрементальное (онлайн) обучение линейной модели.
+
+Логистическая регрессия обучается стохастическим градиентным
+спуском (SGDClassifier, loss="log_loss") порциями данных через
+partial_fit: датасет не загружается в память целиком, а данные
+за новые отчетные периоды дообучают модель без полного
+переобучения. Масштабирование признаков (среднее и дисперсия)
+также обновляется по каждой порции; коэффициенты модели при этом
+пересчитываются к новому масштабу, так что обновление статистик
+само по себе не меняет прогноз.
+
+Во время обучения состояние периодически сохраняется
+в контрольную точку (<модель>.checkpoint): прерванное обучение
+продолжается с последней сохраненной порции.
+
+Итоговая модель сохраняется в .pkl и экспортируется в ml.runtime,
+поэтому ее можно подключить к реестру MODELS (ml.predict)
+наравне с моделями Random Forest и Logistic Regression.
+"""
+
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from ml.features import (
+    calculate_feature_matrix,
+    default_feature_names,
+    last_known_rows
+)
+from ml.runtime import export_runtime
+from utils.data_loader import (
+    file_fingerprint,
+    fingerprint_matches,
+    load_and_prepare_data_chunks
+)
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+
+ONLINE_MODEL_PATH = os.path.join(
+    PROJECT_ROOT, "models", "model_online.pkl"
+)
+
+# размер порции обучения (строк)
+ONLINE_CHUNK_ROWS = 10_000
+
+# сохранение контрольной точки после каждых N порций
+CHECKPOINT_EVERY_CHUNKS = 10
+
+# классы целевой переменной (должны быть известны до первой порции)
+ONLINE_CLASSES = np.array([0, 1])
+
+# параметры SGDClassifier
+SGD_PARAMS = {
+    "loss": "log_loss",
+    "alpha": 1e-4,
+    "random_state": 42
+}
+
+
+# ============================================================
+# МОДЕЛЬ
+# ============================================================
+
+class OnlineLogisticModel:
+    """
+    Логистическая регрессия с инкрементальным обучением.
+
+    Модель обучается на масштабированных признаках, а для прогноза
+    коэффициенты пересчитываются к исходному масштабу признаков.
+    Статистики масштабирования обновляются по каждой порции; перед
+    шагом обучения коэффициенты SGD пересчитываются к новым среднему
+    и масштабу так, чтобы решающая функция в исходном масштабе
+    признаков не изменилась: меняет модель только сам шаг
+    градиентного спуска по новой порции.
+
+    Атрибуты coef_, intercept_, classes_, feature_names_in_
+    совпадают по смыслу с LogisticRegression, поэтому модель
+    применяется ml.predict и экспортируется ml.runtime как обычная
+    линейная модель.
+
+    Пример:
+        model = OnlineLogisticModel()
+        for chunk in chunks:
+            model.partial_fit(chunk)
+        model.predict_proba(X)
+    """
+
+    def __init__(self, feature_names=None, params: dict = None):
+        self.feature_names = (
+            None if feature_names is None
+            else [str(name) for name in feature_names]
+        )
+        self.scaler = StandardScaler()
+        self.classifier = SGDClassifier(**{**SGD_PARAMS, **(params or {})})
+        # последняя строка каждого предприятия (для темпов роста
+        # первых строк следующей порции)
+        self.last_rows = None
+        self.rows_seen = 0
+        # отпечатки файлов данных, по которым модель уже обучена
+        self.sources = []
+
+    # ---------------------------------------------------------
+    # ОБУЧЕНИЕ
+    # ---------------------------------------------------------
+
+    def partial_fit(self, df: pd.DataFrame) -> "OnlineLogisticModel":
+        """
+        Дообучение на порции данных (с колонкой label).
+
+        Порции должны поступать в порядке отчетных периодов
+        (как из load_and_prepare_data_chunks): темпы роста первых
+        строк порции рассчитываются относительно last_rows.
+        """
+
+        if "label" not in df.columns:
+            raise ValueError("В данных отсутствует целевая переменная label")
+
+        if not len(df):
+            return self
+
+        if self.feature_names is None:
+            self.feature_names = [
+                str(name) for name in default_feature_names(df)
+            ]
+
+        X = calculate_feature_matrix(
+            df, self.feature_names, ordered=True,
+            previous_rows=self.last_rows
+        )
+        y = df["label"].to_numpy(dtype=np.int64)
+
+        self._update_scaler(X)
+        self.classifier.partial_fit(
+            self.scaler.transform(X), y, classes=ONLINE_CLASSES
+        )
+
+        self.last_rows = last_known_rows(
+            pd.concat([self.last_rows, df])
+            if self.last_rows is not None else df
+        )
+        self.rows_seen += len(df)
+
+        return self
+
+    def _update_scaler(self, X: np.ndarray) -> None:
+        """
+        Обновление статистик масштабирования с пересчетом
+        коэффициентов: w·(x − m)/s + b сохраняется для любого x.
+        """
+
+        if not hasattr(self.classifier, "coef_"):
+            self.scaler.partial_fit(X)
+            return
+
+        # коэффициенты в исходном масштабе признаков
+        coef, intercept = self.coef_, self.intercept_
+
+        self.scaler.partial_fit(X)
+
+        self.classifier.coef_ = coef * self.scaler.scale_
+        self.classifier.intercept_ = intercept + coef @ self.scaler.mean_
+
+    # ---------------------------------------------------------
+    # АТРИБУТЫ ЛИНЕЙНОЙ МОДЕЛИ
+    # ---------------------------------------------------------
+
+    @property
+    def coef_(self) -> np.ndarray:
+        """
+        Коэффициенты для немасштабированных признаков.
+        """
+        return self.classifier.coef_ / self.scaler.scale_
+
+    @property
+    def intercept_(self) -> np.ndarray:
+        return (
+            self.classifier.intercept_
+            - self.coef_ @ self.scaler.mean_
+        )
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.classifier.classes_
+
+    @property
+    def n_features_in_(self) -> int:
+        return len(self.feature_names)
+
+    @property
+    def feature_names_in_(self) -> np.ndarray:
+        return np.asarray(self.feature_names, dtype=object)
+
+    # ---------------------------------------------------------
+    # ПРОГНОЗ
+    # ---------------------------------------------------------
+
+    def decision_function(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        return (X @ self.coef_.T + self.intercept_).ravel()
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(
+            (self.decision_function(X) > 0).astype(np.intp)
+        )
+
+
+# ============================================================
+# КОНТРОЛЬНЫЕ ТОЧКИ
+# ============================================================
+
+def checkpoint_path(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + ".checkpoint"
+
+
+def _dump_atomic(value, path: str) -> None:
+    # временный файл прерванной записи перезаписывается
+    # при следующем сохранении
+    joblib.dump(value, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def _load_checkpoint(path: str, data_path: str, chunksize: int,
+                     model_path: str, update: bool):
+    """
+    Контрольная точка обучения по тому же файлу данных с тем же
+    размером порции и в том же режиме (None, если продолжать нечего).
+
+    Контрольная точка дообучения относится к конкретной сохраненной
+    модели: если модель с тех пор заменена, продолжать нельзя.
+    Неподходящая контрольная точка удаляется.
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    try:
+        checkpoint = joblib.load(path)
+    except Exception:
+        checkpoint = None
+
+    if checkpoint is None or not _checkpoint_matches(
+        checkpoint, data_path, chunksize, model_path, update
+    ):
+        os.remove(path)
+        return None
+
+    return checkpoint
+
+
+def _checkpoint_matches(checkpoint: dict, data_path: str, chunksize: int,
+                        model_path: str, update: bool) -> bool:
+    try:
+        if checkpoint.get("chunksize") != chunksize:
+            return False
+
+        if checkpoint.get("update") != update:
+            return False
+
+        if not fingerprint_matches(checkpoint["source"], data_path):
+            return False
+
+        if update:
+            return fingerprint_matches(checkpoint["base"], model_path)
+
+        return True
+
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+# ============================================================
+# ОБУЧЕНИЕ ПО ФАЙЛУ ДАННЫХ
+# ============================================================
+
+def train_online(
+    data_path: str,
+    model_path: str = ONLINE_MODEL_PATH,
+    update: bool = False,
+    chunksize: int = ONLINE_CHUNK_ROWS,
+    checkpoint_every: int = CHECKPOINT_EVERY_CHUNKS,
+    progress=None
+) -> OnlineLogisticModel:
+    """
+    Порционное обучение линейной модели по файлу данных.
+
+    :param update: дообучить сохраненную модель model_path на новых
+                   данных (например, за очередной квартал); иначе
+                   модель обучается с начала. Файл, уже учтенный
+                   моделью (то же содержимое), повторно не принимается
+    :param checkpoint_every: период сохранения контрольной точки
+                             (в порциях); если для того же файла,
+                             режима и (при дообучении) той же
+                             сохраненной модели есть контрольная точка,
+                             обучение продолжается с нее
+    :param progress: обработчик progress(message, rows) или None
+    :return: обученная модель (сохранена в model_path
+             и экспортирована в ml.runtime)
+    """
+
+    # каталог модели нужен уже для первой контрольной точки
+    os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+
+    checkpoint_file = checkpoint_path(model_path)
+    checkpoint = _load_checkpoint(
+        checkpoint_file, data_path, chunksize, model_path, update
+    )
+
+    # отпечаток исходной модели: контрольная точка дообучения
+    # действительна, только пока эта модель не заменена
+    base = file_fingerprint(model_path) if update else None
+
+    if checkpoint is not None:
+        model = checkpoint["model"]
+        skip_rows = checkpoint["rows"]
+    elif update:
+        model = joblib.load(model_path)
+        skip_rows = 0
+    else:
+        model = OnlineLogisticModel()
+        skip_rows = 0
+
+    source = file_fingerprint(data_path)
+
+    if any(known["sha256"] == source["sha256"] for known in model.sources):
+        raise ValueError(
+            f"Файл данных уже учтен моделью: {data_path}"
+        )
+
+    rows = 0
+    chunks = 0
+
+    for chunk in load_and_prepare_data_chunks(data_path, chunksize):
+        # порции, учтенные до контрольной точки, пропускаются
+        if rows < skip_rows:
+            rows += len(chunk)
+            continue
+
+        model.partial_fit(chunk)
+
+        rows += len(chunk)
+        chunks += 1
+
+        if progress is not None:
+            progress(f"Обработано строк: {rows}", rows)
+
+        if checkpoint_every and chunks % checkpoint_every == 0:
+            _dump_atomic(
+                {
+                    "model": model,
+                    "source": source,
+                    "rows": rows,
+                    "chunksize": chunksize,
+                    "update": update,
+                    "base": base
+                },
+                checkpoint_file
+            )
+
+    if model.feature_names is None:
+        raise ValueError("Файл данных не содержит строк для обучения.")
+
+    model.sources.append(source)
+
+    _dump_atomic(model, model_path)
+
+    # экспорт для применения без sklearn (ml.runtime)
+    export_runtime(model, model_path)
+
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+    return model
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    # модель сохраняется с классом из ml.online, а не из __main__,
+    # иначе ее нельзя загрузить из других модулей
+    from ml.online import train_online
+
+    parser = argparse.ArgumentParser(
+        description="Инкрементальное обучение линейной модели"
+    )
+    parser.add_argument("--data", default="data/financial_data.csv")
+    parser.add_argument("--model", default=ONLINE_MODEL_PATH)
+    parser.add_argument(
+        "--update", action="store_true",
+        help="дообучить сохраненную модель на новых данных"
+    )
+    parser.add_argument("--chunksize", type=int, default=ONLINE_CHUNK_ROWS)
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=CHECKPOINT_EVERY_CHUNKS
+    )
+
+    args = parser.parse_args()
+
+    model = train_online(
+        args.data,
+        args.model,
+        update=args.update,
+        chunksize=args.chunksize,
+        checkpoint_every=args.checkpoint_every,
+        progress=lambda message, rows: print(message)
+    )
+
+    print(f"Обучено на строках: {model.rows_seen}")
+    print(f"Модель сохранена: {args.model}")
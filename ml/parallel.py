@@ -0,0 +1,126 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Параллельная обработка задач над общей матрицей признаков.
+
+Используется подбором гиперпараметров (ml.tuning) и сравнением
+моделей (ml.compare). Матрица признаков и метки один раз
+записываются в файлы .npy и открываются рабочими процессами
+через memory-map, а не передаются каждому процессу сериализацией.
+При n_workers=1 задачи выполняются в текущем процессе без пула
+(в том числе в процессе-демоне, которому запрещено создавать
+дочерние процессы).
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+# ============================================================
+# РАБОЧИЙ ПРОЦЕСС
+# ============================================================
+
+# матрица признаков и метки рабочего процесса (memory-map)
+_worker_data = {}
+
+
+def _init_worker(X_path: str, y_path: str) -> None:
+    # исключение в initializer делает пул непригодным без указания
+    # причины, поэтому ошибка сохраняется и передается с первой задачей
+    try:
+        _worker_data["X"] = np.load(X_path, mmap_mode="r")
+        _worker_data["y"] = np.load(y_path, mmap_mode="r")
+    except Exception as error:
+        _worker_data["error"] = (
+            f"Рабочий процесс не смог открыть общие данные: {error!r}"
+        )
+
+
+def _run_in_worker(function, args: tuple):
+    if "error" in _worker_data:
+        raise RuntimeError(_worker_data["error"])
+
+    return function(_worker_data["X"], _worker_data["y"], *args)
+
+
+# ============================================================
+# ВЫПОЛНЕНИЕ ЗАДАЧ
+# ============================================================
+
+def encode_labels(y) -> np.ndarray:
+    """
+    Числовые коды классов в порядке сортировки меток (np.unique):
+    строковые метки (object) нельзя открыть через memory-map.
+    Для меток 0/1 коды совпадают с метками.
+    """
+    _, codes = np.unique(np.asarray(y), return_inverse=True)
+    return codes
+
+
+def run_on_data(function, tasks: list, X, y, collect,
+                n_workers: int = None, prefix: str = "tasks-") -> None:
+    """
+    Вызов function(X, y, *args) для каждого набора аргументов tasks.
+
+    :param function: функция уровня модуля (передается в процессы)
+    :param y: метки; задачи получают их коды (encode_labels)
+    :param collect: обработчик collect(result, index), вызываемый
+                    в текущем процессе по мере готовности результатов;
+                    исключение из него прерывает обработку, и ожидающие
+                    задачи пула отменяются
+    :param n_workers: число процессов (по умолчанию — число ядер)
+    :param prefix: префикс временного каталога с данными
+    """
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    n_workers = max(1, min(n_workers, len(tasks)))
+
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = encode_labels(y)
+
+    if n_workers == 1:
+        for index, args in enumerate(tasks):
+            collect(function(X, y, *args), index)
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix=prefix)
+
+    try:
+        X_path = os.path.join(tmp_dir, "X.npy")
+        y_path = os.path.join(tmp_dir, "y.npy")
+        np.save(X_path, X)
+        np.save(y_path, y)
+
+        pool = ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(X_path, y_path)
+        )
+
+        try:
+            futures = {
+                pool.submit(_run_in_worker, function, args): index
+                for index, args in enumerate(tasks)
+            }
+
+            for future in as_completed(futures):
+                collect(future.result(), futures[future])
+
+        except BaseException:
+            # при отмене или ошибке не ожидаем выполнения
+            # оставшихся задач
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        pool.shutdown()
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -10,13 +10,27 @@
 """
 
 import os
-import joblib
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 
 from ml.features import (
+    calculate_feature_matrix,
     calculate_financial_ratios,
-    interpret_financial_state
+    default_feature_names,
+    interpret_financial_state,
+    interpret_ratios
+)
+from ml.runtime import (
+    RUNTIME_SUFFIX,
+    load_runtime,
+    runtime_path,
+    runtime_source
 )
+from utils.data_loader import ENTITY_COLUMN, fingerprint_matches
 
 # ============================================================
 # ПУТИ К МОДЕЛЯМ
@@ -31,10 +45,265 @@ MODELS = {
     "Logistic Regression": os.path.join(PROJECT_ROOT, "models", "model2.pkl"),
 }
 
+# ============================================================
+# РЕЕСТР ЗАГРУЖЕННЫХ МОДЕЛЕЙ
+# ============================================================
+
+# максимальное число моделей, одновременно хранимых в памяти
+MODEL_CACHE_MAX_MODELS = 4
+
+# ограничение суммарного размера артефактов в памяти (байт), None — без ограничения
+MODEL_CACHE_MAX_BYTES = None
+
+# использовать экспортированную модель (ml.runtime), если она
+# получена из текущего файла .pkl: быстрее на небольших пакетах
+# и не требует sklearn
+USE_RUNTIME_MODELS = True
+
+
+def _file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Контрольная сумма файла модели (SHA-256).
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _load_artifact(path: str):
+    """
+    Загрузка модели: экспортированной (ml.runtime) или pickle sklearn.
+    """
+
+    if path.endswith(RUNTIME_SUFFIX):
+        return load_runtime(path)
+
+    # joblib (и sklearn при распаковке) импортируются только
+    # для моделей без экспорта
+    import joblib
+
+    return joblib.load(path)
+
+
+# путь экспорта -> (mtime_ns и размер экспорта, отпечаток его .pkl)
+_runtime_sources = {}
+_runtime_sources_lock = threading.Lock()
+
+
+def _exported_source(exported: str):
+    """
+    Отпечаток исходного .pkl, записанный в экспорт; читается
+    повторно только при изменении файла экспорта.
+    """
+
+    stat = os.stat(exported)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    with _runtime_sources_lock:
+        cached = _runtime_sources.get(exported)
+
+        if cached is None or cached[0] != key:
+            cached = (key, runtime_source(exported))
+            _runtime_sources[exported] = cached
+
+        return cached[1]
+
+
+def resolve_model_path(model_path: str) -> str:
+    """
+    Выбор файла для загрузки модели: экспортированная модель
+    <имя>.runtime.npz используется, если записанный в нее отпечаток
+    совпадает с текущим файлом .pkl (fingerprint_matches); экспорт
+    без отпечатка или устаревший после переобучения игнорируется.
+    """
+
+    if not USE_RUNTIME_MODELS:
+        return model_path
+
+    exported = runtime_path(model_path)
+
+    if not os.path.exists(exported):
+        return model_path
+
+    if not os.path.exists(model_path):
+        return exported
+
+    source = _exported_source(exported)
+
+    if source is None or not fingerprint_matches(source, model_path):
+        return model_path
+
+    return exported
+
+
+class ModelRegistry:
+    """
+    Процессный кэш обученных моделей.
+
+    Каждая модель загружается с диска один раз и хранится в памяти.
+    Повторная загрузка выполняется только при изменении файла:
+    сначала сравниваются mtime и размер, а при их расхождении —
+    контрольная сумма содержимого. Давно не использованные модели
+    вытесняются по принципу LRU с учетом лимита количества и размера.
+    """
+
+    def __init__(
+        self,
+        max_models: int = MODEL_CACHE_MAX_MODELS,
+        max_bytes: int = MODEL_CACHE_MAX_BYTES
+    ):
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+
+        # путь -> {"model", "mtime_ns", "size", "digest"}
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, model_path: str):
+        """
+        Получение модели из кэша с проверкой актуальности файла.
+        """
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Файл модели не найден: {model_path}"
+            )
+
+        with self._lock:
+            stat = os.stat(model_path)
+            entry = self._entries.get(model_path)
+
+            if entry is not None:
+                if (entry["mtime_ns"], entry["size"]) == (
+                    stat.st_mtime_ns, stat.st_size
+                ):
+                    self._entries.move_to_end(model_path)
+                    return entry["model"]
+
+                # файл «тронут», но содержимое могло не измениться
+                if entry["digest"] == _file_digest(model_path):
+                    entry["mtime_ns"] = stat.st_mtime_ns
+                    entry["size"] = stat.st_size
+                    self._entries.move_to_end(model_path)
+                    return entry["model"]
+
+            entry = {
+                "model": _load_artifact(model_path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": _file_digest(model_path)
+            }
+
+            self._entries[model_path] = entry
+            self._entries.move_to_end(model_path)
+            self._evict()
+
+            return entry["model"]
+
+    def invalidate(self, model_path: str = None) -> None:
+        """
+        Удаление модели (или всех моделей) из кэша.
+        """
+
+        with self._lock:
+            if model_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(model_path, None)
+
+    def loaded(self) -> list:
+        """
+        Список путей моделей, находящихся в памяти.
+        """
+
+        with self._lock:
+            return list(self._entries)
+
+    def _evict(self) -> None:
+        """
+        Вытеснение давно не использованных моделей (LRU).
+        Последняя загруженная модель не вытесняется.
+        """
+
+        while len(self._entries) > 1:
+            total_bytes = sum(e["size"] for e in self._entries.values())
+
+            over_count = (
+                self.max_models is not None
+                and len(self._entries) > self.max_models
+            )
+            over_bytes = (
+                self.max_bytes is not None
+                and total_bytes > self.max_bytes
+            )
+
+            if not (over_count or over_bytes):
+                break
+
+            self._entries.popitem(last=False)
+
+
+_registry = ModelRegistry()
+
+
+def get_model(model_name: str):
+    """
+    Получение обученной модели по имени из реестра MODELS.
+    """
+
+    if model_name not in MODELS:
+        raise ValueError("Неизвестная модель.")
+
+    return _registry.get(resolve_model_path(MODELS[model_name]))
+
+
+def preload(model_names=None) -> None:
+    """
+    Предварительная загрузка моделей в память.
+    По умолчанию загружаются все модели из MODELS.
+    """
+
+    for model_name in (model_names or list(MODELS)):
+        get_model(model_name)
+
+
+def invalidate(model_name: str = None) -> None:
+    """
+    Сброс кэша модели (или всех моделей при model_name=None).
+    """
+
+    if model_name is None:
+        _registry.invalidate()
+        return
+
+    if model_name not in MODELS:
+        raise ValueError("Неизвестная модель.")
+
+    _registry.invalidate(MODELS[model_name])
+    _registry.invalidate(runtime_path(MODELS[model_name]))
+
 # ============================================================
 # ВАЛИДАЦИЯ ДАННЫХ
 # ============================================================
 
+# показатели баланса, которые принимает модель на вход
+INPUT_COLUMNS = [
+    "year",
+    "current_assets",
+    "current_liabilities",
+    "equity",
+    "total_assets",
+    "profit"
+]
+
+# обязательные показатели: год нужен только для темпов роста
+# и, как в predict_stability, может отсутствовать
+REQUIRED_INPUT_COLUMNS = [col for col in INPUT_COLUMNS if col != "year"]
+
 def validate_input_data(
     current_assets: float,
     current_liabilities: float,
@@ -68,13 +337,203 @@ def validate_input_data(
             "Баланс не сходится: Активы ≠ Капитал + Обязательства."
         )
 
+
+def _numeric_input_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приведение показателей INPUT_COLUMNS к числам: значения,
+    которые не удалось преобразовать (например, "abc"),
+    заменяются на NaN (как в ml.service.score_records).
+    """
+
+    columns = [col for col in INPUT_COLUMNS if col in df.columns]
+
+    if all(pd.api.types.is_numeric_dtype(df[col]) for col in columns):
+        return df
+
+    return df.assign(**{
+        col: pd.to_numeric(df[col], errors="coerce") for col in columns
+    })
+
+
+def validate_input_frame(df: pd.DataFrame) -> pd.Series:
+    """
+    Векторная проверка экономической корректности набора записей.
+    Правила совпадают с validate_input_data; нечисловые значения
+    показателей отклоняются для своей строки, не прерывая проверку
+    остальных.
+
+    :return: Series с текстом ошибки для некорректных строк
+             и None для корректных
+    """
+
+    missing = [
+        col for col in REQUIRED_INPUT_COLUMNS if col not in df.columns
+    ]
+
+    if missing:
+        raise ValueError(
+            f"Во входных данных отсутствуют показатели: {missing}"
+        )
+
+    columns = [col for col in INPUT_COLUMNS if col in df.columns]
+    numeric = _numeric_input_frame(df)
+
+    # заполненные, но не преобразуемые в число значения
+    not_numeric = (numeric[columns].isna() & df[columns].notna()).any(axis=1)
+
+    df = numeric
+
+    current_assets = df["current_assets"]
+    current_liabilities = df["current_liabilities"]
+    equity = df["equity"]
+    total_assets = df["total_assets"]
+
+    # допустимое отклонение баланса — 1%
+    tolerance = total_assets * 0.01
+
+    # порядок проверок повторяет validate_input_data
+    # (после проверки, что значения — числа)
+    checks = [
+        (
+            not_numeric,
+            "Финансовые показатели должны быть числами."
+        ),
+        (
+            df[REQUIRED_INPUT_COLUMNS].isna().any(axis=1),
+            "Не заполнены обязательные финансовые показатели."
+        ),
+        (
+            total_assets <= 0,
+            "Всего активов должно быть больше нуля."
+        ),
+        (
+            (current_assets < 0) | (current_liabilities < 0) | (equity < 0),
+            "Финансовые показатели не могут быть отрицательными."
+        ),
+        (
+            total_assets < current_assets,
+            "Всего активов не может быть меньше оборотных активов."
+        ),
+        (
+            ((equity + current_liabilities) - total_assets).abs() > tolerance,
+            "Баланс не сходится: Активы ≠ Капитал + Обязательства."
+        ),
+    ]
+
+    errors = pd.Series(None, index=df.index, dtype=object)
+
+    # более ранняя проверка имеет приоритет
+    for mask, message in reversed(checks):
+        errors[mask.to_numpy()] = message
+
+    return errors
+
+
+def _to_input_frame(data) -> pd.DataFrame:
+    """
+    Приведение входных данных пакетного прогноза к DataFrame:
+    поддерживаются DataFrame, список словарей, словарь колонок
+    и двумерный массив с колонками в порядке INPUT_COLUMNS.
+    """
+
+    if isinstance(data, pd.DataFrame):
+        return data
+
+    if isinstance(data, np.ndarray):
+        if data.ndim != 2 or data.shape[1] != len(INPUT_COLUMNS):
+            raise ValueError(
+                f"Ожидается массив формы (n, {len(INPUT_COLUMNS)}) "
+                f"с колонками {INPUT_COLUMNS}"
+            )
+        return pd.DataFrame(data, columns=INPUT_COLUMNS)
+
+    return pd.DataFrame(data)
+
+
+def _growth_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Записи пакета для расчета признаков.
+
+    Темпы роста рассчитываются только между записями одного
+    предприятия (ENTITY_COLUMN). Без этой колонки записи пакета
+    не связаны между собой, и каждая оценивается как отдельная
+    запись predict_stability (без предыдущего года).
+    """
+
+    df = df.reset_index(drop=True)
+
+    if ENTITY_COLUMN not in df.columns:
+        df = df.assign(**{ENTITY_COLUMN: np.arange(len(df))})
+
+    return df
+
 # ============================================================
 # ПРОГНОЗ
 # ============================================================
 
+def model_feature_names(model, data) -> list:
+    """
+    Признаки, на которых обучена модель
+    (для моделей без feature_names_in_ — полный набор).
+    """
+
+    if hasattr(model, "feature_names_in_"):
+        return list(model.feature_names_in_)
+
+    return default_feature_names(data)
+
+
+def _model_input(model, X: np.ndarray):
+    """
+    Признаки в том виде, в котором модель обучена: оценщику sklearn,
+    обученному на DataFrame, — DataFrame с именами признаков (иначе
+    sklearn предупреждает при каждом вызове); экспортированным
+    моделям ml.runtime и ml.online — массив без копирования.
+    """
+
+    if (type(model).__module__.startswith("sklearn.")
+            and hasattr(model, "feature_names_in_")):
+        return pd.DataFrame(X, columns=model.feature_names_in_, copy=False)
+
+    return X
+
+
+def predict_rows(model, X: np.ndarray):
+    """
+    Прогноз по двумерному массиву признаков в порядке обучения модели.
+
+    predict_proba вызывается один раз; класс определяется по
+    максимальной вероятности, а при равенстве вероятностей —
+    вызовом predict, поэтому результат совпадает с model.predict.
+
+    Глобальные фильтры предупреждений не изменяются: функция
+    вызывается одновременно из нескольких потоков (ml.service,
+    прогрев моделей в GUI).
+
+    :return: (массив классов, массив вероятностей класса 1 или None)
+    """
+
+    if not hasattr(model, "predict_proba"):
+        return model.predict(_model_input(model, X)), None
+
+    proba = model.predict_proba(_model_input(model, X))
+    prediction = model.classes_.take(proba.argmax(axis=1))
+
+    ordered = np.sort(proba, axis=1)
+    tied = ordered[:, -1] == ordered[:, -2]
+
+    if tied.any():
+        prediction[tied] = model.predict(_model_input(model, X[tied]))
+
+    return prediction, proba[:, 1]
+
+
 def predict_stability(input_data: dict, model_name: str) -> dict:
     """
     Прогноз финансовой устойчивости с выбором модели.
+
+    Признаки одной записи рассчитываются напрямую из словаря
+    в массив в порядке признаков модели, без построения DataFrame.
     """
 
     if model_name not in MODELS:
@@ -88,39 +547,97 @@ def predict_stability(input_data: dict, model_name: str) -> dict:
         total_assets=input_data["total_assets"]
     )
 
-    model_path = MODELS[model_name]
+    model = get_model(model_name)
 
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(
-            f"Файл модели не найден: {model_path}"
-        )
+    # --- только признаки, известные модели ---
+    feature_names = model_feature_names(model, input_data)
+    X = calculate_feature_matrix(input_data, feature_names)
 
-    model = joblib.load(model_path)
+    # --- прогноз ---
+    prediction, probability = predict_rows(model, X)
 
-    # --- подготовка данных ---
-    df = pd.DataFrame([input_data])
+    values = dict(zip(feature_names, X[0]))
 
-    features = calculate_financial_ratios(df)
+    interpretation = interpret_ratios(
+        values.get("current_ratio", 0),
+        values.get("equity_ratio", 0),
+        values.get("return_on_assets", 0)
+    )
 
-    # --- выравнивание признаков под модель ---
-    if hasattr(model, "feature_names_in_"):
-        features = features[model.feature_names_in_]
+    return {
+        "model": model_name,
+        "prediction": int(prediction[0]),
+        "probability": None if probability is None else float(probability[0]),
+        "features": pd.DataFrame(X.round(3), columns=feature_names),
+        "interpretation": interpretation
+    }
 
-    # --- прогноз ---
-    prediction = int(model.predict(features)[0])
 
-    probability = None
-    if hasattr(model, "predict_proba"):
-        probability = float(model.predict_proba(features)[0][1])
+def predict_stability_batch(data, model_name: str) -> dict:
+    """
+    Пакетный прогноз финансовой устойчивости.
+
+    Валидация, расчет признаков и вызов модели выполняются
+    один раз для всего набора записей. Некорректные записи
+    не прерывают расчет, а возвращаются в отдельной таблице.
+    Год не обязателен; темпы роста рассчитываются только между
+    записями одного предприятия (см. _growth_frame).
+
+    :param data: DataFrame, список словарей, словарь колонок
+                 или массив (n, 6) в порядке INPUT_COLUMNS
+    :return: словарь с ключами:
+             model   — имя модели;
+             results — DataFrame (prediction, probability,
+                       interpretation) для корректных строк;
+             errors  — DataFrame (error) для отклоненных строк.
+             Индекс обеих таблиц совпадает с индексом входных данных.
+    """
+
+    if model_name not in MODELS:
+        raise ValueError("Неизвестная модель.")
+
+    df = _to_input_frame(data)
 
-    interpretation = interpret_financial_state(features)
+    # --- валидация входных данных ---
+    errors = validate_input_frame(df)
+    failed = errors.notna().to_numpy()
+
+    valid_df = _numeric_input_frame(df).loc[~failed]
+
+    results = pd.DataFrame(
+        {
+            "prediction": pd.Series(dtype="int64"),
+            "probability": pd.Series(dtype="float64"),
+            "interpretation": pd.Series(dtype=object)
+        },
+        index=valid_df.index
+    )
+
+    if len(valid_df):
+        model = get_model(model_name)
+
+        # --- только признаки, известные модели ---
+        features = calculate_financial_ratios(
+            _growth_frame(valid_df),
+            model_feature_names(model, valid_df)
+        )
+
+        # --- прогноз ---
+        prediction, probability = predict_rows(model, features.to_numpy())
+
+        results["prediction"] = prediction.astype("int64")
+
+        if probability is not None:
+            results["probability"] = probability
+
+        results["interpretation"] = (
+            interpret_financial_state(features)["analysis"].to_numpy()
+        )
 
     return {
         "model": model_name,
-        "prediction": prediction,
-        "probability": probability,
-        "features": features.round(3),
-        "interpretation": interpretation.iloc[0, 0]
+        "results": results,
+        "errors": errors[failed].to_frame("error")
     }
 
 # ============================================================
@@ -0,0 +1,420 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Облегченная среда применения обученных моделей без sklearn.
+
+Обученная модель экспортируется в файл <модель>.runtime.npz
+с непрерывными массивами NumPy. Для Random Forest все деревья
+«сплющиваются» в общие массивы узлов (признак, порог, потомки,
+вероятности листа), а прогноз выполняется одновременным спуском
+по всем деревьям для всего пакета записей. Вероятности совпадают
+с predict_proba исходной модели.
+
+Для логистической регрессии сохраняются коэффициенты, свободный
+член и порядок признаков; прогноз — скалярное произведение
+и сигмоида (softmax для нескольких классов).
+
+Объекты среды повторяют интерфейс классификатора sklearn,
+необходимый ml.predict (classes_, feature_names_in_,
+predict_proba, predict), и загружаются без импорта sklearn.
+
+В файл записывается отпечаток исходного файла .pkl
+(размер, mtime, SHA-256): по нему ml.predict проверяет,
+что экспорт соответствует текущей модели.
+"""
+
+import os
+
+import numpy as np
+
+from utils.data_loader import file_fingerprint
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+RUNTIME_FORMAT_VERSION = 1
+
+# суффикс файла экспортированной модели: model1.pkl -> model1.runtime.npz
+RUNTIME_SUFFIX = ".runtime.npz"
+
+# число пар (дерево, запись), обрабатываемых за один шаг спуска:
+# промежуточные массивы блока остаются в кэше процессора
+FOREST_BLOCK_NODES = 1 << 16
+
+
+def runtime_path(model_path: str) -> str:
+    """
+    Путь к экспортированной модели рядом с файлом .pkl.
+    """
+    return os.path.splitext(model_path)[0] + RUNTIME_SUFFIX
+
+
+def _as_2d(X) -> np.ndarray:
+    """
+    Приведение входа (DataFrame или массив) к двумерному массиву.
+    """
+
+    X = np.asarray(X)
+
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+
+    return X
+
+
+# ============================================================
+# RANDOM FOREST
+# ============================================================
+
+class ForestRuntime:
+    """
+    Random Forest в виде плоских массивов узлов.
+
+    Листья замкнуты сами на себя, поэтому после depth шагов
+    спуска каждая пара (дерево, запись) находится в своем листе
+    независимо от глубины конкретной ветви.
+    """
+
+    kind = "forest"
+
+    def __init__(self, arrays: dict):
+        self.feature = arrays["feature"].astype(np.intp)
+        self.threshold = arrays["threshold"]
+        self.children = arrays["children"].astype(np.intp).ravel()
+        self.missing_left = arrays["missing_left"]
+        self.value = np.ascontiguousarray(arrays["value"].T)
+        self.roots = arrays["roots"].astype(np.intp)
+        self.depth = int(arrays["depth"])
+        self.classes_ = arrays["classes"]
+        self.n_features_in_ = int(arrays["n_features"])
+
+        if len(arrays["feature_names"]):
+            self.feature_names_in_ = arrays["feature_names"].astype(object)
+
+    @staticmethod
+    def export(model) -> dict:
+        """
+        Преобразование обученного RandomForestClassifier в массивы.
+        """
+
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Поддерживаются только модели с одним выходом.")
+
+        feature, threshold, left, right = [], [], [], []
+        missing_left, value, roots = [], [], []
+        depth = 0
+        offset = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left < 0
+
+            # лист ссылается сам на себя
+            left.append(np.where(leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(leaf, nodes, tree.children_right) + offset)
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            missing_left.append(
+                np.asarray(
+                    getattr(tree, "missing_go_to_left",
+                            np.zeros(tree.node_count)),
+                    dtype=bool
+                )
+            )
+
+            # вероятности листа вычисляются так же, как в
+            # DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer[:, None])
+
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += tree.node_count
+
+        return {
+            "kind": np.array(ForestRuntime.kind),
+            "feature": np.concatenate(feature).astype(np.int32),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "children": np.column_stack([
+                np.concatenate(left), np.concatenate(right)
+            ]).astype(np.int32),
+            "missing_left": np.concatenate(missing_left),
+            "value": np.concatenate(value),
+            "roots": np.array(roots, dtype=np.int32),
+            "depth": np.array(depth),
+            "classes": np.asarray(model.classes_),
+            "n_features": np.array(model.n_features_in_),
+            "feature_names": np.asarray(
+                getattr(model, "feature_names_in_", []), dtype=str
+            )
+        }
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Вероятности классов (как RandomForestClassifier.predict_proba).
+        """
+
+        # деревья sklearn сравнивают признаки в точности float32
+        X = _as_2d(X).astype(np.float32).astype(np.float64)
+
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Ожидается признаков: {self.n_features_in_}, "
+                f"получено: {X.shape[1]}"
+            )
+
+        proba = np.empty((len(X), len(self.classes_)))
+        block = max(1, FOREST_BLOCK_NODES // len(self.roots))
+
+        for start in range(0, len(X), block):
+            rows = slice(start, start + block)
+            proba[rows] = self._evaluate(X[rows])
+
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+    def _evaluate(self, X: np.ndarray) -> np.ndarray:
+        """
+        Одновременный спуск по всем деревьям для блока записей.
+        """
+
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+
+        # смещение записи в плоском массиве признаков
+        row_offset = np.arange(n_rows) * n_features
+
+        # текущий узел каждой пары (дерево, запись)
+        node = np.repeat(self.roots[:, None], n_rows, axis=1)
+        has_missing = np.isnan(flat).any()
+
+        for _ in range(self.depth):
+            x = flat.take(row_offset + self.feature.take(node))
+            go_left = x <= self.threshold.take(node)
+
+            if has_missing:
+                go_left |= np.isnan(x) & self.missing_left.take(node)
+
+            # children хранит пары (левый, правый) подряд
+            node = self.children.take(2 * node + ~go_left)
+
+        # сумма по оси деревьев выполняется последовательно в их
+        # исходном порядке (как в sklearn), затем усреднение
+        proba = np.empty((n_rows, len(self.classes_)))
+
+        for k, class_value in enumerate(self.value):
+            proba[:, k] = class_value.take(node).sum(axis=0)
+
+        return proba / len(self.roots)
+
+
+# ============================================================
+# ЛОГИСТИЧЕСКАЯ РЕГРЕССИЯ
+# ============================================================
+
+class LinearRuntime:
+    """
+    Логистическая регрессия в виде коэффициентов и свободного члена.
+    """
+
+    kind = "linear"
+
+    def __init__(self, arrays: dict):
+        self.coef_ = arrays["coef"]
+        self.intercept_ = arrays["intercept"]
+        self.classes_ = arrays["classes"]
+        self.n_features_in_ = int(arrays["n_features"])
+
+        if len(arrays["feature_names"]):
+            self.feature_names_in_ = arrays["feature_names"].astype(object)
+
+    @staticmethod
+    def export(model) -> dict:
+        """
+        Преобразование обученной LogisticRegression в массивы.
+        """
+
+        return {
+            "kind": np.array(LinearRuntime.kind),
+            "coef": np.asarray(model.coef_, dtype=np.float64),
+            "intercept": np.asarray(model.intercept_, dtype=np.float64),
+            "classes": np.asarray(model.classes_),
+            "n_features": np.array(model.n_features_in_),
+            "feature_names": np.asarray(
+                getattr(model, "feature_names_in_", []), dtype=str
+            )
+        }
+
+    def decision_function(self, X) -> np.ndarray:
+        X = _as_2d(X).astype(np.float64)
+
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Ожидается признаков: {self.n_features_in_}, "
+                f"получено: {X.shape[1]}"
+            )
+
+        scores = X @ self.coef_.T + self.intercept_
+
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Вероятности классов (как LogisticRegression.predict_proba;
+        отличие не более единицы последнего разряда из-за
+        реализации exp в NumPy и SciPy).
+        """
+
+        scores = self.decision_function(X)
+
+        if scores.ndim == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores))
+            return np.column_stack([1.0 - positive, positive])
+
+        # softmax по классам
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, X) -> np.ndarray:
+        scores = self.decision_function(X)
+
+        if scores.ndim == 1:
+            return self.classes_.take((scores > 0).astype(np.intp))
+
+        return self.classes_.take(scores.argmax(axis=1))
+
+
+# ============================================================
+# ЭКСПОРТ И ЗАГРУЗКА
+# ============================================================
+
+RUNTIME_KINDS = {
+    ForestRuntime.kind: ForestRuntime,
+    LinearRuntime.kind: LinearRuntime
+}
+
+
+def _runtime_kind(model) -> str:
+    """
+    Тип среды применения для обученной модели sklearn.
+    """
+
+    if hasattr(model, "estimators_") and hasattr(model, "n_classes_"):
+        return ForestRuntime.kind
+
+    if hasattr(model, "coef_") and hasattr(model, "predict_proba"):
+        return LinearRuntime.kind
+
+    raise TypeError(
+        f"Экспорт модели {type(model).__name__} не поддерживается."
+    )
+
+
+def export_runtime(model, path: str, source_path: str = None) -> str:
+    """
+    Экспорт обученной модели в файл среды применения.
+
+    Файл записывается во временный и затем переименовывается,
+    поэтому читатели не увидят частично записанный файл.
+
+    :param path: путь к файлу .runtime.npz или к файлу модели .pkl
+                 (тогда файл создается рядом с ним)
+    :param source_path: сохраненный файл модели .pkl, отпечаток
+                        которого записывается в экспорт
+                        (по умолчанию — path, если это файл .pkl)
+    :return: путь к созданному файлу
+    """
+
+    if not path.endswith(RUNTIME_SUFFIX):
+        if source_path is None:
+            source_path = path
+        path = runtime_path(path)
+
+    arrays = RUNTIME_KINDS[_runtime_kind(model)].export(model)
+    arrays["version"] = np.array(RUNTIME_FORMAT_VERSION)
+
+    if source_path is not None:
+        source = file_fingerprint(source_path)
+        arrays["source_size"] = np.array(source["size"], dtype=np.int64)
+        arrays["source_mtime_ns"] = np.array(
+            source["mtime_ns"], dtype=np.int64
+        )
+        arrays["source_sha256"] = np.array(source["sha256"])
+
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def runtime_source(path: str):
+    """
+    Отпечаток файла .pkl, из которого получен экспорт
+    (см. utils.data_loader.file_fingerprint), или None,
+    если он не записан.
+    """
+
+    with np.load(path, allow_pickle=False) as data:
+        if "source_sha256" not in data.files:
+            return None
+
+        return {
+            "size": int(data["source_size"]),
+            "mtime_ns": int(data["source_mtime_ns"]),
+            "sha256": str(data["source_sha256"])
+        }
+
+
+def load_runtime(path: str):
+    """
+    Загрузка экспортированной модели (без sklearn и pickle).
+    """
+
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    if int(arrays.get("version", -1)) != RUNTIME_FORMAT_VERSION:
+        raise ValueError(
+            f"Неподдерживаемая версия файла модели: {path}"
+        )
+
+    kind = str(arrays["kind"])
+
+    if kind not in RUNTIME_KINDS:
+        raise ValueError(f"Неизвестный тип модели в файле {path}: {kind}")
+
+    return RUNTIME_KINDS[kind](arrays)
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    import joblib
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ml.runtime",
+        description="Экспорт обученных моделей в среду применения без sklearn"
+    )
+    parser.add_argument("model_paths", nargs="+", help="файлы моделей .pkl")
+
+    args = parser.parse_args()
+
+    for model_path in args.model_paths:
+        print(f"{model_path} -> {export_runtime(joblib.load(model_path), model_path)}")
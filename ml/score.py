@@ -0,0 +1,405 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Пакетная оценка финансовой устойчивости из командной строки
+(без графического интерфейса).
+
+Входной файл (CSV, Parquet или JSONL) читается порциями, порции
+распределяются между рабочими процессами, каждый из которых
+загружает модель один раз при запуске. Результаты записываются
+в выходной файл по мере готовности в исходном порядке строк,
+с выводом прогресса и пропускной способности.
+
+Пример запуска:
+    python -m ml.score data/balances.csv results.csv \
+        --model "Random Forest" --workers 8
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from ml.predict import MODELS, preload, predict_stability_batch
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+# размер порции, передаваемой рабочему процессу (строк)
+SCORE_CHUNK_ROWS = 50_000
+
+# число порций в работе на один процесс: ограничивает объем
+# прочитанных, но еще не оцененных данных в памяти
+PENDING_CHUNKS_PER_WORKER = 2
+
+# поддерживаемые форматы по расширению файла
+FILE_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl"
+}
+
+OUTPUT_COLUMNS = [
+    "row",
+    "prediction",
+    "probability",
+    "interpretation",
+    "error"
+]
+
+
+# ============================================================
+# ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
+# ============================================================
+
+def detect_format(path: str, file_format: str = None) -> str:
+    """
+    Определение формата файла по явному указанию или расширению.
+    """
+
+    if file_format is not None:
+        if file_format not in set(FILE_FORMATS.values()):
+            raise ValueError(f"Неподдерживаемый формат: {file_format}")
+        return file_format
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension not in FILE_FORMATS:
+        raise ValueError(
+            f"Не удалось определить формат файла {path}; "
+            f"поддерживаются расширения {sorted(FILE_FORMATS)}"
+        )
+
+    return FILE_FORMATS[extension]
+
+
+def _require_pyarrow():
+    """
+    Импорт pyarrow (необязательная зависимость, нужна для Parquet).
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "Для работы с Parquet требуется пакет pyarrow "
+            "(pip install pyarrow)."
+        ) from error
+
+    return pyarrow
+
+
+def read_chunks(path: str, chunksize: int = SCORE_CHUNK_ROWS,
+                file_format: str = None):
+    """
+    Порционное чтение входного файла.
+
+    Индекс каждой порции — сквозной номер строки во входном файле.
+
+    :return: генератор DataFrame
+    """
+
+    file_format = detect_format(path, file_format)
+
+    if file_format == "csv":
+        reader = pd.read_csv(path, chunksize=chunksize)
+    elif file_format == "jsonl":
+        reader = pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        pyarrow = _require_pyarrow()
+        reader = (
+            batch.to_pandas() for batch in
+            pyarrow.parquet.ParquetFile(path).iter_batches(
+                batch_size=chunksize
+            )
+        )
+
+    offset = 0
+
+    with reader if hasattr(reader, "__enter__") else nullcontext():
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+
+# ============================================================
+# ЗАПИСЬ РЕЗУЛЬТАТОВ
+# ============================================================
+
+class ResultWriter:
+    """
+    Последовательная запись порций результата в CSV, JSONL
+    или Parquet без накопления всего результата в памяти.
+    """
+
+    def __init__(self, path: str, file_format: str = None):
+        self.path = path
+        self.file_format = detect_format(path, file_format)
+        self._file = None
+        self._parquet = None
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+
+        if self.file_format == "parquet":
+            _require_pyarrow()
+        else:
+            self._file = open(path, "w", encoding="utf-8", newline="")
+            self._header = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.file_format == "csv":
+            df.to_csv(self._file, header=self._header, index=False)
+            self._header = False
+
+        elif self.file_format == "jsonl":
+            if len(df):
+                df.to_json(
+                    self._file, orient="records", lines=True,
+                    force_ascii=False
+                )
+                # to_json не завершает последнюю запись переводом строки
+                self._file.write("\n")
+
+        else:
+            pyarrow = _require_pyarrow()
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pyarrow.parquet.ParquetWriter(
+                    self.path, table.schema
+                )
+            self._parquet.write_table(table)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# ============================================================
+# РАБОЧИЙ ПРОЦЕСС
+# ============================================================
+
+# имя модели текущего рабочего процесса
+_worker_model_name = None
+
+
+def _init_worker(model_name: str) -> None:
+    """
+    Инициализация рабочего процесса: модель загружается один раз
+    и далее берется из реестра ml.predict.
+    """
+
+    global _worker_model_name
+
+    _worker_model_name = model_name
+    preload([model_name])
+
+
+def score_chunk(chunk: pd.DataFrame, model_name: str = None) -> pd.DataFrame:
+    """
+    Оценка одной порции записей.
+
+    Признаки рассчитываются в пределах порции: для моделей,
+    использующих только коэффициенты (текущие модели MODELS),
+    результат не зависит от разбиения файла на порции.
+
+    :return: DataFrame с колонками OUTPUT_COLUMNS, по строке
+             на каждую входную запись (отклоненные записи —
+             с заполненной колонкой error)
+    """
+
+    result = predict_stability_batch(
+        chunk, model_name if model_name is not None else _worker_model_name
+    )
+
+    scored = result["results"].join(result["errors"], how="outer")
+    scored = scored.reindex(chunk.index)
+    scored.insert(0, "row", chunk.index.to_numpy())
+
+    # отклоненные строки не имеют прогноза
+    scored["prediction"] = scored["prediction"].astype("Int64")
+
+    return scored[OUTPUT_COLUMNS]
+
+
+# ============================================================
+# ПАКЕТНАЯ ОЦЕНКА ФАЙЛА
+# ============================================================
+
+def _report_progress(stats: dict, stream=sys.stderr) -> None:
+    elapsed = max(time.perf_counter() - stats["started"], 1e-9)
+
+    stream.write(
+        f"\rОбработано: {stats['rows']:,} строк "
+        f"(отклонено {stats['errors']:,}), "
+        f"{stats['rows'] / elapsed:,.0f} строк/с, "
+        f"{elapsed:,.1f} с"
+    )
+    stream.flush()
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    model_name: str,
+    workers: int = None,
+    chunksize: int = SCORE_CHUNK_ROWS,
+    input_format: str = None,
+    output_format: str = None,
+    progress=_report_progress
+) -> dict:
+    """
+    Пакетная оценка файла пулом рабочих процессов.
+
+    Порции читаются по мере освобождения процессов (в работе
+    не более PENDING_CHUNKS_PER_WORKER порций на процесс),
+    результаты записываются в порядке входного файла.
+
+    :param workers: число процессов (по умолчанию — число ядер;
+                    1 — оценка в текущем процессе без пула)
+    :param progress: функция progress(stats), вызываемая после
+                     записи каждой порции, или None
+    :return: статистика: rows, errors, chunks, seconds, rows_per_second
+    """
+
+    if model_name not in MODELS:
+        raise ValueError("Неизвестная модель.")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = read_chunks(input_path, chunksize, input_format)
+
+    stats = {
+        "rows": 0,
+        "errors": 0,
+        "chunks": 0,
+        "started": time.perf_counter()
+    }
+
+    def consume(scored):
+        writer.write(scored)
+        stats["rows"] += len(scored)
+        stats["errors"] += int(scored["error"].notna().sum())
+        stats["chunks"] += 1
+        if progress is not None:
+            progress(stats)
+
+    with ResultWriter(output_path, output_format) as writer:
+        if workers == 1:
+            _init_worker(model_name)
+            for chunk in chunks:
+                consume(score_chunk(chunk))
+
+        else:
+            with multiprocessing.Pool(
+                workers, initializer=_init_worker, initargs=(model_name,)
+            ) as pool:
+                pending = deque()
+
+                for chunk in chunks:
+                    pending.append(pool.apply_async(score_chunk, (chunk,)))
+
+                    if len(pending) >= workers * PENDING_CHUNKS_PER_WORKER:
+                        consume(pending.popleft().get())
+
+                while pending:
+                    consume(pending.popleft().get())
+
+    seconds = time.perf_counter() - stats.pop("started")
+
+    # перевод строки после строки прогресса _report_progress
+    if progress is _report_progress:
+        sys.stderr.write("\n")
+
+    stats["seconds"] = seconds
+    stats["rows_per_second"] = stats["rows"] / seconds if seconds else np.nan
+
+    return stats
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ml.score",
+        description="Пакетная оценка финансовой устойчивости"
+    )
+    parser.add_argument("input_path", help="входной файл (CSV, Parquet, JSONL)")
+    parser.add_argument("output_path", help="файл результатов (CSV, Parquet, JSONL)")
+    parser.add_argument(
+        "--model", default=next(iter(MODELS)), choices=list(MODELS),
+        help="модель из ml.predict.MODELS"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="число рабочих процессов (по умолчанию — число ядер)"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=SCORE_CHUNK_ROWS,
+        help="размер порции (строк)"
+    )
+    parser.add_argument(
+        "--input-format", choices=sorted(set(FILE_FORMATS.values())),
+        help="формат входного файла (по умолчанию — по расширению)"
+    )
+    parser.add_argument(
+        "--output-format", choices=sorted(set(FILE_FORMATS.values())),
+        help="формат файла результатов (по умолчанию — по расширению)"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="не выводить прогресс"
+    )
+
+    args = parser.parse_args(argv)
+
+    stats = score_file(
+        args.input_path,
+        args.output_path,
+        args.model,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        progress=None if args.quiet else _report_progress
+    )
+
+    print(
+        f"Модель: {args.model}\n"
+        f"Строк: {stats['rows']} (отклонено: {stats['errors']})\n"
+        f"Время: {stats['seconds']:.2f} с "
+        f"({stats['rows_per_second']:,.0f} строк/с)\n"
+        f"Результаты: {os.path.abspath(args.output_path)}"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,500 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Локальный HTTP-сервис оценки финансовой устойчивости
+для обращения из других внутренних систем.
+
+Модели загружаются при запуске сервиса. Одновременно поступившие
+запросы накапливаются в очереди модели и оцениваются одним
+векторизованным вызовом predict_stability_batch, как только
+набралось BATCH_MAX_SIZE записей или прошло BATCH_MAX_DELAY_MS
+миллисекунд с момента поступления первой записи пакета.
+
+Сервис реализован на asyncio без внешних зависимостей.
+
+Эндпоинты:
+    GET  /health   — состояние сервиса и список моделей;
+    POST /predict  — {"model": "...", "data": {...} или [{...}, ...]}.
+
+Пример запуска:
+    python -m ml.service --port 8765
+"""
+
+import sys
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ml.predict import (
+    INPUT_COLUMNS,
+    MODELS,
+    preload,
+    predict_stability_batch
+)
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+
+# максимальный размер пакета (записей)
+BATCH_MAX_SIZE = 64
+
+# максимальное ожидание заполнения пакета (мс)
+BATCH_MAX_DELAY_MS = 5
+
+# максимальный размер тела запроса (байт)
+MAX_BODY_BYTES = 1 << 20
+
+HTTP_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+class HTTPError(Exception):
+    """
+    Ошибка обработки запроса с HTTP-кодом ответа.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================
+# ПАКЕТИРОВАНИЕ ЗАПРОСОВ
+# ============================================================
+
+class MicroBatcher:
+    """
+    Очередь записей одной модели с оценкой пакетами.
+
+    Оценка выполняется в отдельном потоке, чтобы цикл событий
+    продолжал принимать запросы во время вызова модели.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        executor: ThreadPoolExecutor,
+        max_size: int = BATCH_MAX_SIZE,
+        max_delay_ms: float = BATCH_MAX_DELAY_MS
+    ):
+        self.model_name = model_name
+        self.executor = executor
+        self.max_size = max_size
+        self.max_delay = max_delay_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.records = 0
+        self._task = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, record: dict) -> dict:
+        """
+        Постановка записи в очередь и ожидание ее результата.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """
+        Сбор пакета: первая запись ожидается без ограничения,
+        остальные — до заполнения пакета или истечения задержки.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_size:
+            # все уже поступившие записи забираются без ожидания
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(
+                    await asyncio.wait_for(self.queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            records = [record for record, _ in batch]
+
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, score_records, records, self.model_name
+                )
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            self.batches += 1
+            self.records += len(batch)
+
+            for (_, future), result in zip(batch, results):
+                # клиент мог разорвать соединение
+                if not future.done():
+                    future.set_result(result)
+
+
+def score_records(records: list, model_name: str) -> list:
+    """
+    Оценка списка записей одним вызовом predict_stability_batch.
+
+    Значения, которые не удалось привести к числу, считаются
+    незаполненными и отклоняются валидацией только для своей
+    записи, не затрагивая остальные записи пакета.
+
+    :return: список словарей результата в порядке записей
+    """
+
+    df = pd.DataFrame.from_records(
+        [record if isinstance(record, dict) else {} for record in records],
+        columns=INPUT_COLUMNS
+    ).apply(pd.to_numeric, errors="coerce")
+
+    result = predict_stability_batch(df, model_name)
+
+    output = [None] * len(records)
+
+    scored = result["results"]
+    for position, prediction, probability, interpretation in zip(
+        scored.index,
+        scored["prediction"].tolist(),
+        scored["probability"].tolist(),
+        scored["interpretation"].tolist()
+    ):
+        output[position] = {
+            "model": model_name,
+            "prediction": prediction,
+            "probability": (
+                None if np.isnan(probability) else round(probability, 6)
+            ),
+            "interpretation": interpretation
+        }
+
+    for position, message in result["errors"]["error"].items():
+        output[position] = {"model": model_name, "error": message}
+
+    return output
+
+
+# ============================================================
+# HTTP-СЕРВИС
+# ============================================================
+
+class ScoringService:
+    """
+    HTTP-сервис оценки с пакетированием запросов по моделям.
+    """
+
+    def __init__(
+        self,
+        host: str = SERVICE_HOST,
+        port: int = SERVICE_PORT,
+        model_names=None,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_delay_ms: float = BATCH_MAX_DELAY_MS
+    ):
+        self.host = host
+        self.port = port
+        self.model_names = list(model_names or MODELS)
+        self.max_batch_size = max_batch_size
+        self.max_delay_ms = max_delay_ms
+        self.batchers = {}
+        self._server = None
+        self._executor = None
+
+    async def start(self) -> None:
+        """
+        Загрузка моделей и запуск сервера.
+        """
+
+        unknown = [name for name in self.model_names if name not in MODELS]
+        if unknown:
+            raise ValueError(f"Неизвестные модели: {unknown}")
+
+        preload(self.model_names)
+
+        # один поток на модель: пакеты разных моделей
+        # оцениваются параллельно, одной модели — по очереди
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.model_names),
+            thread_name_prefix="scoring"
+        )
+
+        for model_name in self.model_names:
+            batcher = MicroBatcher(
+                model_name,
+                self._executor,
+                self.max_batch_size,
+                self.max_delay_ms
+            )
+            batcher.start()
+            self.batchers[model_name] = batcher
+
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+
+        # при port=0 порт выбирается системой
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        for batcher in self.batchers.values():
+            await batcher.stop()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    # ---------------------------------------------------------
+    # ОБРАБОТКА ЗАПРОСОВ
+    # ---------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer) -> None:
+        """
+        Обработка соединения (с поддержкой keep-alive).
+        """
+
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    await self._send(
+                        writer, error.status, {"error": str(error)}, False
+                    )
+                    break
+
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    status, payload = 200, await self._dispatch(
+                        method, path, body
+                    )
+                except HTTPError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except Exception as error:
+                    status, payload = 500, {"error": str(error)}
+
+                await self._send(writer, status, payload, keep_alive)
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        Чтение HTTP-запроса: (метод, путь, заголовки, тело)
+        или None при закрытии соединения клиентом.
+        """
+
+        line = await reader.readline()
+        if not line:
+            return None
+
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Некорректная строка запроса.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Некорректный заголовок Content-Length.")
+
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Слишком большой запрос.")
+
+        body = await reader.readexactly(length) if length else b""
+
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> dict:
+        if path == "/health":
+            return {
+                "status": "ok",
+                "models": self.model_names,
+                "batches": {
+                    name: {"batches": b.batches, "records": b.records}
+                    for name, b in self.batchers.items()
+                }
+            }
+
+        if path != "/predict":
+            raise HTTPError(404, "Неизвестный адрес.")
+
+        if method != "POST":
+            raise HTTPError(405, "Ожидается метод POST.")
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Тело запроса должно быть JSON.")
+
+        if not isinstance(request, dict) or "data" not in request:
+            raise HTTPError(400, "Ожидается объект с полями model и data.")
+
+        model_name = request.get("model", self.model_names[0])
+
+        if model_name not in self.batchers:
+            raise HTTPError(404, f"Неизвестная модель: {model_name}")
+
+        batcher = self.batchers[model_name]
+        data = request["data"]
+
+        if isinstance(data, list):
+            results = await asyncio.gather(
+                *(batcher.submit(record) for record in data)
+            )
+            return {"results": results}
+
+        return await batcher.submit(data)
+
+    @staticmethod
+    async def _send(writer, status: int, payload: dict,
+                    keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                "\r\n"
+            ).encode("latin-1") + body
+        )
+        await writer.drain()
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+async def _serve(args) -> None:
+    service = ScoringService(
+        args.host,
+        args.port,
+        args.model,
+        args.batch_size,
+        args.batch_delay_ms
+    )
+
+    await service.start()
+
+    print(
+        f"Сервис оценки запущен: http://{service.host}:{service.port} "
+        f"(модели: {', '.join(service.model_names)})"
+    )
+
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ml.service",
+        description="Локальный HTTP-сервис оценки финансовой устойчивости"
+    )
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument(
+        "--model", action="append", choices=list(MODELS),
+        help="загружаемая модель (можно указать несколько раз; "
+             "по умолчанию — все модели)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=BATCH_MAX_SIZE,
+        help="максимальный размер пакета (записей)"
+    )
+    parser.add_argument(
+        "--batch-delay-ms", type=float, default=BATCH_MAX_DELAY_MS,
+        help="максимальное ожидание заполнения пакета (мс)"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,10 +18,19 @@
 – обучение ML-модели;
 – оценка качества модели;
 – сохранение обученной модели на диск.
+
+Рядом с моделью сохраняется манифест обучения (<модель>.manifest.json):
+отпечаток данных, состав признаков, гиперпараметры, версии библиотек
+и метрики. Если данные и настройки обучения не изменились, повторное
+обучение не выполняется и возвращаются метрики из манифеста.
 """
 
 import os
+import json
+import time
+import platform
 import joblib
+import sklearn
 import pandas as pd
 import numpy as np
 
@@ -35,35 +44,64 @@ from sklearn.metrics import (
     confusion_matrix
 )
 
-from ml.features import calculate_financial_ratios
+from ml.features import FEATURE_VERSION
+from ml.feature_store import (
+    SCHEMA_FILE,
+    load_feature_store,
+    load_training_data
+)
+from ml.runtime import export_runtime
+from ml.tuning import CV_FOLDS, DEFAULT_PARAM_SPACE, tune_random_forest
+from utils.data_loader import file_fingerprint, fingerprint_matches
+
+
+# число деревьев, добавляемых за один шаг обучения
+# (после каждого шага сообщается прогресс)
+TREES_PER_STEP = 25
+
+# гиперпараметры Random Forest по умолчанию
+RANDOM_FOREST_PARAMS = {
+    "n_estimators": 300,
+    "max_depth": 6,
+    "min_samples_split": 5,
+    "min_samples_leaf": 3
+}
+
+# версия формата манифеста обучения
+MANIFEST_FORMAT_VERSION = 1
+
+# процент прогресса этапа сохранения модели: начиная с него
+# обработчик прогресса не должен прерывать обучение, иначе
+# отмена может совпасть с уже записанной новой моделью
+SAVING_PERCENT = 95
 
 
 # ============================================================
 # ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
 # ============================================================
 
-def load_dataset(path: str) -> pd.DataFrame:
+def _notify(progress, message: str, percent: int) -> None:
     """
-    Загрузка датасета финансовых показателей предприятия.
+    Передача события прогресса обучения (если задан обработчик).
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Файл данных не найден: {path}")
+    if progress is not None:
+        progress(message, percent)
 
-    df = pd.read_csv(path)
-    return df
 
-
-def split_features_target(df: pd.DataFrame):
+def split_train_test(X, y, test_size: float = 0.25, random_state: int = 42):
     """
-    Разделение датасета на признаки и целевую переменную.
+    Стратифицированное разделение на обучающую и тестовую выборки.
     """
-    if "label" not in df.columns:
-        raise ValueError("В датасете отсутствует целевая переменная label")
-
-    X_raw = df.drop(columns=["label"])
-    y = df["label"]
-
-    return X_raw, y
+    return train_test_split(
+        X,
+        y,
+        test_size=test_size,
+        random_state=random_state,
+        # копия меток: метки хранилища признаков открыты только
+        # для чтения (memory-map), а sklearn < 1.5 требует
+        # записываемый массив stratify
+        stratify=np.array(y)
+    )
 
 
 # ============================================================
@@ -74,30 +112,62 @@ def train_random_forest(
     X: pd.DataFrame,
     y: pd.Series,
     test_size: float = 0.25,
-    random_state: int = 42
+    random_state: int = 42,
+    progress=None,
+    params: dict = None,
+    progress_start: int = 30,
+    split=None
 ):
     """
     Обучение модели Random Forest для классификации
     финансовой устойчивости предприятия.
+
+    Деревья добавляются порциями по TREES_PER_STEP через warm_start:
+    случайные состояния деревьев при этом те же, что и при обучении
+    всего леса за один вызов fit, поэтому модель не меняется,
+    а после каждой порции сообщается прогресс.
+
+    :param progress: обработчик progress(message, percent) или None
+    :param params: гиперпараметры, дополняющие RANDOM_FOREST_PARAMS
+                   (например, найденные tune_random_forest)
+    :param progress_start: процент прогресса в начале обучения
+    :param split: готовое разбиение (train_index, test_index) —
+                  позиции строк (ml.feature_store.load_training_data);
+                  по умолчанию разбиение выполняется split_train_test
     """
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X,
-        y,
-        test_size=test_size,
-        random_state=random_state,
-        stratify=y
-    )
+    if split is None:
+        X_train, X_test, y_train, y_test = split_train_test(
+            X, y, test_size, random_state
+        )
+    else:
+        train_index, test_index = split
+        X_train, X_test = X.iloc[train_index], X.iloc[test_index]
+        y_train, y_test = y.iloc[train_index], y.iloc[test_index]
+
+    params = {**RANDOM_FOREST_PARAMS, **(params or {})}
+    n_estimators = params["n_estimators"]
 
     model = RandomForestClassifier(
-        n_estimators=300,
-        max_depth=6,
-        min_samples_split=5,
-        min_samples_leaf=3,
-        random_state=random_state
+        **params,
+        random_state=random_state,
+        warm_start=True
     )
 
-    model.fit(X_train, y_train)
+    for fitted in range(TREES_PER_STEP, n_estimators + TREES_PER_STEP,
+                        TREES_PER_STEP):
+        fitted = min(fitted, n_estimators)
+
+        model.set_params(n_estimators=fitted)
+        model.fit(X_train, y_train)
+
+        _notify(
+            progress,
+            f"Обучено деревьев: {fitted} из {n_estimators}",
+            progress_start + (90 - progress_start) * fitted // n_estimators
+        )
+
+    model.set_params(warm_start=False)
 
     y_pred = model.predict(X_test)
 
@@ -112,37 +182,300 @@ def train_random_forest(
     return model, metrics
 
 
+# ============================================================
+# МАНИФЕСТ ОБУЧЕНИЯ
+# ============================================================
+
+def manifest_path(model_path: str) -> str:
+    """
+    Путь к манифесту обучения модели.
+    """
+    return os.path.splitext(model_path)[0] + ".manifest.json"
+
+
+def library_versions() -> dict:
+    """
+    Версии Python и библиотек, с которыми обучена модель.
+    """
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+        "joblib": joblib.__version__
+    }
+
+
+def _training_config(tune: bool, param_space, n_iter, cv_folds) -> dict:
+    """
+    Настройки, от которых зависит обученная модель
+    (число процессов подбора на результат не влияет).
+    """
+
+    config = {
+        "model": "RandomForestClassifier",
+        "params": RANDOM_FOREST_PARAMS,
+        "test_size": 0.25,
+        "random_state": 42,
+        "tuning": None
+    }
+
+    if tune:
+        config["tuning"] = {
+            "param_space": (
+                DEFAULT_PARAM_SPACE if param_space is None else param_space
+            ),
+            "n_iter": n_iter,
+            "cv_folds": cv_folds
+        }
+
+    # приведение к виду, в котором настройки хранятся в JSON
+    return json.loads(json.dumps(config, default=str))
+
+
+def _data_source(data_path: str, feature_store: str = None) -> str:
+    """
+    Файл, отпечаток которого фиксирует обучающие данные:
+    исходный CSV или схема хранилища признаков.
+    """
+    if feature_store is not None:
+        return os.path.join(feature_store, SCHEMA_FILE)
+    return data_path
+
+
+def read_manifest(model_path: str):
+    """
+    Чтение манифеста обучения (None, если манифест отсутствует
+    или поврежден).
+    """
+
+    try:
+        with open(manifest_path(model_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("version") != MANIFEST_FORMAT_VERSION:
+        return None
+
+    return manifest
+
+
+def manifest_is_current(manifest: dict, model_path: str,
+                        data_source: str, config: dict) -> bool:
+    """
+    Модель актуальна, если не изменились файл модели, данные,
+    версия расчета признаков, настройки обучения и версии библиотек.
+    """
+
+    try:
+        return (
+            manifest["config"] == config
+            and manifest["features"]["version"] == FEATURE_VERSION
+            and manifest["libraries"] == library_versions()
+            and fingerprint_matches(manifest["model"], model_path)
+            and fingerprint_matches(manifest["data"]["fingerprint"],
+                                    data_source)
+        )
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+def write_manifest(model_path: str, data_source: str,
+                   data_fingerprint: dict, config: dict,
+                   feature_names, params: dict, metrics: dict,
+                   seconds: float) -> str:
+    """
+    Сохранение манифеста обучения рядом с моделью
+    (после сохранения самой модели).
+
+    :param data_fingerprint: отпечаток данных, снятый до их чтения:
+                             если файл изменился во время обучения,
+                             отпечаток не совпадет с ним и следующий
+                             запуск обучит модель заново
+    """
+
+    manifest = {
+        "version": MANIFEST_FORMAT_VERSION,
+        "model": file_fingerprint(model_path),
+        "data": {
+            "path": data_source,
+            "fingerprint": data_fingerprint
+        },
+        "features": {
+            "version": FEATURE_VERSION,
+            "names": list(feature_names)
+        },
+        "config": config,
+        "hyperparameters": params,
+        "libraries": library_versions(),
+        "metrics": {
+            name: (value.tolist() if isinstance(value, np.ndarray)
+                   else float(value))
+            for name, value in metrics.items()
+        },
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seconds": seconds
+    }
+
+    path = manifest_path(model_path)
+
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+    os.replace(path + ".tmp", path)
+
+    return path
+
+
+def _manifest_metrics(manifest: dict) -> dict:
+    """
+    Метрики из манифеста в том же виде, что и после обучения.
+    """
+
+    metrics = dict(manifest["metrics"])
+    metrics["confusion_matrix"] = np.array(metrics["confusion_matrix"])
+
+    return metrics
+
+
 # ============================================================
 # ОСНОВНАЯ ФУНКЦИЯ ОБУЧЕНИЯ
 # ============================================================
 
 def train_model(
     data_path: str = "data/financial_data.csv",
-    model_path: str = "models/financial_stability_model.pkl"
+    model_path: str = "models/financial_stability_model.pkl",
+    feature_store: str = None,
+    progress=None,
+    tune: bool = False,
+    param_space: dict = None,
+    n_iter: int = None,
+    cv_folds: int = CV_FOLDS,
+    n_workers: int = None,
+    force: bool = False
 ):
     """
     Полный цикл обучения модели машинного обучения.
+
+    :param feature_store: каталог хранилища признаков
+                          (ml.feature_store); если задан, признаки
+                          читаются из него без загрузки исходных данных
+                          (иначе признаки, метки и разбиение берутся
+                          из общего кэша обучающих данных)
+    :param progress: обработчик событий progress(message, percent),
+                     вызываемый после каждого этапа обучения; исключение
+                     из обработчика прерывает обучение, но только
+                     до этапа сохранения (percent < SAVING_PERCENT)
+    :param tune: режим подбора гиперпараметров: перед обучением
+                 кандидаты из param_space (полная сетка или n_iter
+                 случайных) оцениваются кросс-валидацией на обучающей
+                 выборке в n_workers процессах (ml.tuning), модель
+                 обучается с лучшими параметрами, а результаты
+                 подбора сохраняются в <модель>.tuning.json
+    :param force: обучить модель, даже если манифест обучения
+                  совпадает с текущими данными и настройками
+    :return: метрики качества; если обучение пропущено — метрики
+             из манифеста с признаком cached=True
     """
 
     print("=== ЗАПУСК ОБУЧЕНИЯ МОДЕЛИ ===")
 
-    # Загрузка данных
-    df = load_dataset(data_path)
-    print(f"Загружено строк: {len(df)}")
-    print(f"Колонки: {list(df.columns)}")
+    started = time.perf_counter()
+
+    config = _training_config(tune, param_space, n_iter, cv_folds)
+    data_source = _data_source(data_path, feature_store)
+
+    if not force:
+        manifest = read_manifest(model_path)
+
+        if manifest is not None and manifest_is_current(
+            manifest, model_path, data_source, config
+        ):
+            print(
+                "Данные и настройки обучения не изменились, "
+                f"используется модель {model_path} "
+                f"(обучена {manifest['trained_at']})"
+            )
+            _notify(progress, "Модель актуальна, обучение не требуется", 100)
 
-    # Разделение признаков и целевой переменной
-    X_raw, y = split_features_target(df)
+            return {**_manifest_metrics(manifest), "cached": True}
 
-    # Формирование признаков
-    print("Расчет финансовых коэффициентов...")
-    X_features = calculate_financial_ratios(X_raw)
+    _notify(progress, "Загрузка данных...", 0)
+
+    split = None
+
+    if feature_store is not None:
+        # отпечаток схемы — до открытия хранилища
+        data_fingerprint = file_fingerprint(data_source)
+
+        # Признаки и метки открываются через memory-map
+        X_features, y = load_feature_store(feature_store)
+        print(f"Хранилище признаков: {feature_store}")
+        print(f"Загружено строк: {len(X_features)}")
+
+    else:
+        # Признаки, метки и разбиение на выборки — из кэша,
+        # общего для сценариев обучения (пересчет при изменении
+        # файла данных или версии расчета признаков)
+        training_data = load_training_data(data_path)
+        X_features = training_data["X"]
+        y = training_data["y"]
+        split = (training_data["train_index"], training_data["test_index"])
+        data_fingerprint = training_data["fingerprint"]
+        print(f"Загружено строк: {len(X_features)}")
 
     print(f"Сформировано признаков: {X_features.shape[1]}")
+    _notify(
+        progress,
+        f"Данные загружены: {len(X_features)} строк, "
+        f"{X_features.shape[1]} признаков",
+        30
+    )
+
+    params = None
+    tuning = None
+
+    if tune:
+        print("Подбор гиперпараметров...")
+
+        # подбор только на обучающей выборке: тестовая выборка
+        # остается независимой для итоговой оценки
+        if split is None:
+            X_train, _, y_train, _ = split_train_test(X_features, y)
+        else:
+            X_train = X_features.iloc[split[0]]
+            y_train = y.iloc[split[0]]
+
+        def tuning_progress(message, percent):
+            print(message)
+            _notify(progress, message, 30 + 30 * percent // 100)
+
+        tuning = tune_random_forest(
+            X_train,
+            y_train,
+            param_space=param_space,
+            n_iter=n_iter,
+            cv_folds=cv_folds,
+            n_workers=n_workers,
+            progress=tuning_progress
+        )
+        del X_train, y_train
+
+        params = tuning["best_params"]
+        print(
+            f"Лучшие параметры: {params} "
+            f"(подбор: {tuning['seconds']:.1f} с)"
+        )
 
     # Обучение модели
     print("Обучение модели Random Forest...")
-    model, metrics = train_random_forest(X_features, y)
+    model, metrics = train_random_forest(
+        X_features, y,
+        progress=progress,
+        params=params,
+        progress_start=60 if tune else 30,
+        split=split
+    )
 
     # Вывод метрик
     print("\n=== РЕЗУЛЬТАТЫ ОБУЧЕНИЯ ===")
@@ -154,12 +487,39 @@ def train_model(
     print("\nМатрица ошибок:")
     print(metrics["confusion_matrix"])
 
-    # Сохранение модели
+    # Сохранение модели (через временный файл: прерванное
+    # обучение не оставляет поврежденный файл модели)
+    _notify(progress, "Сохранение модели...", SAVING_PERCENT)
+
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    joblib.dump(model, model_path)
+    joblib.dump(model, model_path + ".tmp")
+    os.replace(model_path + ".tmp", model_path)
+
+    # экспорт для быстрого применения без sklearn (ml.runtime)
+    runtime_file = export_runtime(model, model_path)
+
+    if tuning is not None:
+        tuning_path = os.path.splitext(model_path)[0] + ".tuning.json"
+        with open(tuning_path, "w", encoding="utf-8") as f:
+            json.dump(tuning, f, ensure_ascii=False, indent=4)
+        print(f"Результаты подбора: {tuning_path}")
+
+    manifest_file = write_manifest(
+        model_path,
+        data_source,
+        data_fingerprint,
+        config,
+        X_features.columns,
+        {**RANDOM_FOREST_PARAMS, **(params or {})},
+        metrics,
+        time.perf_counter() - started
+    )
 
     print(f"\nМодель сохранена: {model_path}")
+    print(f"Экспорт для применения: {runtime_file}")
+    print(f"Манифест обучения: {manifest_file}")
     print("=== ОБУЧЕНИЕ ЗАВЕРШЕНО ===")
+    _notify(progress, "Обучение завершено", 100)
 
     return metrics
 
@@ -174,8 +534,45 @@ if __name__ == "__main__":
     Используется для тестирования и демонстрации работы модуля.
     """
 
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Обучение модели Random Forest"
+    )
+    parser.add_argument("--data", default="data/financial_data.csv")
+    parser.add_argument(
+        "--model", default="models/financial_stability_model.pkl"
+    )
+    parser.add_argument(
+        "--tune", action="store_true",
+        help="подбор гиперпараметров перед обучением"
+    )
+    parser.add_argument(
+        "--n-iter", type=int, default=None,
+        help="число случайных кандидатов (по умолчанию — полная сетка)"
+    )
+    parser.add_argument("--cv-folds", type=int, default=CV_FOLDS)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="число процессов подбора (по умолчанию — число ядер)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="обучить заново, даже если данные и настройки не изменились"
+    )
+
+    args = parser.parse_args()
+
     try:
-        train_model()
+        train_model(
+            args.data,
+            args.model,
+            tune=args.tune,
+            n_iter=args.n_iter,
+            cv_folds=args.cv_folds,
+            n_workers=args.workers,
+            force=args.force
+        )
     except Exception as e:
         print("Ошибка при обучении модели:")
         print(str(e))
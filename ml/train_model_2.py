@@ -6,13 +6,17 @@
 Обучение второй модели (Logistic Regression)
 и корректное сравнение с Random Forest
 с учетом реального набора признаков model1.
+
+Сравнение по качеству и скорости выполняется повторной
+кросс-валидацией (ml.compare) на обучающей выборке, итоговая
+оценка — на тестовой выборке общего кэша обучающих данных.
+Модуль не выполняет действий при импорте.
 """
 
 import os
 import joblib
 import pandas as pd
 
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import (
     accuracy_score,
@@ -21,7 +25,14 @@ from sklearn.metrics import (
     f1_score
 )
 
-from ml.features import calculate_financial_ratios
+from ml.compare import (
+    COMPARISON_FOLDS,
+    COMPARISON_REPEATS,
+    compare_models,
+    default_candidates
+)
+from ml.feature_store import load_training_data
+from ml.runtime import export_runtime
 
 
 # ============================================================
@@ -46,96 +57,173 @@ MODEL2_PATH = os.path.join(
 
 
 # ============================================================
-# ЗАГРУЗКА ДАННЫХ
+# ДАННЫЕ С ПРИЗНАКАМИ MODEL1
 # ============================================================
 
-df = pd.read_csv(DATA_PATH)
-y = df["label"]
+def load_comparison_data(data_path: str = DATA_PATH,
+                         model1_path: str = MODEL1_PATH) -> dict:
+    """
+    Обучающая и тестовая выборки с признаками, которые знает model1
+    (признаки, метки и разбиение — из общего кэша обучающих данных,
+    то же разбиение, что и при обучении ml.train).
 
-# считаем ВСЕ признаки (расширенный набор)
-X_all = calculate_financial_ratios(df)
+    :return: словарь: model1, X_train, X_test, y_train, y_test
+    """
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X_all,
-    y,
-    test_size=0.25,
-    random_state=42,
-    stratify=y
-)
+    training_data = load_training_data(data_path)
+    train_index = training_data["train_index"]
+    test_index = training_data["test_index"]
 
+    model1 = joblib.load(model1_path)
 
-# ============================================================
-# ЗАГРУЗКА ПЕРВОЙ МОДЕЛИ И ВЫРАВНИВАНИЕ ПРИЗНАКОВ
-# ============================================================
+    # КЛЮЧЕВОЕ МЕСТО: только признаки, которые знает model1
+    expected_features = list(model1.feature_names_in_)
+    X_all = training_data["X"][expected_features]
+    y = training_data["y"]
 
-model1 = joblib.load(MODEL1_PATH)
+    return {
+        "model1": model1,
+        "X_train": X_all.iloc[train_index],
+        "X_test": X_all.iloc[test_index],
+        "y_train": y.iloc[train_index],
+        "y_test": y.iloc[test_index]
+    }
 
-# КЛЮЧЕВОЕ МЕСТО
-expected_features = list(model1.feature_names_in_)
 
-# оставляем ТОЛЬКО те признаки, которые знает model1
-X_test_m1 = X_test[expected_features]
+def holdout_metrics(model, X_test, y_test) -> dict:
+    """
+    Метрики модели на тестовой выборке.
+    """
 
+    y_pred = model.predict(X_test)
 
-# ============================================================
-# ОЦЕНКА ПЕРВОЙ МОДЕЛИ
-# ============================================================
-
-y_pred_1 = model1.predict(X_test_m1)
-
-metrics_model1 = {
-    "Accuracy": accuracy_score(y_test, y_pred_1),
-    "Precision": precision_score(y_test, y_pred_1),
-    "Recall": recall_score(y_test, y_pred_1),
-    "F1-score": f1_score(y_test, y_pred_1)
-}
+    return {
+        "Accuracy": accuracy_score(y_test, y_pred),
+        "Precision": precision_score(y_test, y_pred, zero_division=0),
+        "Recall": recall_score(y_test, y_pred, zero_division=0),
+        "F1-score": f1_score(y_test, y_pred, zero_division=0)
+    }
 
 
 # ============================================================
-# ОБУЧЕНИЕ ВТОРОЙ МОДЕЛИ (НА ТОМ ЖЕ НАБОРЕ ПРИЗНАКОВ)
+# СРАВНЕНИЕ МОДЕЛЕЙ
 # ============================================================
 
-X_train_m2 = X_train[expected_features]
-X_test_m2 = X_test[expected_features]
-
-model2 = LogisticRegression(
-    max_iter=2000,
-    solver="lbfgs"
-)
-
-model2.fit(X_train_m2, y_train)
-
-y_pred_2 = model2.predict(X_test_m2)
-
-metrics_model2 = {
-    "Accuracy": accuracy_score(y_test, y_pred_2),
-    "Precision": precision_score(y_test, y_pred_2),
-    "Recall": recall_score(y_test, y_pred_2),
-    "F1-score": f1_score(y_test, y_pred_2)
-}
+def compare_system_models(
+    data: dict,
+    n_splits: int = COMPARISON_FOLDS,
+    n_repeats: int = COMPARISON_REPEATS,
+    n_workers: int = None,
+    progress=None
+) -> pd.DataFrame:
+    """
+    Сравнение Random Forest и Logistic Regression по качеству
+    и скорости на обучающей выборке (ml.compare.compare_models).
+
+    :param data: результат load_comparison_data
+    """
+    return compare_models(
+        default_candidates(),
+        data["X_train"],
+        data["y_train"],
+        n_splits=n_splits,
+        n_repeats=n_repeats,
+        n_workers=n_workers,
+        progress=progress
+    )
 
 
 # ============================================================
-# СРАВНЕНИЕ МОДЕЛЕЙ
+# ОБУЧЕНИЕ ВТОРОЙ МОДЕЛИ (НА ТОМ ЖЕ НАБОРЕ ПРИЗНАКОВ)
 # ============================================================
 
-comparison = pd.DataFrame.from_dict(
-    {
-        "Random Forest (model1)": metrics_model1,
-        "Logistic Regression (model2)": metrics_model2
-    },
-    orient="index"
-)
-
-print("=== СРАВНЕНИЕ МОДЕЛЕЙ ===")
-print(comparison.round(3))
+def train_second_model(data: dict,
+                       model2_path: str = MODEL2_PATH) -> dict:
+    """
+    Обучение Logistic Regression, сохранение model2 и сравнение
+    с model1 на тестовой выборке.
+
+    :param data: результат load_comparison_data
+    :return: словарь: model2, comparison (таблица метрик),
+             model_path, runtime_path
+    """
+
+    model2 = LogisticRegression(
+        max_iter=2000,
+        solver="lbfgs"
+    )
+
+    model2.fit(data["X_train"], data["y_train"])
+
+    comparison = pd.DataFrame.from_dict(
+        {
+            "Random Forest (model1)": holdout_metrics(
+                data["model1"], data["X_test"], data["y_test"]
+            ),
+            "Logistic Regression (model2)": holdout_metrics(
+                model2, data["X_test"], data["y_test"]
+            )
+        },
+        orient="index"
+    )
+
+    # через временный файл: прерванная запись не оставляет
+    # поврежденный файл модели
+    os.makedirs(os.path.dirname(os.path.abspath(model2_path)), exist_ok=True)
+    joblib.dump(model2, model2_path + ".tmp")
+    os.replace(model2_path + ".tmp", model2_path)
+
+    # экспорт для применения без sklearn (ml.runtime)
+    runtime_path = export_runtime(model2, model2_path)
+
+    return {
+        "model2": model2,
+        "comparison": comparison,
+        "model_path": model2_path,
+        "runtime_path": runtime_path
+    }
 
 
 # ============================================================
-# СОХРАНЕНИЕ ВТОРОЙ МОДЕЛИ
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
 # ============================================================
 
-joblib.dump(model2, MODEL2_PATH)
-
-print("\nВторая модель сохранена:")
-print(MODEL2_PATH)
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Обучение model2 и сравнение с model1"
+    )
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--folds", type=int, default=COMPARISON_FOLDS)
+    parser.add_argument("--repeats", type=int, default=COMPARISON_REPEATS)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="число процессов сравнения (по умолчанию — число ядер)"
+    )
+    parser.add_argument(
+        "--no-cv", action="store_true",
+        help="без сравнения кросс-валидацией"
+    )
+
+    args = parser.parse_args()
+
+    data = load_comparison_data(args.data)
+
+    if not args.no_cv:
+        cv_comparison = compare_system_models(
+            data, args.folds, args.repeats, args.workers
+        )
+
+        print("=== СРАВНЕНИЕ МОДЕЛЕЙ (КРОСС-ВАЛИДАЦИЯ) ===")
+        print(cv_comparison.round(4).to_string())
+        print()
+
+    result = train_second_model(data)
+
+    print("=== СРАВНЕНИЕ МОДЕЛЕЙ ===")
+    print(result["comparison"].round(3))
+
+    print("\nВторая модель сохранена:")
+    print(result["model_path"])
+    print(result["runtime_path"])
@@ -0,0 +1,195 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Обучение модели в отдельном процессе.
+
+Процесс обучения не блокирует вызывающую сторону (окно
+администратора): события прогресса и результат передаются
+через очередь, обучение можно отменить.
+
+События (кортежи):
+    ("progress", message, percent) — этап обучения;
+    ("saving",)                    — начато сохранение модели,
+                                     отмена больше не выполняется;
+    ("done", metrics)              — обучение завершено;
+    ("error", message)             — ошибка обучения;
+    ("cancelled",)                 — обучение отменено.
+"""
+
+import os
+import time
+import queue
+import multiprocessing
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+# время на штатное завершение после отмены (с),
+# после чего процесс обучения принудительно останавливается
+CANCEL_TIMEOUT = 5.0
+
+# путь к модели по умолчанию (как в ml.train.train_model)
+DEFAULT_MODEL_PATH = "models/financial_stability_model.pkl"
+
+
+class TrainingCancelled(Exception):
+    """
+    Обучение остановлено по запросу пользователя.
+    """
+
+
+# ============================================================
+# ПРОЦЕСС ОБУЧЕНИЯ
+# ============================================================
+
+def _run_training(events, cancel_event, kwargs: dict) -> None:
+    """
+    Точка входа процесса обучения.
+    """
+
+    saving = False
+
+    def progress(message: str, percent: int) -> None:
+        nonlocal saving
+
+        if percent >= SAVING_PERCENT:
+            # файл модели заменяется: обучение доводится до конца
+            if not saving:
+                saving = True
+                events.put(("saving",))
+        elif cancel_event.is_set():
+            # отмена проверяется между этапами обучения
+            raise TrainingCancelled()
+
+        events.put(("progress", message, percent))
+
+    if kwargs.get("tune"):
+        # процесс обучения — демон и не может создать пул
+        # процессов: кандидаты подбора оцениваются в нем самом
+        kwargs = {**kwargs, "n_workers": 1}
+
+    try:
+        from ml.train import SAVING_PERCENT, train_model
+
+        metrics = train_model(progress=progress, **kwargs)
+
+    except TrainingCancelled:
+        events.put(("cancelled",))
+
+    except Exception as e:
+        events.put(("error", str(e)))
+
+    else:
+        events.put(("done", metrics))
+
+
+class TrainingJob:
+    """
+    Обучение модели ml.train.train_model в отдельном процессе.
+
+    Пример:
+        job = TrainingJob(data_path=..., model_path=...)
+        job.start()
+        ...
+        for event in job.poll():
+            ...
+    """
+
+    def __init__(self, **kwargs):
+        # spawn: процесс не наследует состояние Qt родителя
+        context = multiprocessing.get_context("spawn")
+
+        self._events = context.Queue()
+        self._cancel_event = context.Event()
+        self._process = context.Process(
+            target=_run_training,
+            args=(self._events, self._cancel_event, kwargs),
+            daemon=True
+        )
+        self._model_path = kwargs.get("model_path", DEFAULT_MODEL_PATH)
+        self._cancel_deadline = None
+        self._saving = False
+        self.finished = False
+
+    def start(self) -> None:
+        self._process.start()
+
+    def cancel(self) -> None:
+        """
+        Запрос отмены: обучение прерывается на ближайшем этапе,
+        а если процесс не завершился за CANCEL_TIMEOUT —
+        останавливается принудительно (при очередном poll).
+        """
+
+        if self.finished or self._saving:
+            return
+
+        self._cancel_event.set()
+
+        if self._cancel_deadline is None:
+            self._cancel_deadline = time.monotonic() + CANCEL_TIMEOUT
+
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def poll(self) -> list:
+        """
+        Получение накопившихся событий без ожидания.
+        """
+
+        events = []
+
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+
+        if any(event[0] == "saving" for event in events):
+            self._saving = True
+
+        if any(event[0] in ("done", "error", "cancelled") for event in events):
+            self._finish()
+            return events
+
+        if self.finished:
+            return events
+
+        if (self._cancel_deadline is not None and not self._saving
+                and time.monotonic() > self._cancel_deadline):
+            # до этапа сохранения файл модели не изменялся:
+            # процесс останавливается, временные файлы удаляются
+            self._process.terminate()
+            self._finish()
+            self._remove_temporary_files()
+            events.append(("cancelled",))
+
+        elif not self._process.is_alive() and self._events.empty():
+            # процесс завершился, не отправив результат
+            self._finish()
+            events.append((
+                "error",
+                f"Процесс обучения завершился с кодом "
+                f"{self._process.exitcode}"
+            ))
+
+        return events
+
+    def _finish(self) -> None:
+        self.finished = True
+        self._process.join(timeout=CANCEL_TIMEOUT)
+
+    def _remove_temporary_files(self) -> None:
+        """
+        Удаление временного файла модели, оставшегося
+        после принудительной остановки процесса.
+        """
+
+        tmp_path = self._model_path + ".tmp"
+
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
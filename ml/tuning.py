@@ -0,0 +1,207 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Подбор гиперпараметров модели Random Forest.
+
+Кандидаты (полная сетка или случайная выборка из пространства
+параметров) оцениваются стратифицированной k-блочной
+кросс-валидацией параллельно в пуле процессов над общей матрицей
+признаков (ml.parallel). Для каждого кандидата фиксируется время
+расчета.
+"""
+
+import time
+
+import numpy as np
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import (
+    ParameterGrid,
+    ParameterSampler,
+    StratifiedKFold
+)
+
+from ml.parallel import run_on_data
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+# пространство поиска по умолчанию
+DEFAULT_PARAM_SPACE = {
+    "n_estimators": [100, 300],
+    "max_depth": [4, 6, 8, None],
+    "min_samples_split": [2, 5, 10],
+    "min_samples_leaf": [1, 3, 5]
+}
+
+# число блоков кросс-валидации
+CV_FOLDS = 5
+
+# метрика выбора лучшего кандидата
+TUNING_SCORING = "f1_score"
+
+
+# ============================================================
+# КАНДИДАТЫ
+# ============================================================
+
+def candidate_params(param_space=None, n_iter: int = None,
+                     random_state: int = 42) -> list:
+    """
+    Список наборов параметров для оценки.
+
+    :param param_space: словарь {параметр: список значений
+                        или распределение scipy.stats}
+    :param n_iter: None — полный перебор сетки, иначе случайная
+                   выборка n_iter кандидатов
+    """
+
+    param_space = DEFAULT_PARAM_SPACE if param_space is None else param_space
+
+    if n_iter is None:
+        return list(ParameterGrid(param_space))
+
+    return list(ParameterSampler(
+        param_space, n_iter=n_iter, random_state=random_state
+    ))
+
+
+# ============================================================
+# ОЦЕНКА КАНДИДАТА
+# ============================================================
+
+def evaluate_candidate(params: dict, X, y, cv_folds: int = CV_FOLDS,
+                       random_state: int = 42) -> dict:
+    """
+    Оценка одного набора параметров кросс-валидацией.
+
+    :return: словарь с параметрами, средними метриками по блокам,
+             их разбросом и временем расчета (с)
+    """
+
+    started = time.perf_counter()
+
+    folds = StratifiedKFold(
+        n_splits=cv_folds, shuffle=True, random_state=random_state
+    )
+
+    scores = {"accuracy": [], "f1_score": []}
+
+    for train_index, test_index in folds.split(X, y):
+        model = RandomForestClassifier(
+            random_state=random_state, **params
+        )
+        model.fit(X[train_index], y[train_index])
+
+        y_pred = model.predict(X[test_index])
+
+        scores["accuracy"].append(accuracy_score(y[test_index], y_pred))
+        scores["f1_score"].append(
+            f1_score(y[test_index], y_pred, zero_division=0)
+        )
+
+    result = {"params": params}
+
+    for metric, values in scores.items():
+        result[metric] = float(np.mean(values))
+        result[f"{metric}_std"] = float(np.std(values))
+
+    result["seconds"] = time.perf_counter() - started
+
+    return result
+
+
+def _plain_params(params: dict) -> dict:
+    """
+    Приведение значений параметров (в том числе выбранных из
+    распределений scipy.stats) к типам Python для сохранения в JSON.
+    """
+    return {
+        name: value.item() if isinstance(value, np.generic) else value
+        for name, value in params.items()
+    }
+
+
+def _evaluate_task(X, y, params: dict, cv_folds: int,
+                   random_state: int) -> dict:
+    return evaluate_candidate(params, X, y, cv_folds, random_state)
+
+
+# ============================================================
+# ПОДБОР ПАРАМЕТРОВ
+# ============================================================
+
+def tune_random_forest(
+    X,
+    y,
+    param_space=None,
+    n_iter: int = None,
+    cv_folds: int = CV_FOLDS,
+    n_workers: int = None,
+    random_state: int = 42,
+    progress=None
+) -> dict:
+    """
+    Параллельный подбор гиперпараметров Random Forest.
+
+    :param n_workers: число процессов (по умолчанию — число ядер);
+                      при n_workers=1 кандидаты оцениваются в текущем
+                      процессе без пула (в том числе в процессе-демоне,
+                      которому запрещено создавать дочерние процессы)
+    :param progress: обработчик progress(message, percent) или None;
+                     percent — доля оцененных кандидатов (0–100)
+    :return: словарь:
+             best_params — лучшие параметры (по TUNING_SCORING);
+             results     — результаты всех кандидатов по убыванию
+                           метрики;
+             seconds     — общее время подбора
+    """
+
+    started = time.perf_counter()
+
+    candidates = [
+        _plain_params(params)
+        for params in candidate_params(param_space, n_iter, random_state)
+    ]
+
+    if not candidates:
+        raise ValueError("Пространство параметров не содержит кандидатов.")
+
+    results = []
+
+    def collect(result: dict, index: int) -> None:
+        result["candidate"] = index
+        results.append(result)
+
+        # исключение из обработчика (отмена обучения)
+        # прерывает подбор
+        if progress is not None:
+            progress(
+                f"Кандидат {len(results)} из {len(candidates)}: "
+                f"{result['params']} — "
+                f"{TUNING_SCORING}={result[TUNING_SCORING]:.3f}, "
+                f"{result['seconds']:.1f} с",
+                100 * len(results) // len(candidates)
+            )
+
+    run_on_data(
+        _evaluate_task,
+        [(params, cv_folds, random_state) for params in candidates],
+        X, y, collect, n_workers, prefix="tuning-"
+    )
+
+    # при равной метрике — по точности, затем по порядку кандидатов
+    results.sort(key=lambda r: (
+        -r[TUNING_SCORING], -r["accuracy"], r["candidate"]
+    ))
+
+    return {
+        "best_params": results[0]["params"],
+        "results": results,
+        "seconds": time.perf_counter() - started
+    }
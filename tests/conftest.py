@@ -0,0 +1,83 @@
+"""
+Общие данные для тестов: синтетические финансовые показатели
+в формате data/financial_data.csv.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_financial_frame(rows: int = 300, seed: int = 0,
+                         entities: int = None) -> pd.DataFrame:
+    """
+    Синтетический датасет: несколько отчетных лет, при entities —
+    строковый идентификатор предприятия (ENTITY_COLUMN).
+    """
+
+    rng = np.random.default_rng(seed)
+
+    total_assets = rng.uniform(800_000, 5_000_000, rows).round()
+    equity = (total_assets * rng.uniform(0.25, 0.75, rows)).round()
+    current_assets = (total_assets * rng.uniform(0.35, 0.65, rows)).round()
+
+    df = pd.DataFrame({
+        "year": rng.integers(2012, 2026, rows),
+        "current_assets": current_assets,
+        "current_liabilities": (
+            current_assets * rng.uniform(0.6, 1.3, rows)
+        ).round(),
+        "equity": equity,
+        "total_assets": total_assets,
+        "profit": (total_assets * rng.normal(0.05, 0.08, rows)).round(),
+        "label": rng.integers(0, 2, rows)
+    })
+
+    if entities is not None:
+        df.insert(
+            0, "company_id",
+            [f"company-{i}" for i in rng.integers(0, entities, rows)]
+        )
+
+    return df
+
+
+def with_duplicates_and_gaps(df: pd.DataFrame, seed: int = 1) -> pd.DataFrame:
+    """
+    Копия датасета с повторяющимися строками (в том числе
+    с пропусками) и пропусками в показателях.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    df = df.copy()
+    gaps = rng.choice(len(df), len(df) // 10, replace=False)
+    df.loc[gaps, "profit"] = np.nan
+
+    repeats = df.iloc[rng.choice(len(df), len(df) // 5)]
+    df = pd.concat([df, repeats], ignore_index=True)
+
+    return df.iloc[rng.permutation(len(df))].reset_index(drop=True)
+
+
+@pytest.fixture
+def financial_csv(tmp_path):
+    path = tmp_path / "financial.csv"
+    make_financial_frame().to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def entity_csv(tmp_path):
+    path = tmp_path / "financial_entities.csv"
+    make_financial_frame(entities=12).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def messy_csv(tmp_path):
+    path = tmp_path / "financial_messy.csv"
+    with_duplicates_and_gaps(
+        make_financial_frame(entities=12)
+    ).to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,82 @@
+"""
+Сравнение моделей кросс-валидацией (ml.compare).
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from ml.compare import COMPARISON_METRICS, compare_models
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _candidates():
+    return {
+        "Random Forest": RandomForestClassifier(
+            n_estimators=20, max_depth=4, random_state=0
+        ),
+        "Logistic Regression": LogisticRegression(max_iter=1000)
+    }
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return make_classification(n_samples=300, n_features=5, random_state=0)
+
+
+def test_pool_matches_in_process(dataset):
+    X, y = dataset
+
+    serial = compare_models(_candidates(), X, y, 3, 2, n_workers=1)
+    pooled = compare_models(_candidates(), X, y, 3, 2, n_workers=2)
+
+    metrics = list(COMPARISON_METRICS) + ["folds"]
+    pd.testing.assert_frame_equal(
+        serial[metrics].sort_index(), pooled[metrics].sort_index()
+    )
+    assert (serial["folds"] == 6).all()
+
+
+def test_string_labels(dataset):
+    X, y = dataset
+    labels = np.where(y == 1, "устойчиво", "неустойчиво").astype(object)
+
+    numeric = compare_models(_candidates(), X, y, 3, 1, n_workers=2)
+    named = compare_models(_candidates(), X, labels, 3, 1, n_workers=2)
+
+    # "устойчиво" — второй класс по порядку сортировки, как 1
+    pd.testing.assert_frame_equal(
+        numeric[list(COMPARISON_METRICS)].sort_index(),
+        named[list(COMPARISON_METRICS)].sort_index()
+    )
+
+
+def test_progress_exception_stops_pool():
+    X, y = make_classification(n_samples=1000, n_features=10, random_state=0)
+    candidates = {
+        "Random Forest": RandomForestClassifier(n_estimators=60)
+    }
+
+    def interrupt(message, percent):
+        raise Interrupted()
+
+    started = time.perf_counter()
+    compare_models(candidates, X, y, 5, 6, n_workers=2)
+    full = time.perf_counter() - started
+
+    # после исключения оставшиеся блоки отменяются, а не ожидаются
+    started = time.perf_counter()
+    with pytest.raises(Interrupted):
+        compare_models(candidates, X, y, 5, 6, n_workers=2,
+                       progress=interrupt)
+
+    assert time.perf_counter() - started < full / 2
@@ -0,0 +1,91 @@
+"""
+Потоковая подготовка данных (load_and_prepare_data_chunks)
+и бинарный кэш подготовленных данных.
+"""
+
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from utils.data_loader import (
+    CACHE_DIR_NAME,
+    load_and_prepare_data,
+    load_and_prepare_data_chunks,
+    read_cached_frame,
+    write_cached_frame
+)
+
+
+def _streamed(file_path: str, chunksize: int) -> pd.DataFrame:
+    df = pd.concat(load_and_prepare_data_chunks(file_path, chunksize))
+    return df.astype(
+        {"company_id": object} if "company_id" in df.columns else {}
+    )
+
+
+def test_chunks_with_string_entity_column(entity_csv):
+    streamed = _streamed(entity_csv, chunksize=50)
+    expected = load_and_prepare_data(entity_csv, use_cache=False)
+
+    assert streamed["company_id"].map(type).eq(str).all()
+    pd.testing.assert_frame_equal(
+        streamed, expected.astype({"company_id": object}),
+        check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("chunksize", [7, 64, 1000])
+def test_chunks_match_prepared_data(messy_csv, chunksize):
+    expected = load_and_prepare_data(messy_csv, use_cache=False)
+
+    pd.testing.assert_frame_equal(
+        _streamed(messy_csv, chunksize),
+        expected.astype({"company_id": object}),
+        check_dtype=False
+    )
+
+
+def test_cache_replaced_with_new_frame(financial_csv):
+    df = load_and_prepare_data(financial_csv, use_cache=False)
+
+    write_cached_frame(df, financial_csv, "test")
+    write_cached_frame(df.head(10), financial_csv, "test")
+
+    pd.testing.assert_frame_equal(
+        read_cached_frame(financial_csv, "test").copy(), df.head(10),
+        check_dtype=False
+    )
+
+
+def test_concurrent_cache_writers(financial_csv):
+    df = load_and_prepare_data(financial_csv, use_cache=False)
+    frames = [df.head(rows) for rows in (50, 100, 150, 200)] * 4
+    barrier = threading.Barrier(len(frames))
+    errors = []
+
+    def write(frame):
+        barrier.wait()
+        try:
+            write_cached_frame(frame, financial_csv, "test")
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write, args=(frame,))
+               for frame in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    cached = read_cached_frame(financial_csv, "test").copy()
+    cache_root = os.path.join(os.path.dirname(financial_csv), CACHE_DIR_NAME)
+
+    assert not errors
+    # в кэше — целиком один из записанных вариантов
+    pd.testing.assert_frame_equal(
+        cached, df.head(len(cached)), check_dtype=False
+    )
+    # временные и перенесенные в сторону каталоги удалены
+    assert os.listdir(cache_root) == ["financial.csv.test"]
@@ -0,0 +1,76 @@
+"""
+Хранилище признаков и кэш обучающих данных (ml.feature_store).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ml.feature_store
+from tests.conftest import make_financial_frame, with_duplicates_and_gaps
+from ml.feature_store import (
+    build_feature_store,
+    load_feature_store,
+    load_training_data,
+    read_store_schema
+)
+from utils.data_loader import fingerprint_matches
+
+
+@pytest.mark.parametrize("entities", [None, 12])
+def test_store_matches_training_data(tmp_path, entities):
+    data_path = tmp_path / "financial.csv"
+    with_duplicates_and_gaps(
+        make_financial_frame(entities=entities)
+    ).to_csv(data_path, index=False)
+
+    training_data = load_training_data(str(data_path))
+    names = list(training_data["X"].columns)
+
+    build_feature_store(
+        str(data_path), str(tmp_path / "store"), names, chunksize=40
+    )
+    X, y = load_feature_store(str(tmp_path / "store"))
+
+    np.testing.assert_array_equal(
+        X.to_numpy(), training_data["X"].to_numpy()
+    )
+    pd.testing.assert_series_equal(
+        y, training_data["y"], check_names=False
+    )
+
+
+def test_store_source_taken_before_read(tmp_path, financial_csv,
+                                        monkeypatch):
+    read_chunks = ml.feature_store.load_and_prepare_data_chunks
+
+    def chunks_then_modify(data_path, chunksize):
+        yield from read_chunks(data_path, chunksize)
+        # файл изменяется после чтения, но до записи схемы
+        with open(data_path, "a", encoding="utf-8") as f:
+            f.write("2025,1,1,1,1,1,1\n")
+
+    monkeypatch.setattr(
+        ml.feature_store, "load_and_prepare_data_chunks", chunks_then_modify
+    )
+
+    store_path = str(tmp_path / "store")
+    build_feature_store(financial_csv, store_path, chunksize=100)
+
+    schema = read_store_schema(store_path)
+
+    assert not fingerprint_matches(schema["source"], financial_csv)
+
+
+def test_store_rebuild_replaces_existing(tmp_path, financial_csv):
+    store_path = str(tmp_path / "store")
+
+    build_feature_store(financial_csv, store_path, ["current_ratio"])
+    schema = build_feature_store(financial_csv, store_path, ["equity_ratio"])
+
+    X, _ = load_feature_store(store_path)
+
+    assert list(X.columns) == schema["features"] == ["equity_ratio"]
+    # временные каталоги удалены
+    assert sorted(p.name for p in tmp_path.iterdir()) == \
+        ["financial.csv", "store"]
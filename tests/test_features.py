@@ -0,0 +1,123 @@
+"""
+Ядро расчета признаков (ml.features.calculate_feature_matrix)
+в сравнении с последовательным расчетом по группам показателей.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.features import (
+    GROWTH_FEATURES,
+    _replace_infinite,
+    calculate_feature_matrix,
+    calculate_financial_ratios,
+    calculate_financial_stability_ratios,
+    calculate_integral_score,
+    calculate_liquidity_ratios,
+    calculate_profitability_ratios,
+    last_known_rows
+)
+from tests.conftest import make_financial_frame
+from utils.data_loader import ENTITY_COLUMN
+
+
+# исходные показатели темпов роста
+GROWTH_COLUMNS = {
+    "assets_growth": "total_assets",
+    "equity_growth": "equity",
+    "profit_growth": "profit"
+}
+
+
+def _with_zeros(df: pd.DataFrame) -> pd.DataFrame:
+    """Нулевые знаменатели для проверки защиты от деления на ноль."""
+    df = df.copy()
+    for column in ["current_liabilities", "equity", "profit", "total_assets"]:
+        df.loc[df.index[::17], column] = 0
+    return df
+
+
+def _baseline_growth(df: pd.DataFrame) -> pd.DataFrame:
+    """Темпы роста через pct_change по отсортированным данным."""
+    ordered = df.sort_values("year", kind="stable")
+    columns = list(GROWTH_COLUMNS.values())
+
+    if ENTITY_COLUMN in df.columns:
+        previous = ordered.groupby(ENTITY_COLUMN, sort=False)[columns].shift()
+    else:
+        previous = ordered[columns].shift()
+
+    growth = ordered[columns] / previous - 1
+    growth.columns = list(GROWTH_COLUMNS)
+
+    return growth.reindex(df.index)
+
+
+def _baseline(df: pd.DataFrame) -> pd.DataFrame:
+    result = pd.concat(
+        [
+            calculate_liquidity_ratios(df),
+            calculate_financial_stability_ratios(df),
+            calculate_profitability_ratios(df),
+            _baseline_growth(df).reset_index(drop=True),
+            calculate_integral_score(df)
+        ],
+        axis=1
+    )
+    return _replace_infinite(result)
+
+
+@pytest.mark.parametrize("entities", [None, 7])
+def test_kernel_matches_baseline(entities):
+    df = _with_zeros(make_financial_frame(500, entities=entities))
+
+    features = calculate_financial_ratios(df)
+    expected = _baseline(df)[features.columns]
+
+    np.testing.assert_allclose(
+        features.to_numpy(), expected.to_numpy(), rtol=1e-12, atol=1e-12
+    )
+
+
+def test_kernel_feature_subset_and_order():
+    df = make_financial_frame(50)
+    names = ["integral_stability_score", "current_ratio"] + GROWTH_FEATURES
+
+    subset = calculate_feature_matrix(df, names)
+    full = calculate_financial_ratios(df)[names].to_numpy()
+
+    np.testing.assert_array_equal(subset, full)
+
+
+@pytest.mark.parametrize("entities", [None, 5])
+def test_kernel_chunks_match_whole_frame(entities):
+    df = make_financial_frame(400, entities=entities)
+    df = df.sort_values("year", kind="stable").reset_index(drop=True)
+
+    whole = calculate_feature_matrix(df, ordered=True)
+
+    parts = []
+    previous_rows = None
+
+    for start in range(0, len(df), 37):
+        chunk = df.iloc[start:start + 37]
+        parts.append(calculate_feature_matrix(
+            chunk, ordered=True, previous_rows=previous_rows
+        ))
+        previous_rows = last_known_rows(
+            pd.concat([previous_rows, chunk])
+            if previous_rows is not None else chunk
+        )
+
+    np.testing.assert_array_equal(np.vstack(parts), whole)
+
+
+def test_single_record_dict():
+    df = make_financial_frame(1)
+    record = df.iloc[0].to_dict()
+
+    np.testing.assert_array_equal(
+        calculate_feature_matrix(record),
+        calculate_feature_matrix(df)
+    )
@@ -0,0 +1,66 @@
+"""
+Дымовые тесты модели таблицы коэффициентов без окна
+(платформа Qt offscreen).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from gui.feature_table_model import (  # noqa: E402
+    FETCH_BATCH_ROWS,
+    FeatureTableModel
+)
+
+
+@pytest.fixture(scope="module")
+def app():
+    instance = QtCore.QCoreApplication.instance()
+    return instance or QtCore.QCoreApplication([])
+
+
+def _model(rows: int = 2500):
+    rng = np.random.default_rng(0)
+    return FeatureTableModel(
+        rng.normal(size=(rows, 3)), ["current_ratio", "equity_ratio", "roa"]
+    )
+
+
+def test_lazy_loading(app):
+    model = _model()
+
+    assert model.rowCount() == FETCH_BATCH_ROWS
+    assert model.columnCount() == 3
+    assert model.canFetchMore()
+
+    while model.canFetchMore():
+        model.fetchMore()
+
+    assert model.rowCount() == model.total_rows()
+
+
+def test_sort_and_filter(app):
+    model = _model()
+    Qt = QtCore.Qt
+
+    model.sort(1, Qt.DescendingOrder)
+    shown = [
+        float(model.data(model.index(row, 1)))
+        for row in range(model.rowCount())
+    ]
+    assert shown == sorted(shown, reverse=True)
+
+    model.set_range_filter(0, minimum=0.0)
+    assert 0 < model.filtered_rows() < model.total_rows()
+
+    for row in range(model.rowCount()):
+        assert float(model.data(model.index(row, 0))) >= 0
+
+    model.clear_filter()
+    assert model.filtered_rows() == model.total_rows()
+    assert model.headerData(0, Qt.Horizontal) == "current_ratio"
@@ -0,0 +1,90 @@
+"""
+Инкрементальное обновление признаков (ml.incremental)
+в сравнении с полным пересчетом.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.features import calculate_financial_ratios
+from ml.incremental import IncrementalFeatureUpdater
+from tests.conftest import make_financial_frame
+
+
+def _by_year(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("year", kind="stable").reset_index(drop=True)
+
+
+def _split_years(df: pd.DataFrame, years: list) -> list:
+    """История до первого года years и по одному блоку на каждый год."""
+    parts = [df[df["year"] < years[0]]]
+    parts += [df[df["year"] == year] for year in years]
+    return parts
+
+
+@pytest.mark.parametrize("entities", [None, 12])
+def test_append_matches_full_recompute(entities):
+    df = _by_year(make_financial_frame(rows=400, entities=entities))
+    history, *quarters = _split_years(df, [2023, 2024, 2025])
+
+    updater = IncrementalFeatureUpdater()
+    updater.fit(history)
+    for rows in quarters:
+        updater.append(rows)
+
+    expected = calculate_financial_ratios(df, updater.feature_names)
+
+    assert len(updater.features) == len(df)
+    np.testing.assert_allclose(
+        updater.features.to_numpy(), expected.to_numpy(), equal_nan=True
+    )
+
+
+def test_append_returns_new_rows_only():
+    df = _by_year(make_financial_frame(entities=12))
+    history, new_rows = _split_years(df, [2025])
+
+    updater = IncrementalFeatureUpdater()
+    updater.fit(history)
+    appended = updater.append(new_rows)
+
+    expected = calculate_financial_ratios(df, updater.feature_names)
+
+    assert appended.index.equals(new_rows.index)
+    np.testing.assert_allclose(
+        appended.to_numpy(), expected.loc[new_rows.index].to_numpy(),
+        equal_nan=True
+    )
+
+
+def test_save_and_load_continue_updates(tmp_path):
+    df = _by_year(make_financial_frame(entities=12))
+    history, first, second = _split_years(df, [2024, 2025])
+
+    updater = IncrementalFeatureUpdater()
+    updater.fit(history)
+    updater.append(first)
+
+    path = str(tmp_path / "features.joblib")
+    updater.save(path)
+
+    restored = IncrementalFeatureUpdater.load(path)
+    restored.append(second)
+
+    expected = calculate_financial_ratios(df, restored.feature_names)
+
+    np.testing.assert_allclose(
+        restored.features.to_numpy(), expected.to_numpy(), equal_nan=True
+    )
+
+
+def test_earlier_period_requires_fit():
+    df = _by_year(make_financial_frame(entities=12))
+    history, _ = _split_years(df, [2025])
+
+    updater = IncrementalFeatureUpdater()
+    updater.fit(df)
+
+    with pytest.raises(ValueError):
+        updater.append(history.tail(5))
@@ -0,0 +1,67 @@
+"""
+Порционное обучение с контрольными точками (ml.online).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from ml.online import checkpoint_path, train_online
+from tests.conftest import make_financial_frame
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def online_csv(tmp_path):
+    path = tmp_path / "financial.csv"
+    make_financial_frame(1200).to_csv(path, index=False)
+    return str(path)
+
+
+def _train(data_path: str, model_path: str, progress=None, update=False):
+    return train_online(
+        data_path, model_path, update=update, chunksize=100,
+        checkpoint_every=1, progress=progress
+    )
+
+
+def test_resume_matches_uninterrupted_run(tmp_path, online_csv):
+    expected = _train(online_csv, str(tmp_path / "full" / "model.pkl"))
+
+    model_path = str(tmp_path / "resumed" / "model.pkl")
+    os.makedirs(os.path.dirname(model_path))
+
+    def interrupt(message, rows):
+        if rows > 500:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        _train(online_csv, model_path, progress=interrupt)
+
+    assert os.path.exists(checkpoint_path(model_path))
+
+    resumed_rows = []
+    resumed = _train(
+        online_csv, model_path,
+        progress=lambda message, rows: resumed_rows.append(rows)
+    )
+
+    # обучение продолжено с контрольной точки, а не с начала
+    assert resumed_rows[0] > 100
+    assert not os.path.exists(checkpoint_path(model_path))
+
+    assert resumed.rows_seen == expected.rows_seen
+    np.testing.assert_allclose(resumed.coef_, expected.coef_)
+    np.testing.assert_allclose(resumed.intercept_, expected.intercept_)
+
+
+def test_update_rejects_consumed_file(tmp_path, online_csv):
+    model_path = str(tmp_path / "model.pkl")
+    _train(online_csv, model_path)
+
+    with pytest.raises(ValueError):
+        _train(online_csv, model_path, update=True)
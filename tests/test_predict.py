@@ -0,0 +1,77 @@
+"""
+Пакетный прогноз (ml.predict.predict_stability_batch).
+"""
+
+import numpy as np
+import pandas as pd
+
+from ml.features import GROWTH_FEATURES, calculate_financial_ratios
+from ml.predict import (
+    INPUT_COLUMNS,
+    _growth_frame,
+    predict_stability,
+    predict_stability_batch
+)
+from tests.conftest import make_financial_frame
+
+
+def _records(rows: int = 20) -> pd.DataFrame:
+    return make_financial_frame(rows).assign(
+        current_liabilities=lambda df: df["total_assets"] - df["equity"]
+    )[INPUT_COLUMNS]
+
+
+def test_batch_matches_single_records():
+    df = _records()
+    result = predict_stability_batch(df, "Random Forest")
+
+    assert result["errors"].empty
+
+    for position, record in enumerate(df.to_dict("records")):
+        single = predict_stability(record, "Random Forest")
+        row = result["results"].iloc[position]
+
+        assert row["prediction"] == single["prediction"]
+        assert np.isclose(row["probability"], single["probability"])
+
+
+def test_year_is_optional():
+    df = _records().drop(columns="year")
+    df_gap = _records().astype({"year": float})
+    df_gap.loc[0, "year"] = np.nan
+
+    for data in (df, df_gap):
+        result = predict_stability_batch(data, "Logistic Regression")
+        assert result["errors"].empty
+        assert len(result["results"]) == len(data)
+
+
+def test_growth_only_within_company():
+    df = _records(6)
+
+    unrelated = calculate_financial_ratios(_growth_frame(df))
+    assert (unrelated[GROWTH_FEATURES].to_numpy() == 0).all()
+
+    company = calculate_financial_ratios(
+        _growth_frame(df.assign(company_id="a"))
+    )
+    assert (company[GROWTH_FEATURES].to_numpy() != 0).any()
+
+
+def test_non_numeric_cells_are_row_errors():
+    df = _records(6).astype(object)
+    df.loc[1, "equity"] = "abc"
+    df.loc[3, "total_assets"] = None
+    df.loc[4, "year"] = "n/a"
+
+    result = predict_stability_batch(df, "Random Forest")
+    errors = result["errors"]["error"]
+
+    assert list(errors.index) == [1, 3, 4]
+    assert errors[1] == errors[4] == "Финансовые показатели должны быть числами."
+    assert errors[3] == "Не заполнены обязательные финансовые показатели."
+
+    expected = predict_stability_batch(
+        _records(6).drop(index=[1, 3, 4]), "Random Forest"
+    )["results"]
+    pd.testing.assert_frame_equal(result["results"], expected)
@@ -0,0 +1,70 @@
+"""
+Среда применения моделей без sklearn (ml.runtime).
+"""
+
+import joblib
+import numpy as np
+import pytest
+
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from ml.runtime import (
+    ForestRuntime,
+    LinearRuntime,
+    export_runtime,
+    load_runtime,
+    runtime_source
+)
+from utils.data_loader import file_fingerprint
+
+
+def _dataset(n_classes: int = 2):
+    return make_classification(
+        n_samples=600, n_features=6, n_informative=4,
+        n_classes=n_classes, random_state=0
+    )
+
+
+MODELS = [
+    (RandomForestClassifier(n_estimators=40, max_depth=6, random_state=0),
+     ForestRuntime, 2),
+    (RandomForestClassifier(n_estimators=20, random_state=0),
+     ForestRuntime, 3),
+    (LogisticRegression(max_iter=1000), LinearRuntime, 2),
+    (LogisticRegression(max_iter=1000), LinearRuntime, 3),
+]
+
+
+@pytest.mark.parametrize("model, runtime_type, n_classes", MODELS)
+def test_runtime_matches_sklearn(tmp_path, model, runtime_type, n_classes):
+    X, y = _dataset(n_classes)
+    model.fit(X[:400], y[:400])
+
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(model, model_path)
+
+    runtime = load_runtime(export_runtime(model, model_path))
+
+    assert isinstance(runtime, runtime_type)
+    np.testing.assert_array_equal(runtime.classes_, model.classes_)
+    np.testing.assert_allclose(
+        runtime.predict_proba(X[400:]), model.predict_proba(X[400:]),
+        rtol=1e-10, atol=1e-12
+    )
+    np.testing.assert_array_equal(
+        runtime.predict(X[400:]), model.predict(X[400:])
+    )
+
+
+def test_runtime_records_source_fingerprint(tmp_path):
+    X, y = _dataset()
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(model, model_path)
+
+    exported = export_runtime(model, model_path)
+
+    assert runtime_source(exported) == file_fingerprint(model_path)
@@ -0,0 +1,71 @@
+"""
+Пакетная оценка файла (ml.score).
+"""
+
+import pandas as pd
+import pytest
+
+from ml.predict import INPUT_COLUMNS, predict_stability_batch
+from ml.score import main, score_file
+from tests.conftest import make_financial_frame
+
+
+@pytest.fixture
+def records_csv(tmp_path):
+    df = make_financial_frame(250).assign(
+        current_liabilities=lambda df: df["total_assets"] - df["equity"]
+    )[INPUT_COLUMNS].astype(object)
+    df.loc[7, "equity"] = "abc"
+    df.loc[120, "total_assets"] = -1
+
+    path = tmp_path / "records.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_file_matches_batch(tmp_path, records_csv, workers):
+    output_path = str(tmp_path / "scored.csv")
+
+    stats = score_file(
+        records_csv, output_path, "Random Forest",
+        workers=workers, chunksize=40, progress=None
+    )
+
+    scored = pd.read_csv(output_path)
+    expected = predict_stability_batch(
+        pd.read_csv(records_csv), "Random Forest"
+    )
+
+    assert stats["rows"] == len(scored) == 250
+    assert stats["errors"] == 2
+    assert scored["row"].tolist() == list(range(250))
+    assert scored.loc[scored["error"].notna(), "row"].tolist() == [7, 120]
+    assert (
+        scored["prediction"].dropna().astype(int).tolist()
+        == expected["results"]["prediction"].tolist()
+    )
+
+
+def test_progress_newline_only_for_default_reporter(
+        tmp_path, records_csv, capsys):
+    calls = []
+
+    score_file(
+        records_csv, str(tmp_path / "scored.csv"), "Random Forest",
+        workers=1, chunksize=100, progress=calls.append
+    )
+
+    assert len(calls) == 3
+    assert capsys.readouterr().err == ""
+
+
+def test_cli(tmp_path, records_csv, capsys):
+    output_path = str(tmp_path / "scored.jsonl")
+
+    assert main([
+        records_csv, output_path, "--workers", "1", "--quiet"
+    ]) == 0
+
+    assert len(pd.read_json(output_path, lines=True)) == 250
+    assert "отклонено: 2" in capsys.readouterr().out
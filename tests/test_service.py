@@ -0,0 +1,79 @@
+"""
+Сервис оценки с пакетированием запросов (ml.service).
+"""
+
+import asyncio
+import json
+import urllib.request
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ml import predict
+from ml.service import ScoringService, score_records
+from tests.test_predict import _records
+
+
+def _post(port: int, payload: dict) -> dict:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/predict",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def test_concurrent_requests_are_batched():
+    records = _records(24).to_dict("records")
+    records[5] = {**records[5], "equity": "abc"}
+    expected = score_records(records, "Random Forest")
+
+    async def scenario():
+        service = ScoringService(
+            port=0, model_names=["Random Forest"], max_delay_ms=50
+        )
+        await service.start()
+        try:
+            results = await asyncio.gather(*(
+                asyncio.to_thread(
+                    _post, service.port,
+                    {"model": "Random Forest", "data": record}
+                )
+                for record in records
+            ))
+            return results, service.batchers["Random Forest"].batches
+        finally:
+            await service.close()
+
+    results, batches = asyncio.run(scenario())
+
+    assert "error" in results[5]
+    assert [r.get("prediction") for r in results] == [
+        r.get("prediction") for r in expected
+    ]
+    assert batches < len(records)
+
+
+def test_predict_rows_is_thread_safe(monkeypatch):
+    # модели sklearn без экспорта: predict_rows не меняет
+    # глобальные фильтры предупреждений
+    monkeypatch.setattr(predict, "USE_RUNTIME_MODELS", False)
+    df = _records(50)
+    expected = predict.predict_stability_batch(df, "Logistic Regression")
+    filters = list(warnings.filters)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(
+            lambda _: predict.predict_stability_batch(
+                df, "Logistic Regression"
+            )["results"]["probability"].to_numpy(),
+            range(32)
+        ))
+
+    assert warnings.filters == filters
+    for probability in results:
+        np.testing.assert_array_equal(
+            probability, expected["results"]["probability"].to_numpy()
+        )
@@ -0,0 +1,57 @@
+"""
+Импорт модулей GUI без тяжелых зависимостей
+(utils.import_benchmark).
+"""
+
+import pytest
+
+from utils.import_benchmark import (
+    STARTUP_FORBIDDEN_PACKAGES,
+    STARTUP_MODULE,
+    measure_import
+)
+
+# модули, которые не должны загружаться в процесс GUI:
+# обучение выполняется в отдельном процессе (ml.training_job)
+GUI_FORBIDDEN_MODULES = ["sklearn", "ml.train", "ml.tuning"]
+
+GUI_MODULES = [
+    "gui.main_window",
+    "gui.admin_window",
+    "gui.warmup"
+]
+
+
+def _loaded(module: str) -> set:
+    return {m["module"] for m in measure_import(module, repeats=1)["modules"]}
+
+
+def _forbidden(loaded: set) -> list:
+    return [
+        name for name in loaded
+        if name in GUI_FORBIDDEN_MODULES
+        or name.split(".")[0] in GUI_FORBIDDEN_MODULES
+    ]
+
+
+def test_startup_module_is_light():
+    pytest.importorskip("PyQt5.QtWidgets")
+
+    loaded = _loaded(STARTUP_MODULE)
+
+    assert not [
+        name for name in loaded
+        if name.split(".")[0] in STARTUP_FORBIDDEN_PACKAGES
+    ]
+
+
+@pytest.mark.parametrize("module", GUI_MODULES)
+def test_gui_modules_do_not_import_training(module):
+    pytest.importorskip("PyQt5.QtWidgets")
+
+    assert not _forbidden(_loaded(module))
+
+
+def test_training_job_does_not_import_training():
+    # ml.training_job импортируется окном администратора в процесс GUI
+    assert not _forbidden(_loaded("ml.training_job"))
@@ -0,0 +1,69 @@
+"""
+Манифест обучения: пропуск обучения при неизмененных данных
+и настройках (ml.train.train_model).
+"""
+
+import os
+
+import pytest
+
+from ml.feature_store import build_feature_store
+from ml.train import manifest_path, read_manifest, train_model
+from tests.conftest import make_financial_frame
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    return str(tmp_path / "models" / "model.pkl")
+
+
+def test_manifest_skips_unchanged_training(financial_csv, model_path):
+    first = train_model(financial_csv, model_path)
+
+    assert not first.get("cached")
+    assert os.path.exists(manifest_path(model_path))
+
+    second = train_model(financial_csv, model_path)
+
+    assert second["cached"]
+    assert second["f1_score"] == pytest.approx(first["f1_score"])
+
+
+def test_force_retrains(financial_csv, model_path):
+    train_model(financial_csv, model_path)
+    trained_at = read_manifest(model_path)["trained_at"]
+
+    result = train_model(financial_csv, model_path, force=True)
+
+    assert not result.get("cached")
+    assert read_manifest(model_path)["trained_at"] >= trained_at
+
+
+def test_changed_data_retrains(financial_csv, model_path):
+    train_model(financial_csv, model_path)
+
+    make_financial_frame(seed=1).to_csv(financial_csv, index=False)
+
+    assert not train_model(financial_csv, model_path).get("cached")
+    assert train_model(financial_csv, model_path)["cached"]
+
+
+def test_changed_model_file_retrains(financial_csv, model_path):
+    train_model(financial_csv, model_path)
+
+    with open(model_path, "ab") as f:
+        f.write(b"\0")
+
+    assert not train_model(financial_csv, model_path).get("cached")
+
+
+def test_train_from_feature_store(financial_csv, model_path, tmp_path):
+    store_path = str(tmp_path / "store")
+    build_feature_store(financial_csv, store_path)
+
+    result = train_model(financial_csv, model_path, feature_store=store_path)
+
+    assert not result.get("cached")
+    assert train_model(
+        financial_csv, model_path, feature_store=store_path
+    )["cached"]
@@ -0,0 +1,100 @@
+"""
+Обучение в отдельном процессе и обработка событий
+(ml.training_job).
+"""
+
+import os
+import queue
+import threading
+import time
+
+from ml.training_job import TrainingJob, _run_training
+
+
+class _Events(queue.Queue):
+    """Очередь событий, запрашивающая отмену при событии cancel_on."""
+
+    def __init__(self, cancel_event, cancel_on):
+        super().__init__()
+        self.cancel_event = cancel_event
+        self.cancel_on = cancel_on
+
+    def put(self, item, *args, **kwargs):
+        super().put(item, *args, **kwargs)
+        if item[0] == self.cancel_on:
+            self.cancel_event.set()
+
+
+def _run(financial_csv, model_path, cancel_on):
+    cancel_event = threading.Event()
+    events = _Events(cancel_event, cancel_on)
+
+    _run_training(events, cancel_event, {
+        "data_path": financial_csv, "model_path": model_path
+    })
+
+    return [events.get_nowait() for _ in range(events.qsize())]
+
+
+def test_cancel_before_saving(tmp_path, financial_csv):
+    model_path = str(tmp_path / "model.pkl")
+
+    events = _run(financial_csv, model_path, cancel_on="progress")
+
+    assert events[-1] == ("cancelled",)
+    assert ("saving",) not in events
+    assert not os.path.exists(model_path)
+
+
+def test_cancel_during_saving_is_ignored(tmp_path, financial_csv):
+    model_path = str(tmp_path / "model.pkl")
+
+    events = _run(financial_csv, model_path, cancel_on="saving")
+    kinds = [event[0] for event in events]
+
+    assert kinds[-1] == "done"
+    assert kinds.index("saving") < kinds.index("done")
+    assert os.path.exists(model_path)
+    assert not os.path.exists(model_path + ".tmp")
+
+
+def _wait(job, timeout: float = 120.0) -> list:
+    events = []
+    deadline = time.monotonic() + timeout
+
+    while not job.finished and time.monotonic() < deadline:
+        events.extend(job.poll())
+        time.sleep(0.05)
+
+    assert job.finished, "процесс обучения не завершился"
+
+    return events
+
+
+def test_job_reports_done(tmp_path, financial_csv):
+    model_path = str(tmp_path / "model.pkl")
+
+    job = TrainingJob(data_path=financial_csv, model_path=model_path)
+    job.start()
+    events = _wait(job)
+
+    kinds = [event[0] for event in events]
+    percents = [event[2] for event in events if event[0] == "progress"]
+
+    assert kinds[-1] == "done"
+    assert "saving" in kinds
+    assert percents == sorted(percents)
+    assert os.path.exists(model_path)
+
+
+def test_job_cancel(tmp_path, financial_csv):
+    model_path = str(tmp_path / "model.pkl")
+
+    job = TrainingJob(data_path=financial_csv, model_path=model_path)
+    job.start()
+    job.cancel()
+    events = _wait(job)
+
+    assert events[-1] == ("cancelled",)
+    assert not os.path.exists(model_path)
+    assert not os.path.exists(model_path + ".tmp")
@@ -0,0 +1,82 @@
+"""
+Подбор гиперпараметров в пуле процессов (ml.tuning).
+"""
+
+import numpy as np
+import pytest
+
+from sklearn.datasets import make_classification
+
+from ml.tuning import candidate_params, tune_random_forest
+
+
+# небольшое пространство поиска: 4 кандидата
+PARAM_SPACE = {
+    "n_estimators": [10],
+    "max_depth": [2, 4],
+    "min_samples_leaf": [1, 5]
+}
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return make_classification(n_samples=300, n_features=5, random_state=0)
+
+
+def _strip_seconds(results: list) -> list:
+    return [
+        {key: value for key, value in result.items() if key != "seconds"}
+        for result in results
+    ]
+
+
+def test_pool_matches_in_process(dataset):
+    X, y = dataset
+
+    serial = tune_random_forest(X, y, PARAM_SPACE, cv_folds=3, n_workers=1)
+    pooled = tune_random_forest(X, y, PARAM_SPACE, cv_folds=3, n_workers=2)
+
+    assert len(pooled["results"]) == len(candidate_params(PARAM_SPACE))
+    assert pooled["best_params"] == serial["best_params"]
+    assert _strip_seconds(pooled["results"]) == \
+        _strip_seconds(serial["results"])
+
+
+def test_string_labels(dataset):
+    X, y = dataset
+    labels = np.where(y == 1, "stable", "unstable")
+
+    # коды меток: "stable" → 0, "unstable" → 1
+    encoded = tune_random_forest(X, 1 - y, PARAM_SPACE, cv_folds=3,
+                                 n_workers=2)
+    named = tune_random_forest(X, labels, PARAM_SPACE, cv_folds=3,
+                               n_workers=2)
+
+    assert _strip_seconds(named["results"]) == \
+        _strip_seconds(encoded["results"])
+
+
+def test_progress_exception_stops_tuning(dataset):
+    X, y = dataset
+    messages = []
+
+    def interrupt(message, percent):
+        messages.append(percent)
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        tune_random_forest(X, y, PARAM_SPACE, cv_folds=3, n_workers=2,
+                           progress=interrupt)
+
+    assert messages == [25]
+
+
+def test_empty_space_rejected(dataset):
+    X, y = dataset
+
+    with pytest.raises(ValueError):
+        tune_random_forest(X, y, {"max_depth": []}, n_workers=1)
@@ -19,6 +19,11 @@
 """
 
 import os
+import json
+import shutil
+import hashlib
+import tempfile
+
 import pandas as pd
 import numpy as np
 
@@ -37,16 +42,305 @@ REQUIRED_COLUMNS = [
     "label"
 ]
 
+# Необязательный идентификатор предприятия: при его наличии
+# динамика показателей рассчитывается по каждому предприятию отдельно
+ENTITY_COLUMN = "company_id"
+
+OPTIONAL_COLUMNS = [
+    ENTITY_COLUMN
+]
+
+
+# Каталог бинарного кэша (создается рядом с файлом данных)
+CACHE_DIR_NAME = ".cache"
+
+# Версия формата кэша: при изменении старые записи игнорируются
+# (2 — устойчивая сортировка по году в clean_data)
+CACHE_FORMAT_VERSION = 2
+
+
+# ============================================================
+# КЭШИРОВАНИЕ ДАННЫХ
+# ============================================================
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Контрольная сумма содержимого файла (SHA-256).
+    """
+
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def file_fingerprint(file_path: str) -> dict:
+    """
+    Отпечаток файла данных: размер, время изменения и SHA-256.
+    """
+
+    stat = os.stat(file_path)
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_digest(file_path)
+    }
+
+
+def fingerprint_matches(fingerprint: dict, file_path: str) -> bool:
+    """
+    Проверка, что файл не изменился с момента снятия отпечатка:
+    сначала по размеру и mtime, при их расхождении — по контрольной
+    сумме содержимого. Если изменилось только время изменения,
+    mtime_ns в отпечатке обновляется.
+    """
+
+    stat = os.stat(file_path)
+
+    if (fingerprint["size"], fingerprint["mtime_ns"]) == (
+        stat.st_size, stat.st_mtime_ns
+    ):
+        return True
+
+    if fingerprint["size"] != stat.st_size:
+        return False
+
+    if fingerprint["sha256"] != file_digest(file_path):
+        return False
+
+    fingerprint["mtime_ns"] = stat.st_mtime_ns
+
+    return True
+
+
+def _cache_path(file_path: str, stage: str) -> str:
+    """
+    Каталог кэша для файла данных и этапа обработки.
+    """
+
+    directory, name = os.path.split(os.path.abspath(file_path))
+
+    return os.path.join(directory, CACHE_DIR_NAME, f"{name}.{stage}")
+
+
+def _read_cache_meta(cache_path: str):
+    meta_path = os.path.join(cache_path, "meta.json")
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != CACHE_FORMAT_VERSION:
+        return None
+
+    return meta
+
+
+def _cache_is_valid(meta: dict, file_path: str, cache_path: str) -> bool:
+    """
+    Проверка актуальности кэша: сначала по размеру и mtime,
+    при их расхождении — по контрольной сумме содержимого.
+    """
+
+    source = meta["source"]
+    mtime_ns = source["mtime_ns"]
+
+    if not fingerprint_matches(source, file_path):
+        return False
+
+    if source["mtime_ns"] == mtime_ns:
+        return True
+
+    # содержимое не изменилось — сохраняем новый mtime в метаданных
+    try:
+        with open(os.path.join(cache_path, "meta.json"), "w",
+                  encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+
+    return True
+
+
+def publish_directory(tmp_path: str, target_path: str) -> None:
+    """
+    Замена каталога target_path каталогом tmp_path, построенным
+    рядом с ним (на той же файловой системе).
+
+    Каталог могут публиковать одновременно несколько процессов.
+    Существующий каталог сначала переносится в сторону (читатели,
+    открывшие его файлы, продолжают работу), затем удаляется.
+    Если другой процесс успел опубликовать свой каталог,
+    tmp_path остается на месте — его удаляет вызывающая сторона.
+    """
+
+    try:
+        os.replace(tmp_path, target_path)
+        return
+    except OSError:
+        # целевой каталог существует и не пуст
+        pass
+
+    # tmp_path уникален (mkdtemp), поэтому уникально и имя в стороне
+    stale_path = tmp_path + ".stale"
+
+    try:
+        os.replace(target_path, stale_path)
+    except OSError:
+        # каталог уже перенесен другим процессом
+        pass
+
+    try:
+        os.replace(tmp_path, target_path)
+    except OSError:
+        # другой процесс успел записать свой каталог
+        pass
+
+    shutil.rmtree(stale_path, ignore_errors=True)
+
+
+def read_cached_frame(file_path: str, stage: str, fingerprint: dict = None):
+    """
+    Чтение подготовленных данных из бинарного кэша.
+
+    Колонки хранятся в отдельных .npy файлах и открываются
+    через memory-map без разбора CSV и без копирования.
+
+    :param fingerprint: отпечаток, снятый вызывающей стороной
+                        (кэш должен соответствовать ему)
+    :return: DataFrame или None, если кэш отсутствует или устарел
+    """
+
+    cache_path = _cache_path(file_path, stage)
+    meta = _read_cache_meta(cache_path)
+
+    if meta is None or not _cache_is_valid(meta, file_path, cache_path):
+        return None
+
+    if (fingerprint is not None
+            and meta["source"]["sha256"] != fingerprint["sha256"]):
+        return None
+
+    # режим "c": копирование при записи — файлы кэша не изменяются
+    try:
+        columns = {
+            name: np.load(
+                os.path.join(cache_path, f"col_{i}.npy"), mmap_mode="c"
+            )
+            for i, name in enumerate(meta["columns"])
+        }
+
+        if meta["index"] == "range":
+            index = pd.RangeIndex(meta["rows"])
+        else:
+            index = np.load(
+                os.path.join(cache_path, "index.npy"), mmap_mode="c"
+            )
+    except (OSError, ValueError):
+        return None
+
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def write_cached_frame(
+    df: pd.DataFrame,
+    file_path: str,
+    stage: str,
+    fingerprint: dict = None
+) -> None:
+    """
+    Сохранение подготовленных данных в бинарный кэш.
+
+    Кэшируются только числовые колонки; при наличии других типов
+    или ошибке записи кэш не создается.
+
+    :param fingerprint: отпечаток файла, снятый до его чтения
+                        (если не задан — снимается здесь)
+    """
+
+    index_is_range = isinstance(df.index, pd.RangeIndex) and (
+        df.index.start == 0 and df.index.step == 1
+    )
+
+    arrays = [df[col].to_numpy() for col in df.columns]
+    if not index_is_range:
+        arrays.append(df.index.to_numpy())
+
+    if any(arr.dtype.kind not in "biuf" for arr in arrays):
+        return
+
+    if fingerprint is None:
+        fingerprint = file_fingerprint(file_path)
+
+    cache_path = _cache_path(file_path, stage)
+    cache_root = os.path.dirname(cache_path)
+
+    meta = {
+        "version": CACHE_FORMAT_VERSION,
+        "source": fingerprint,
+        "columns": [str(col) for col in df.columns],
+        "rows": len(df),
+        "index": "range" if index_is_range else "array"
+    }
+
+    tmp_path = None
+
+    try:
+        os.makedirs(cache_root, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=cache_root)
+
+        for i, col in enumerate(df.columns):
+            np.save(
+                os.path.join(tmp_path, f"col_{i}.npy"),
+                np.ascontiguousarray(df[col].to_numpy())
+            )
+
+        if not index_is_range:
+            np.save(
+                os.path.join(tmp_path, "index.npy"),
+                np.ascontiguousarray(df.index.to_numpy())
+            )
+
+        with open(os.path.join(tmp_path, "meta.json"), "w",
+                  encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        publish_directory(tmp_path, cache_path)
+    except OSError:
+        # кэш — только оптимизация: ошибка записи не прерывает загрузку
+        pass
+    finally:
+        # остается, если кэш уже записал другой процесс
+        if tmp_path is not None:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
 
 # ============================================================
 # ЗАГРУЗКА ДАННЫХ
 # ============================================================
 
-def load_csv_data(file_path: str) -> pd.DataFrame:
+def load_csv_data(
+    file_path: str,
+    use_cache: bool = True,
+    fingerprint: dict = None
+) -> pd.DataFrame:
     """
     Загрузка CSV-файла с финансовыми данными предприятия.
 
+    Отпечаток файла для кэша снимается один раз до чтения:
+    если файл изменится во время чтения, кэш окажется устаревшим
+    и будет пересоздан, а не выдан за актуальный.
+
     :param file_path: путь к CSV-файлу
+    :param use_cache: использовать бинарный кэш разобранного файла
+    :param fingerprint: отпечаток файла, уже снятый вызывающей
+                        стороной до чтения
     :return: DataFrame с данными
     """
 
@@ -55,11 +349,22 @@ def load_csv_data(file_path: str) -> pd.DataFrame:
             f"Файл данных не найден: {file_path}"
         )
 
+    if use_cache:
+        df = read_cached_frame(file_path, "raw", fingerprint)
+        if df is not None:
+            return df
+
+        if fingerprint is None:
+            fingerprint = file_fingerprint(file_path)
+
     df = pd.read_csv(file_path)
 
     if df.empty:
         raise ValueError("CSV-файл не содержит данных")
 
+    if use_cache:
+        write_cached_frame(df, file_path, "raw", fingerprint)
+
     return df
 
 
@@ -120,9 +425,10 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     # Замена NaN значений на 0
     df = df.fillna(0)
 
-    # Сортировка по году
+    # Сортировка по году (устойчивая: внутри года — порядок файла,
+    # как в load_and_prepare_data_chunks)
     if "year" in df.columns:
-        df = df.sort_values("year")
+        df = df.sort_values("year", kind="stable")
 
     return df
 
@@ -203,23 +509,443 @@ def print_dataset_summary(df: pd.DataFrame) -> None:
 # КОМПЛЕКСНАЯ ЗАГРУЗКА
 # ============================================================
 
-def load_and_prepare_data(file_path: str) -> pd.DataFrame:
+def load_and_prepare_data(
+    file_path: str,
+    use_cache: bool = True,
+    fingerprint: dict = None
+) -> pd.DataFrame:
     """
     Полный цикл загрузки и подготовки данных:
     – загрузка CSV;
     – проверка структуры;
     – проверка типов;
     – очистка данных.
+
+    Проверенные и очищенные данные сохраняются в бинарный кэш
+    рядом с файлом; пока файл не изменился, повторная загрузка
+    читает кэш без разбора CSV и повторной обработки.
+
+    :param fingerprint: отпечаток файла, снятый до чтения
+                        (file_fingerprint); если не задан, снимается
+                        один раз при отсутствии кэша
     """
 
-    df = load_csv_data(file_path)
+    if use_cache and os.path.exists(file_path):
+        df = read_cached_frame(file_path, "prepared", fingerprint)
+        if df is not None:
+            return df
+
+        if fingerprint is None:
+            fingerprint = file_fingerprint(file_path)
+
+    df = load_csv_data(file_path, use_cache, fingerprint)
     validate_columns(df)
     validate_data_types(df)
     df = clean_data(df)
 
+    if use_cache:
+        write_cached_frame(df, file_path, "prepared", fingerprint)
+
     return df
 
 
+# ============================================================
+# ПОТОКОВАЯ ЗАГРУЗКА БОЛЬШИХ ФАЙЛОВ
+# ============================================================
+
+# Размер порции чтения CSV по умолчанию (строк)
+STREAM_CHUNK_ROWS = 100_000
+
+# служебные колонки промежуточных файлов сортировки
+_ROW_COLUMN = "__row__"
+_HASH_COLUMN = "__hash__"
+
+# порядок отрезка по (год, хэш, номер строки) для поиска дубликатов
+_DEDUP_YEAR = "__dedup_year__"
+_DEDUP_HASH = "__dedup_hash__"
+_DEDUP_ROW = "__dedup_row__"
+_DEDUP_POS = "__dedup_pos__"
+
+
+def _write_sorted_run(chunk: pd.DataFrame, first_row: int, run_path: str) -> None:
+    """
+    Подготовка порции и сохранение ее на диск отсортированной
+    по (год, номер строки) — отрезок для внешней сортировки слиянием.
+
+    Дополнительно сохраняется порядок строк отрезка по (год, хэш,
+    номер строки): в нем одинаковые строки оказываются рядом.
+    """
+
+    # хэш считается до замены NaN, как drop_duplicates в clean_data
+    row_hash = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+    rows = np.arange(first_row, first_row + len(chunk), dtype=np.int64)
+
+    chunk = chunk.fillna(0)
+    year = chunk["year"].to_numpy()
+
+    # устойчивая сортировка: внутри года — порядок строк файла
+    order = np.argsort(year, kind="stable")
+    year = year[order]
+    row_hash = row_hash[order]
+    rows = rows[order]
+
+    dedup = np.lexsort((rows, row_hash, year))
+
+    os.makedirs(run_path)
+
+    for i, col in enumerate(chunk.columns):
+        np.save(
+            os.path.join(run_path, f"col_{i}.npy"),
+            chunk[col].to_numpy()[order]
+        )
+
+    np.save(os.path.join(run_path, f"{_HASH_COLUMN}.npy"), row_hash)
+    np.save(os.path.join(run_path, f"{_ROW_COLUMN}.npy"), rows)
+    np.save(os.path.join(run_path, f"{_DEDUP_YEAR}.npy"), year[dedup])
+    np.save(os.path.join(run_path, f"{_DEDUP_HASH}.npy"), row_hash[dedup])
+    np.save(os.path.join(run_path, f"{_DEDUP_ROW}.npy"), rows[dedup])
+    np.save(os.path.join(run_path, f"{_DEDUP_POS}.npy"), dedup)
+
+
+def _load_run_column(path: str) -> np.ndarray:
+    """
+    Чтение колонки отрезка: числовые колонки — через memory-map,
+    строковые (например, ENTITY_COLUMN) — целиком.
+    """
+
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path, allow_pickle=True)
+
+
+def _open_run(run_path: str, n_columns: int) -> dict:
+    """
+    Открытие отрезка сортировки через memory-map.
+    """
+
+    def load(name: str) -> np.ndarray:
+        return np.load(os.path.join(run_path, f"{name}.npy"), mmap_mode="r")
+
+    run = {
+        "columns": [
+            _load_run_column(os.path.join(run_path, f"col_{i}.npy"))
+            for i in range(n_columns)
+        ],
+        "hash": load(_HASH_COLUMN),
+        "row": load(_ROW_COLUMN),
+        "dedup_year": load(_DEDUP_YEAR),
+        "dedup_hash": load(_DEDUP_HASH),
+        "dedup_row": load(_DEDUP_ROW),
+        "dedup_pos": load(_DEDUP_POS)
+    }
+    run["year"] = run["columns"][0]
+
+    return run
+
+
+def _count_not_greater(keys: list, bound: tuple) -> int:
+    """
+    Число первых элементов окна, отсортированного лексикографически
+    по ключам keys (список массивов), не превышающих границу bound.
+    """
+
+    lo = np.searchsorted(keys[0], bound[0], side="left")
+    hi = np.searchsorted(keys[0], bound[0], side="right")
+
+    if len(keys) == 1:
+        return int(hi)
+
+    return int(lo + _count_not_greater(
+        [key[lo:hi] for key in keys[1:]], bound[1:]
+    ))
+
+
+def _merge_steps(keys: list, window: int):
+    """
+    Шаги слияния отрезков, упорядоченных лексикографически по ключам.
+
+    :param keys: для каждого отрезка — список массивов ключей
+                 (первый — год)
+    :param window: наибольшее число строк отрезка за один шаг
+    :return: генератор списков (номер отрезка, start, stop): строки
+             шага не больше строк следующих шагов
+    """
+
+    positions = [0] * len(keys)
+    sizes = [len(run_keys[0]) for run_keys in keys]
+
+    while True:
+        active = [i for i in range(len(keys)) if positions[i] < sizes[i]]
+
+        if not active:
+            return
+
+        # граница: наименьший последний ключ среди окон,
+        # за которыми в отрезке еще есть данные
+        bound = None
+
+        for i in active:
+            end = min(positions[i] + window, sizes[i])
+
+            if end < sizes[i]:
+                key = tuple(run_key[end - 1] for run_key in keys[i])
+                if bound is None or key < bound:
+                    bound = key
+
+        step = []
+
+        for i in active:
+            start = positions[i]
+            end = min(start + window, sizes[i])
+
+            if bound is None:
+                count = end - start
+            else:
+                count = _count_not_greater(
+                    [run_key[start:end] for run_key in keys[i]], bound
+                )
+
+            if count:
+                step.append((i, start, start + count))
+                positions[i] = start + count
+
+        yield step
+
+
+def _duplicate_rows(runs: list, window: int, dtypes: list) -> np.ndarray:
+    """
+    Номера строк файла, повторяющих более раннюю строку
+    (как drop_duplicates: остается первая).
+
+    Отрезки сливаются в порядке (год, хэш, номер строки), поэтому
+    одинаковые строки оказываются рядом, первой — самая ранняя;
+    совпадение хэша проверяется сравнением значений.
+
+    :return: отсортированный массив номеров строк (объем памяти
+             пропорционален числу дубликатов)
+    """
+
+    duplicates = []
+    last_key = None
+    last_values = None
+
+    keys = [
+        [run["dedup_year"], run["dedup_hash"], run["dedup_row"]]
+        for run in runs
+    ]
+
+    for step in _merge_steps(keys, window):
+        positions = [
+            (runs[i], np.asarray(runs[i]["dedup_pos"][start:stop]))
+            for i, start, stop in step
+        ]
+
+        values = [
+            np.concatenate([
+                np.asarray(run["columns"][c][pos]) for run, pos in positions
+            ]).astype(dtype, copy=False)
+            for c, dtype in enumerate(dtypes)
+        ]
+        row_hash = np.concatenate([run["hash"][pos] for run, pos in positions])
+        rows = np.concatenate([run["row"][pos] for run, pos in positions])
+
+        order = np.lexsort((rows, row_hash, values[0]))
+        values = [col[order] for col in values]
+        row_hash = row_hash[order]
+        rows = rows[order]
+
+        # дубликат — строка, совпадающая с предыдущей по ключу и значениям
+        same = np.zeros(len(rows), dtype=bool)
+        same[1:] = (row_hash[1:] == row_hash[:-1]) & (
+            values[0][1:] == values[0][:-1]
+        )
+        for col in values[1:]:
+            same[1:] &= col[1:] == col[:-1]
+
+        if last_key is not None and len(rows):
+            same[0] = (values[0][0], row_hash[0]) == last_key and all(
+                col[0] == prev for col, prev in zip(values, last_values)
+            )
+
+        last_key = (values[0][-1], row_hash[-1])
+        last_values = [col[-1] for col in values]
+
+        duplicates.append(rows[same])
+
+    return np.sort(np.concatenate(duplicates))
+
+
+def load_and_prepare_data_chunks(
+    file_path: str,
+    chunksize: int = STREAM_CHUNK_ROWS,
+    spill_dir: str = None
+):
+    """
+    Потоковый вариант load_and_prepare_data для файлов,
+    не помещающихся в оперативную память.
+
+    Выполняются те же этапы (проверка структуры и типов, удаление
+    дубликатов, замена NaN, сортировка по году), но данные
+    обрабатываются порциями:
+    – каждая порция проверяется и сохраняется во временный каталог
+      отсортированной по (год, номер строки);
+    – проход слиянием по (год, хэш строки) находит дубликаты:
+      одинаковые строки оказываются рядом, множество всех хэшей
+      не хранится (хранятся только номера строк-дубликатов);
+    – отрезки объединяются слиянием по (год, номер строки)
+      без дубликатов.
+
+    Порции выдаются ровно по chunksize строк (кроме последней).
+    Шаг слияния читает из каждого отрезка окно не менее 1024 строк,
+    поэтому объем памяти — порядка max(chunksize, 1024 × число
+    отрезков) строк, где число отрезков ≈ строк в файле / chunksize;
+    он не зависит от размера файла, пока chunksize не слишком мал
+    по сравнению с ним (плюс номера строк-дубликатов).
+
+    Результат совпадает с load_and_prepare_data: строки упорядочены
+    по году, внутри года — в порядке файла; индекс — номер строки
+    в исходном файле.
+
+    :param chunksize: размер порции чтения и выдачи (строк)
+    :param spill_dir: каталог для временных файлов
+    :return: генератор DataFrame с подготовленными порциями
+    """
+
+    merged = _merge_prepared_runs(file_path, chunksize, spill_dir)
+
+    try:
+        yield from _rechunk(merged, chunksize)
+    finally:
+        # закрытие генератора удаляет временные файлы
+        merged.close()
+
+
+def _rechunk(frames, chunksize: int):
+    """
+    Перераспределение строк последовательности DataFrame
+    по порциям ровно из chunksize строк (последняя — остаток).
+    """
+
+    pending = []
+    pending_rows = 0
+
+    for df in frames:
+        start = 0
+
+        while start < len(df):
+            take = min(chunksize - pending_rows, len(df) - start)
+            pending.append(df.iloc[start:start + take])
+            pending_rows += take
+            start += take
+
+            if pending_rows == chunksize:
+                yield pending[0] if len(pending) == 1 else pd.concat(pending)
+                pending = []
+                pending_rows = 0
+
+    if pending:
+        yield pending[0] if len(pending) == 1 else pd.concat(pending)
+
+
+def _merge_prepared_runs(file_path: str, chunksize: int, spill_dir: str):
+    """
+    Проверка порций, запись отсортированных отрезков и их слияние
+    с удалением дубликатов (load_and_prepare_data_chunks); размер
+    выдаваемых DataFrame определяется окнами слияния.
+    """
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(
+            f"Файл данных не найден: {file_path}"
+        )
+
+    # ignore_cleanup_errors: на Windows файлы, открытые через memory-map,
+    # нельзя удалить до закрытия генератора
+    with tempfile.TemporaryDirectory(
+        dir=spill_dir, ignore_cleanup_errors=True
+    ) as tmp_dir:
+
+        # --- этап 1: проверка порций и запись отсортированных отрезков ---
+        run_paths = []
+        columns = None
+        dtypes = None
+        total_rows = 0
+
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):
+            validate_columns(chunk)
+            validate_data_types(chunk)
+
+            if columns is None:
+                source_columns = list(chunk.columns)
+
+            # год — первая колонка отрезка (ключ слияния)
+            chunk = chunk[["year"] + [c for c in chunk.columns if c != "year"]]
+
+            if columns is None:
+                columns = list(chunk.columns)
+                # типы NumPy, а не pandas: строковые колонки
+                # (StringDtype) хранятся в отрезках как object
+                dtypes = [chunk[c].to_numpy().dtype for c in columns]
+            elif list(chunk.columns) != columns:
+                raise ValueError("Структура порций CSV-файла различается")
+
+            run_path = os.path.join(tmp_dir, f"run_{len(run_paths)}")
+            _write_sorted_run(chunk, total_rows, run_path)
+
+            # итоговый тип колонки — общий для всех порций (после fillna)
+            dtypes = [
+                np.result_type(dtype, _load_run_column(
+                    os.path.join(run_path, f"col_{i}.npy")
+                ).dtype)
+                for i, dtype in enumerate(dtypes)
+            ]
+
+            run_paths.append(run_path)
+            total_rows += len(chunk)
+
+        if not total_rows:
+            raise ValueError("CSV-файл не содержит данных")
+
+        runs = [_open_run(path, len(columns)) for path in run_paths]
+        window = max(1024, chunksize // len(runs))
+
+        # --- этап 2: поиск дубликатов ---
+        duplicates = _duplicate_rows(runs, window, dtypes)
+
+        # --- этап 3: слияние отрезков в порядке (год, номер строки) ---
+        keys = [[run["year"], run["row"]] for run in runs]
+
+        for step in _merge_steps(keys, window):
+            values = [
+                np.concatenate([
+                    runs[i]["columns"][c][start:stop]
+                    for i, start, stop in step
+                ]).astype(dtype, copy=False)
+                for c, dtype in enumerate(dtypes)
+            ]
+            rows = np.concatenate([
+                runs[i]["row"][start:stop] for i, start, stop in step
+            ])
+
+            order = np.lexsort((rows, values[0]))
+            rows = rows[order]
+            keep = ~np.isin(rows, duplicates, assume_unique=True)
+
+            if keep.any():
+                df = pd.DataFrame(
+                    {
+                        col: arr[order][keep]
+                        for col, arr in zip(columns, values)
+                    },
+                    index=rows[keep]
+                )
+                yield df[source_columns]
+
+        # закрытие memory-map перед удалением временных файлов
+        runs = None
+
+
 # ============================================================
 # ТЕСТОВЫЙ ЗАПУСК
 # ============================================================
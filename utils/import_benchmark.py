@@ -0,0 +1,225 @@
+"""
+ФИО автора: Кирченков Александр Николаевич
+Руководитель ВКР: Коротков Дмитрий Павлович
+
+Назначение модуля:
+Контроль времени запуска десктопного приложения.
+
+Импорт точки входа (main) выполняется в отдельном интерпретаторе
+с ключом -X importtime, отчет интерпретатора разбирается
+и сравнивается с бюджетом. Проверка считается проваленной, если
+суммарное время импорта превышает бюджет или до появления окна
+авторизации загружаются тяжелые модули (pandas, sklearn и т.п.).
+
+Пример запуска:
+    python -m utils.import_benchmark --budget-ms 300
+
+Код возврата: 0 — проверка пройдена, 1 — регрессия,
+2 — модуль не удалось импортировать.
+"""
+
+import os
+import re
+import sys
+import subprocess
+
+
+# ============================================================
+# КОНСТАНТЫ
+# ============================================================
+
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+
+# модуль точки входа приложения
+STARTUP_MODULE = "main"
+
+# бюджет времени импорта до показа окна авторизации (мс)
+STARTUP_BUDGET_MS = 300
+
+# пакеты, которые не должны загружаться при запуске:
+# они нужны только окнам оценки, анализа и обучения
+STARTUP_FORBIDDEN_PACKAGES = [
+    "ml",
+    "numpy",
+    "pandas",
+    "sklearn",
+    "scipy",
+    "joblib",
+    "matplotlib",
+    "fpdf"
+]
+
+# число замеров (берется лучший: меньше влияние шума системы)
+IMPORT_TIME_REPEATS = 5
+
+# строка отчета: "import time:  self [us] | cumulative | имя"
+_IMPORTTIME_LINE = re.compile(
+    r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)"
+)
+
+
+# ============================================================
+# ЗАМЕР ВРЕМЕНИ ИМПОРТА
+# ============================================================
+
+def parse_importtime(report: str) -> list:
+    """
+    Разбор отчета -X importtime.
+
+    :return: список словарей (module, self_us, cumulative_us, depth)
+             в порядке отчета
+    """
+
+    modules = []
+
+    for line in report.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+
+        self_us, cumulative_us, indent, name = match.groups()
+
+        modules.append({
+            "module": name,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            # вложенность обозначается отступом по два пробела
+            "depth": (len(indent) - 1) // 2
+        })
+
+    return modules
+
+
+def measure_import(module: str = STARTUP_MODULE,
+                   repeats: int = IMPORT_TIME_REPEATS) -> dict:
+    """
+    Замер времени импорта модуля в чистом интерпретаторе.
+
+    :return: словарь total_ms (лучший замер) и modules (разбор
+             отчета лучшего замера)
+    """
+
+    best = None
+
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True
+        )
+
+        if completed.returncode != 0:
+            errors = [
+                line for line in completed.stderr.splitlines()
+                if not line.startswith("import time:")
+            ]
+            raise ImportError(
+                f"Не удалось импортировать {module}:\n" + "\n".join(errors)
+            )
+
+        modules = parse_importtime(completed.stderr)
+        total_ms = sum(m["self_us"] for m in modules) / 1000
+
+        if best is None or total_ms < best["total_ms"]:
+            best = {"total_ms": total_ms, "modules": modules}
+
+    return best
+
+
+def check_startup(
+    module: str = STARTUP_MODULE,
+    budget_ms: float = STARTUP_BUDGET_MS,
+    forbidden=STARTUP_FORBIDDEN_PACKAGES,
+    repeats: int = IMPORT_TIME_REPEATS
+) -> dict:
+    """
+    Проверка времени запуска против бюджета.
+
+    :return: результат замера с ключами ok, budget_ms
+             и forbidden (загруженные запрещенные модули)
+    """
+
+    result = measure_import(module, repeats)
+
+    forbidden = set(forbidden)
+    loaded = [
+        m["module"] for m in result["modules"]
+        if m["module"].split(".")[0] in forbidden
+    ]
+
+    result["budget_ms"] = budget_ms
+    result["forbidden"] = loaded
+    result["ok"] = result["total_ms"] <= budget_ms and not loaded
+
+    return result
+
+
+# ============================================================
+# ЗАПУСК МОДУЛЯ КАК САМОСТОЯТЕЛЬНОЙ ПРОГРАММЫ
+# ============================================================
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.import_benchmark",
+        description="Контроль времени импорта при запуске приложения"
+    )
+    parser.add_argument("--module", default=STARTUP_MODULE)
+    parser.add_argument(
+        "--budget-ms", type=float, default=STARTUP_BUDGET_MS
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=IMPORT_TIME_REPEATS
+    )
+    parser.add_argument(
+        "--top", type=int, default=10,
+        help="число самых медленных модулей в отчете"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        result = check_startup(
+            args.module, args.budget_ms, repeats=args.repeats
+        )
+    except ImportError as error:
+        print(str(error))
+        return 2
+
+    print(
+        f"Импорт {args.module}: {result['total_ms']:.1f} мс "
+        f"(бюджет {result['budget_ms']:.0f} мс, "
+        f"модулей: {len(result['modules'])})"
+    )
+
+    top_level = sorted(
+        (m for m in result["modules"] if m["depth"] == 0),
+        key=lambda m: m["cumulative_us"],
+        reverse=True
+    )
+
+    for m in top_level[:args.top]:
+        print(f"  {m['cumulative_us'] / 1000:8.1f} мс  {m['module']}")
+
+    if result["forbidden"]:
+        print(
+            "При запуске загружены тяжелые модули: "
+            + ", ".join(sorted({
+                name.split(".")[0] for name in result["forbidden"]
+            }))
+        )
+
+    if not result["ok"]:
+        print("ПРОВЕРКА НЕ ПРОЙДЕНА")
+        return 1
+
+    print("Проверка пройдена")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())